@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Fidelity Tier Benchmark
+Query cost and field error of each WindController fidelity tier against full
+fidelity in the tuned scene, and the single-point fast path checked against
+the batch path
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from run_benchmarks import _points_in, _tuned_scene, measure
+    from scripts.wind_table import FIDELITY_TIERS
+
+
+def scene_points(controller, count, seed=1):
+    """Points spread uniformly over the zones' spheres, so both cores and edges are sampled"""
+    zones = list(controller.wind_zones.values())
+    per_zone = count // len(zones)
+    return np.concatenate([_points_in(zone, per_zone, seed + i) for i, zone in enumerate(zones)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=10000, help="points per query")
+    parser.add_argument("--frames", type=int, default=120, help="frames to step before measuring")
+    parser.add_argument("--single-points", type=int, default=500, help="points checked through get_wind_at_position")
+    args = parser.parse_args()
+
+    controller = _tuned_scene()
+    points = scene_points(controller, args.points)
+    # Step with an agent inside WindZone1 so gusts, the gust front and the microburst are running
+    agent = controller.wind_zones["WindZone1"].position
+    for _ in range(args.frames):
+        controller.step(0.016, agent)
+
+    reference = controller.get_wind_vectors(points, "full")
+    full_time, _ = measure(lambda: controller.get_wind_vectors(points, "full"))
+    print(f"{len(points)} points inside the zones, t={controller.time:.2f}s")
+    singles = points[:args.single_points]
+    print(f"{'tier':<8} {'us/query':>10} {'speedup':>8} {'rms err m/s':>12} {'max err m/s':>12} "
+          f"{'single us':>10} {'single vs batch':>16}")
+    for tier in FIDELITY_TIERS:
+        seconds, _ = measure(lambda: controller.get_wind_vectors(points, tier))
+        batch = controller.get_wind_vectors(points, tier)
+        error = np.linalg.norm(batch - reference, axis=1)
+        rms = np.sqrt(np.mean(error ** 2))
+        # get_wind_at_position takes its own scalar path and must agree with the batch
+        single_time, _ = measure(lambda: [controller.get_wind_at_position(p, tier) for p in singles])
+        single = np.array([controller.get_wind_at_position(p, tier) for p in singles])
+        mismatch = np.abs(single - batch[:len(singles)]).max()
+        print(f"{tier:<8} {seconds * 1e6:>10.1f} {full_time / seconds:>7.2f}x {rms:>12.3f} {error.max():>12.3f} "
+              f"{single_time / len(singles) * 1e6:>10.1f} {mismatch:>16.2e}")
+        if mismatch > 1e-9:
+            raise SystemExit(f"❌ Single-point {tier} queries differ from the batch path by {mismatch:.3g} m/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Integrator Benchmark
+Trajectory error against wind-query count and wall time for DroneController's
+integrators at several frame rates
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from scripts.fly_to_waypoints import DroneController
+    from scripts.wind_tuning import tune_wind
+
+START = [5.0, 8.0, -5.0]
+TARGET = [40.0, 12.0, 20.0]   # out of reach within the horizon, so control never switches off
+
+# (integrator, frame dt, substeps)
+CONFIGS = [
+    ("explicit_euler", 0.016, 1),
+    ("semi_implicit_euler", 0.016, 1),
+    ("semi_implicit_euler", 0.004, 1),
+    ("semi_implicit_euler", 0.001, 1),
+    ("semi_implicit_euler", 0.032, 4),
+    ("rk4", 0.016, 1),
+    ("rk4", 0.032, 1),
+    ("rk4", 0.064, 1),
+    ("adaptive", 0.032, 1),
+    ("adaptive", 0.064, 1),
+]
+
+
+def build_drone(integrator, substeps=1):
+    """Drone in the tuned scene with a steady wind field
+
+    Time-varying terms (Dryden, gusts, sine turbulence, gust front,
+    microburst, noise drift) are switched off, so the wind depends on position
+    only and trajectory error comes from the integrator alone.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        drone = DroneController(seed=0, integrator=integrator, substeps=substeps)
+        drone.wind_controller.create_preset_wind_conditions("stormy")
+        tune_wind(drone.wind_controller)
+    for zone in drone.wind_controller.wind_zones.values():
+        zone.dryden_sigma = 0.0
+        zone.wind_gust_amplitude = 0.0
+        zone.turbulence_intensity = 0.0
+        zone.gustfront_enabled = False
+        zone.microburst_enabled = False
+        zone.noise_time_speed = 0.0
+    drone.current_position = np.array(START)
+    drone.target_position = np.array(TARGET)
+    return drone
+
+
+def fly(integrator, dt, substeps=1, horizon=6.4):
+    """Fly for `horizon` seconds; returns (final position, wind queries, wall seconds)"""
+    drone = build_drone(integrator, substeps)
+    frames = int(round(horizon / dt))
+    if not np.isclose(frames * dt, horizon):
+        raise ValueError(f"horizon {horizon} s is not a whole number of {dt} s frames")
+    start = time.perf_counter()
+    for _ in range(frames):
+        drone.calculate_control(dt)
+    return drone.current_position.copy(), drone.wind_queries, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--horizon", type=float, default=6.4,
+                        help="simulated seconds per run (a multiple of every frame dt)")
+    parser.add_argument("--reference-dt", type=float, default=0.0005, help="frame dt of the RK4 reference run")
+    args = parser.parse_args()
+
+    reference, _, _ = fly("rk4", args.reference_dt, horizon=args.horizon)
+    print(f"Reference: rk4 at dt={args.reference_dt} s, final position {np.round(reference, 3)}")
+    print(f"{'integrator':<20} {'dt':>6} {'sub':>4} {'queries':>8} {'wall ms':>9} {'error m':>10}")
+    for integrator, dt, substeps in CONFIGS:
+        position, queries, wall = fly(integrator, dt, substeps, args.horizon)
+        error = np.linalg.norm(position - reference)
+        print(f"{integrator:<20} {dt:>6.3f} {substeps:>4} {queries:>8} {wall * 1e3:>9.1f} {error:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
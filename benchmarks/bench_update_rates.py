@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Update Rate Benchmark
+Step cost and field error of WindZone.SUGGESTED_RATES against every-step
+sampling in the tuned scene
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from bench_fidelity import scene_points
+    from run_benchmarks import _quiet, _tuned_scene, measure
+    from scripts.wind_controller import WindZone
+
+
+def rated_scene(rates):
+    """The tuned scene with `rates` (component -> Hz) set on every zone"""
+    controller = _tuned_scene()
+    for zone in controller.wind_zones.values():
+        for component, rate in rates.items():
+            _quiet(zone.set_update_rate, component, rate)
+    return controller
+
+
+def fly(controller, frames, dt, agent, points, every):
+    """Step `frames` times; returns the field at `points` every `every` frames, (samples, points, 3)"""
+    fields = []
+    for frame in range(frames):
+        controller.step(dt, agent)
+        if frame % every == 0:
+            fields.append(controller.get_wind_vectors(points))
+    return np.array(fields)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=1000, help="points per field comparison")
+    parser.add_argument("--frames", type=int, default=1800, help="frames flown for the field comparison")
+    parser.add_argument("--dt", type=float, default=0.016, help="frame dt in seconds")
+    parser.add_argument("--every", type=int, default=10, help="compare the field every this many frames")
+    parser.add_argument("--rounds", type=int, default=5, help="interleaved timing rounds, best kept")
+    args = parser.parse_args()
+
+    configurations = {"every step": {}}
+    for component, rate in WindZone.SUGGESTED_RATES.items():
+        configurations[f"{component} {rate:g}Hz"] = {component: rate}
+    configurations["suggested"] = dict(WindZone.SUGGESTED_RATES)
+
+    scene = _tuned_scene()
+    points = scene_points(scene, args.points)
+    # Fly with an agent inside WindZone1 so the gust front and microburst are triggered too
+    agent = scene.wind_zones["WindZone1"].position
+    print(f"{args.frames} frames at dt={args.dt}s, field compared at {len(points)} points every {args.every} frames")
+    # The filter draws one normal per sample, so its error is mostly a different realization
+    print("Rate-limited Dryden is a different realization of the same process, not an approximation of it")
+    print(f"{'rates':<16} {'us/step':>9} {'speedup':>8} {'rms err m/s':>12} {'max err m/s':>12}")
+    # Configurations are timed in interleaved rounds so machine load drifts hit them alike
+    controllers = {label: rated_scene(rates) for label, rates in configurations.items()}
+    step_time = dict.fromkeys(configurations, np.inf)
+    for _ in range(args.rounds):
+        for label, controller in controllers.items():
+            seconds, _ = measure(lambda: controller.step(args.dt, agent))
+            step_time[label] = min(step_time[label], seconds)
+    reference = None
+    for label, rates in configurations.items():
+        fields = fly(rated_scene(rates), args.frames, args.dt, agent, points, args.every)
+        if reference is None:
+            reference, reference_time = fields, step_time[label]
+        error = np.linalg.norm(fields - reference, axis=2)
+        print(f"{label:<16} {step_time[label] * 1e6:>9.1f} {reference_time / step_time[label]:>7.2f}x "
+              f"{np.sqrt(np.mean(error ** 2)):>12.3f} {error.max():>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
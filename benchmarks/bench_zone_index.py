@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Zone Index Benchmark
+Measures WindController query cost against the number of wind zones
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from scripts.wind_controller import WindController
+
+
+def build_controller(zone_count, zone_size=10.0, overlap=4.0, seed=0):
+    """Scatter zones in a cube sized so each point sees ~`overlap` zones on average"""
+    rng = np.random.default_rng(seed)
+    zone_volume = 4.0 / 3.0 * np.pi * zone_size ** 3
+    side = (zone_count * zone_volume / overlap) ** (1.0 / 3.0)
+    centers = rng.uniform(0.0, side, (zone_count, 3))
+
+    controller = WindController(cell_size=2.0 * zone_size)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, center in enumerate(centers):
+            controller.add_wind_zone(f"Zone{i}", center, zone_size)
+    controller.step()
+    return controller, side
+
+
+def linear_scan(controller, position):
+    """Reference query visiting every zone (the pre-index behaviour)"""
+    total_wind = np.zeros(3)
+    for zone in controller.wind_zones.values():
+        total_wind += zone.get_wind_vector_at_position(position)
+    return total_wind
+
+
+def time_per_call(fn, args_list, min_time=0.2):
+    """Average seconds per call, repeating the argument list for at least min_time"""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for args in args_list:
+            fn(*args)
+        calls += len(args_list)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--zones", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--batch", type=int, default=10000, help="points per batched query")
+    parser.add_argument("--linear-max", type=int, default=1000,
+                        help="largest zone count for the linear-scan reference")
+    args = parser.parse_args()
+
+    print(f"{'zones':>8} {'build s':>9} {'hits/pt':>8} {'single us':>10} {'linear us':>10} {'batch us/pt':>12}")
+    for zone_count in args.zones:
+        start = time.perf_counter()
+        controller, side = build_controller(zone_count)
+        build_time = time.perf_counter() - start
+
+        rng = np.random.default_rng(1)
+        points = rng.uniform(0.0, side, (args.batch, 3))
+        hits = sum(len(indices) for indices in controller.zone_index.query(points).values()) / len(points)
+
+        single = time_per_call(controller.get_wind_at_position, [(p,) for p in points[:200]])
+        linear = float("nan")
+        if zone_count <= args.linear_max:
+            linear = time_per_call(linear_scan, [(controller, p) for p in points[:20]])
+        batch = time_per_call(controller.get_wind_vectors, [(points,)]) / len(points)
+
+        print(f"{zone_count:>8} {build_time:>9.2f} {hits:>8.2f} {single * 1e6:>10.1f} "
+              f"{linear * 1e6:>10.1f} {batch * 1e6:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
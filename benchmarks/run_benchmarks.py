@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Benchmark Suite
+Headless benchmarks for the wind and flight hot paths with JSON baselines and
+regression gates
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from bench_zone_index import build_controller
+    from scripts import wind_kernels
+    from scripts.batch_missions import fly_mission
+    from scripts.drone_swarm import DroneSwarmController
+    from scripts.fly_to_waypoints import DEFAULT_WAYPOINTS, DEFAULT_WIND_ZONES, DroneController
+    from scripts.gradient_noise import gradient_noise
+    from scripts.wind_controller import WindController, dryden_turbulence
+    from scripts.wind_events import GustFrontEvent, MicroburstEvent
+    from scripts.wind_tuning import tune_wind
+
+CASES = []
+
+
+def case(name, **sweep):
+    """Register a benchmark; each keyword is a parameter swept over its values
+
+    The decorated function builds its fixture and returns (fn, items): fn is
+    the timed zero-argument callable and items the work units per call (e.g.
+    points in a batch), used to report per-item cost.
+    """
+    def register(fn):
+        CASES.append((name, fn, sweep))
+        return fn
+    return register
+
+
+def _quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def _tuned_scene(seed=0):
+    """The fly_to_waypoints scene: two zones, moderate preset plus tune_wind"""
+    controller = _quiet(WindController, seed=seed)
+    for zone_name, position, size in DEFAULT_WIND_ZONES:
+        _quiet(controller.add_wind_zone, zone_name, position, size)
+    _quiet(controller.create_preset_wind_conditions, "moderate")
+    _quiet(tune_wind, controller)
+    controller.step()
+    return controller
+
+
+def _points_in(zone, count, seed=1):
+    rng = np.random.default_rng(seed)
+    directions = rng.normal(size=(count, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    radii = zone.size * rng.uniform(0.0, 1.0, (count, 1)) ** (1.0 / 3.0)
+    return zone.position + directions * radii
+
+
+# --- Wind queries -------------------------------------------------------------
+
+@case("wind_query_single", zones=[10, 1000, 10000])
+def bench_wind_query_single(zones):
+    controller, side = _quiet(build_controller, zones)
+    points = itertools.cycle(np.random.default_rng(1).uniform(0.0, side, (256, 3)))
+    return (lambda: controller.get_wind_at_position(next(points))), 1
+
+
+@case("wind_query_batch", batch=[100, 1000, 10000])
+def bench_wind_query_batch(batch):
+    controller = _tuned_scene()
+    zone = controller.wind_zones["WindZone1"]
+    points = _points_in(zone, batch)
+    return (lambda: controller.get_wind_vectors(points)), batch
+
+
+@case("wind_query_fidelity", tier=["mean", "hazards", "full"])
+def bench_wind_query_fidelity(tier):
+    controller = _tuned_scene()
+    zone = controller.wind_zones["WindZone1"]
+    points = _points_in(zone, 1000)
+    return (lambda: controller.get_wind_vectors(points, tier)), 1000
+
+
+@case("wind_step", zones=[10, 1000, 10000])
+def bench_wind_step(zones):
+    controller, side = _quiet(build_controller, zones)
+    return (lambda: controller.step()), 1
+
+
+@case("wind_query_events", events=[10, 100, 1000])
+def bench_wind_query_events(events):
+    """1000-point query in a storm zone with `events` running gust fronts and microbursts"""
+    controller = _quiet(WindController, seed=0)
+    _quiet(controller.add_wind_zone, "Storm", [0, 10, 0], 100.0)
+    zone = controller.wind_zones["Storm"]
+    rng = np.random.default_rng(0)
+    for i in range(events):
+        event_type = GustFrontEvent if i % 2 else MicroburstEvent
+        center = zone.position + rng.uniform(-80, 80, 3) * [1.0, 0.1, 1.0]
+        zone.add_event(event_type(center, radius=rng.uniform(5, 15), duration=1e6, start_time=0.0))
+    controller.step()
+    points = _points_in(zone, 1000)
+    return (lambda: controller.get_wind_vectors(points)), 1000
+
+
+# --- Wind components in isolation ---------------------------------------------
+
+@case("component_dryden")
+def bench_component_dryden():
+    state = {'u': 0.0, 'v': 0.0, 'w': 0.0}
+    noise = np.zeros(3)
+    return (lambda: dryden_turbulence(0.016, state, 2.0, 200.0, 10.0, noise)), 1
+
+
+@case("component_tornado", batch=[1, 1000])
+def bench_component_tornado(batch):
+    zone = _tuned_scene().wind_zones["WindZone1"]
+    points = _points_in(zone, batch)
+    return (lambda: zone._calculate_tornado(points)), batch
+
+
+@case("component_noise", batch=[1, 1000])
+def bench_component_noise(batch):
+    zone = _tuned_scene().wind_zones["WindZone1"]
+    points = _points_in(zone, batch)
+    return (lambda: zone._calculate_noise(points)), batch
+
+
+@case("component_gusts")
+def bench_component_gusts():
+    zone = _tuned_scene().wind_zones["WindZone1"]
+    return (lambda: zone._calculate_gusts(0.016)), 1
+
+
+@case("component_turbulence")
+def bench_component_turbulence():
+    zone = _tuned_scene().wind_zones["WindZone1"]
+    return (lambda: zone._calculate_turbulence()), 1
+
+
+# --- Flight --------------------------------------------------------------------
+
+@case("drone_step")
+def bench_drone_step():
+    drone = _quiet(DroneController, seed=0)
+    drone.wind_controller = _tuned_scene()
+    targets = itertools.cycle([np.array(w, dtype=float) for w in DEFAULT_WAYPOINTS[1:]])
+
+    def step():
+        result = drone.calculate_control(0.016)
+        if result['target_reached']:
+            drone.target_position = next(targets)
+    drone.target_position = next(targets)
+    return step, 1
+
+
+@case("swarm_step", drones=[10, 100, 1000])
+def bench_swarm_step(drones):
+    swarm = _quiet(DroneSwarmController, drones, _tuned_scene())
+    rng = np.random.default_rng(0)
+    swarm.set_positions(rng.uniform(-20, 30, (drones, 3)))
+    swarm.set_targets(rng.uniform(-20, 30, (drones, 3)))
+    return (lambda: swarm.calculate_control(0.016)), drones
+
+
+@case("mission")
+def bench_mission():
+    def mission():
+        drone = _quiet(DroneController, seed=0)
+        drone.wind_controller = _tuned_scene()
+        _quiet(fly_mission, drone, DEFAULT_WAYPOINTS)
+    return mission, 1
+
+
+# --- Backend agreement -----------------------------------------------------------
+
+def check_kernels(count=10000, seed=0):
+    """Evaluate every kernel under both backends; returns {kernel: max relative difference}"""
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(-60.0, 60.0, (count, 3))
+    centers = rng.uniform(-10.0, 10.0, (count, 3))
+    radii = rng.uniform(2.0, 8.0, count)
+    progress = rng.uniform(0.0, 1.0, count)
+    coords = points * 0.1
+    times = rng.uniform(0.0, 10.0, (count, 1)) + [0.0, 100.0, 200.0]
+    noise = _quiet(gradient_noise, seed)
+    kernels = {
+        'tornado': lambda: wind_kernels.tornado_wind(points, centers, radii, 30.0, 8.0),
+        'microburst': lambda: wind_kernels.microburst_wind(points, centers, 20.0, progress),
+        'noise': lambda: noise(coords, np.roll(coords, -1, axis=1), times),
+        'drone_control': lambda: np.concatenate(wind_kernels.drone_accelerations(
+            points, centers, points * 0.05, np.full(count, 1.5), 5.0, 2.0)),
+    }
+    backend = wind_kernels.BACKEND
+    differences = {}
+    try:
+        for name, kernel in kernels.items():
+            wind_kernels.set_backend("numpy")
+            reference = kernel()
+            wind_kernels.set_backend("numba")
+            compiled = kernel()
+            differences[name] = float(np.max(np.abs(compiled - reference) / np.maximum(np.abs(reference), 1.0)))
+    finally:
+        wind_kernels.set_backend(backend)
+    return differences
+
+
+# --- Runner ----------------------------------------------------------------------
+
+def measure(fn, min_time=0.1, repeats=5):
+    """Seconds per call: calls are batched to last min_time, best and median of repeats"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 4 or number >= 1 << 20:
+            break
+        number *= 4
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return min(samples), float(np.median(samples))
+
+
+def expand_cases(name_filter=None):
+    """Yield (case_id, builder, params) for every swept parameter combination"""
+    for name, builder, sweep in CASES:
+        keys = list(sweep)
+        for values in itertools.product(*(sweep[key] for key in keys)):
+            params = dict(zip(keys, values))
+            case_id = name + "".join(f"[{key}={value}]" for key, value in params.items())
+            if name_filter and not any(f in case_id for f in name_filter):
+                continue
+            yield case_id, builder, params
+
+
+def run_suite(name_filter=None, min_time=0.1, repeats=5):
+    """Run the selected cases and return {case_id: result}"""
+    results = {}
+    for case_id, builder, params in expand_cases(name_filter):
+        fn, items = builder(**params)
+        best, median = measure(fn, min_time, repeats)
+        results[case_id] = {
+            'params': params,
+            'seconds': best,
+            'median_seconds': median,
+            'items': items,
+            'seconds_per_item': best / items,
+        }
+        print(f"{case_id:<45} {best * 1e6:>12.2f} us  {best / items * 1e6:>10.3f} us/item")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return the cases slower than baseline by more than threshold (a fraction)"""
+    regressions = []
+    for case_id, result in results.items():
+        reference = baseline.get('results', {}).get(case_id)
+        if reference is None:
+            continue
+        ratio = result['seconds'] / reference['seconds']
+        marker = "REGRESSION" if ratio > 1.0 + threshold else ""
+        print(f"{case_id:<45} {ratio:>7.2f}x baseline {marker}")
+        if marker:
+            regressions.append((case_id, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the ZephyrSim benchmark suite")
+    parser.add_argument("-k", "--filter", nargs="+", help="only run cases whose id contains one of these")
+    parser.add_argument("--list", action="store_true", help="list case ids and exit")
+    parser.add_argument("--quick", action="store_true", help="shorter timing runs")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="write results to --baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a case fails, as a fraction (default 0.25)")
+    parser.add_argument("--kernels", choices=["numba", "numpy"], help="kernel backend (default: numba if installed)")
+    parser.add_argument("--check-kernels", action="store_true",
+                        help="check that both kernel backends agree within wind_kernels.BACKEND_RTOL and exit")
+    args = parser.parse_args(argv)
+    if args.kernels:
+        wind_kernels.set_backend(args.kernels)
+
+    if args.check_kernels:
+        if not wind_kernels.NUMBA_AVAILABLE:
+            print("⚠️ Numba is not installed; only the NumPy backend is available")
+            return 0
+        differences = check_kernels()
+        for name, difference in differences.items():
+            print(f"{name:<16} {difference:.2e}")
+        failed = [name for name, difference in differences.items() if difference > wind_kernels.BACKEND_RTOL]
+        if failed:
+            print(f"❌ Backends disagree on {', '.join(failed)}")
+            return 1
+        print("✅ Backends agree")
+        return 0
+
+    if args.list:
+        for case_id, _, _ in expand_cases(args.filter):
+            print(case_id)
+        return 0
+
+    min_time, repeats = (0.02, 3) if args.quick else (0.1, 5)
+    results = run_suite(args.filter, min_time, repeats)
+    report = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'kernels': wind_kernels.BACKEND,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} case(s) regressed more than {args.threshold:.0%}")
+            return 1
+        print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Batch Mission Runner
+Runs waypoint missions headless and faster than real time, fanned out over
+worker processes, and reports one compact result record per mission
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from scripts.fly_to_waypoints import DEFAULT_WAYPOINTS, DroneController
+    from scripts.wind_tuning import tune_wind
+except ImportError:
+    from fly_to_waypoints import DEFAULT_WAYPOINTS, DroneController
+    from wind_tuning import tune_wind
+
+WIND_PRESETS = ("none", "calm", "moderate", "stormy", "turbulent")
+
+
+def _segment_distance(point, start, end):
+    """Distance from a point to the segment start-end"""
+    segment = end - start
+    length_sq = float(np.dot(segment, segment))
+    if length_sq == 0.0:
+        return float(np.linalg.norm(point - start))
+    t = min(max(float(np.dot(point - start, segment)) / length_sq, 0.0), 1.0)
+    return float(np.linalg.norm(point - (start + t * segment)))
+
+
+def fly_mission(controller, waypoints, dt=0.016, max_time=600.0):
+    """Fly a controller through waypoints as fast as possible, without pacing
+
+    Returns the result record: completion, simulated time to complete, path
+    length, maximum deviation from the straight leg between waypoints and the
+    peak wind force magnitude.
+    """
+    waypoints = np.asarray(waypoints, dtype=float)
+    controller.current_position = waypoints[0].copy()
+    controller.current_velocity = np.zeros(3)
+
+    sim_time = 0.0
+    frames = 0
+    path_length = 0.0
+    max_deviation = 0.0
+    peak_wind_force = 0.0
+    waypoint_index = 1 if len(waypoints) > 1 else 0
+    leg_start = waypoints[0]
+    controller.set_target(waypoints[waypoint_index])
+
+    while sim_time < max_time:
+        previous = controller.current_position.copy()
+        result = controller.calculate_control(dt)
+        sim_time += dt
+        frames += 1
+
+        position = result['position']
+        path_length += float(np.linalg.norm(position - previous))
+        max_deviation = max(max_deviation, _segment_distance(position, leg_start, waypoints[waypoint_index]))
+        peak_wind_force = max(peak_wind_force, float(np.linalg.norm(result['wind_force'])))
+
+        if result['target_reached']:
+            leg_start = waypoints[waypoint_index]
+            waypoint_index += 1
+            if waypoint_index >= len(waypoints):
+                break
+            controller.set_target(waypoints[waypoint_index])
+
+    completed = waypoint_index >= len(waypoints)
+    return {
+        'completed': completed,
+        'time_to_complete': round(sim_time, 6) if completed else None,
+        'waypoints_reached': min(waypoint_index, len(waypoints)),
+        'frames': frames,
+        'path_length': path_length,
+        'max_deviation': max_deviation,
+        'peak_wind_force': peak_wind_force,
+    }
+
+
+def run_mission(mission, preset="moderate", tuned=False, dt=0.016, max_time=600.0, seed=None):
+    """Build a drone and wind scene for one mission/preset pair and fly it headless
+
+    tuned applies wind_tuning.tune_wind on top of the preset. It overwrites
+    the preset's parameters, so tuned records barely vary across presets.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        controller = DroneController(seed=seed)
+        if controller.wind_controller:
+            if preset == "none":
+                controller.wind_controller = None
+            else:
+                controller.wind_controller.create_preset_wind_conditions(preset)
+                if tuned:
+                    tune_wind(controller.wind_controller)
+        start = time.perf_counter()
+        record = fly_mission(controller, mission['waypoints'], dt, max_time)
+    record['wall_time'] = time.perf_counter() - start
+    record['mission'] = mission['name']
+    record['preset'] = preset
+    return record
+
+
+def _run_job(job):
+    return run_mission(*job)
+
+
+def _silence_worker():
+    sys.stdout = open(os.devnull, "w")
+
+
+def run_missions(missions, presets=("moderate",), tuned=False, dt=0.016, max_time=600.0, workers=None,
+                 seed=None):
+    """Run every mission under every preset over a process pool, yielding records in order
+
+    Each job gets its own stream spawned from the scenario `seed`, so records
+    are bit-reproducible regardless of the worker count.
+    """
+    pairs = [(mission, preset) for mission in missions for preset in presets]
+    seeds = np.random.SeedSequence(seed).spawn(len(pairs))
+    jobs = [(mission, preset, tuned, dt, max_time, job_seed)
+            for (mission, preset), job_seed in zip(pairs, seeds)]
+    if workers == 1:
+        yield from map(_run_job, jobs)
+        return
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_silence_worker) as executor:
+        yield from executor.map(_run_job, jobs, chunksize=chunksize)
+
+
+def load_missions(path):
+    """Load missions from JSON: a list of {"name", "waypoints"} or of waypoint lists"""
+    with open(path) as f:
+        missions = json.load(f)
+    return [
+        mission if isinstance(mission, dict) else {'name': f"mission{i}", 'waypoints': mission}
+        for i, mission in enumerate(missions)
+    ]
+
+
+def main(argv=None):
+    """Command-line entry point for headless batch runs"""
+    parser = argparse.ArgumentParser(description="Run waypoint missions headless over a process pool")
+    parser.add_argument("--missions", help="JSON file of missions (default: the fly_to_waypoints mission)")
+    parser.add_argument("--presets", nargs="+", default=["moderate"], choices=WIND_PRESETS)
+    parser.add_argument("--tune", action="store_true",
+                        help="apply wind_tuning.tune_wind after the preset (overrides most preset parameters)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--dt", type=float, default=0.016)
+    parser.add_argument("--max-time", type=float, default=600.0, help="simulated seconds before giving up")
+    parser.add_argument("--seed", type=int, default=None, help="scenario seed for reproducible runs")
+    parser.add_argument("--output", help="write JSON lines here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.missions:
+        missions = load_missions(args.missions)
+    else:
+        missions = [{'name': "default", 'waypoints': DEFAULT_WAYPOINTS}]
+
+    start = time.perf_counter()
+    out = open(args.output, "w") if args.output else sys.stdout
+    count = 0
+    try:
+        for record in run_missions(missions, args.presets, args.tune, args.dt,
+                                   args.max_time, args.workers, args.seed):
+            out.write(json.dumps(record) + "\n")
+            count += 1
+    finally:
+        if args.output:
+            out.close()
+    print(f"🏁 {count} missions in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Drone Swarm Controller
+Struct-of-arrays waypoint control for many drones stepped in one vectorized pass
+"""
+
+import numpy as np
+
+try:
+    from scripts.fly_to_waypoints import DEFAULT_WIND_ZONES, DroneController
+    from scripts.wind_controller import WindController
+    from scripts.wind_kernels import drone_accelerations
+except ImportError:
+    from fly_to_waypoints import DEFAULT_WIND_ZONES, DroneController
+    from wind_controller import WindController
+    from wind_kernels import drone_accelerations
+
+
+class DroneSwarmController:
+    """Swarm variant of DroneController
+
+    Positions, velocities and targets are (N, 3) arrays and masses and drag
+    parameters are (N,) arrays; calculate_control applies the same control law,
+    acceleration clamp, wind drag and Euler update as DroneController to every
+    drone at once. It does no USD writes; call step_visuals() at the rate
+    the stage should be redrawn.
+    """
+
+    def __init__(self, num_drones, wind_controller=None, mass=1.5, drag_coefficient=0.3,
+                 cross_sectional_area=0.1, seed=None):
+        self.num_drones = num_drones
+        self.positions = np.tile([0.0, 5.0, 0.0], (num_drones, 1))
+        self.velocities = np.zeros((num_drones, 3))
+        self.targets = self.positions.copy()
+        self.max_velocity = 5.0  # m/s
+        self.max_acceleration = 2.0  # m/s²
+        self.position_tolerance = 0.5  # meters
+
+        # Drone physics properties (scalars are broadcast to every drone)
+        self.masses = np.full(num_drones, mass, dtype=float)
+        self.drag_coefficients = np.full(num_drones, drag_coefficient, dtype=float)
+        self.cross_sectional_areas = np.full(num_drones, cross_sectional_area, dtype=float)
+
+        # Wind controller (shared by the whole swarm)
+        self.wind_controller = wind_controller
+        if self.wind_controller is None:
+            self.wind_controller = WindController(seed=seed)
+            # Add wind zones (matching main_stage.usd)
+            for zone_name, position, size in DEFAULT_WIND_ZONES:
+                self.wind_controller.add_wind_zone(zone_name, position, size)
+            print("🌪️ Wind zones initialized")
+
+    compute_air_density = staticmethod(DroneController.compute_air_density)
+
+    def set_positions(self, positions):
+        """Set all drone positions, (N, 3) or a single broadcast position"""
+        self.positions = np.array(np.broadcast_to(positions, (self.num_drones, 3)), dtype=float)
+
+    def set_targets(self, targets):
+        """Set all target waypoints, (N, 3) or a single broadcast waypoint"""
+        self.targets = np.array(np.broadcast_to(targets, (self.num_drones, 3)), dtype=float)
+
+    def calculate_wind_forces(self, positions, velocities, indices=None):
+        """Calculate wind forces on drones at (M, 3) positions
+
+        indices selects the drones' physical properties when M < N.
+        """
+        if not self.wind_controller:
+            return np.zeros_like(positions)
+        if indices is None:
+            indices = slice(None)
+
+        # Get wind vectors at drone positions
+        wind_velocities = self.wind_controller.get_wind_vectors(positions)
+
+        # Drag on the relative velocity (drone velocity - wind velocity)
+        relative_velocities = velocities - wind_velocities
+        air_densities = self.compute_air_density(positions[:, 1])
+        relative_speeds = np.sqrt(np.sum(relative_velocities ** 2, axis=1))
+        drag_scale = (-0.5 * air_densities * self.drag_coefficients[indices]
+                      * self.cross_sectional_areas[indices] * relative_speeds)
+        drag_forces = drag_scale[:, None] * relative_velocities
+
+        # Add wind force (simplified)
+        wind_forces = wind_velocities * (self.masses[indices] * 0.1)[:, None]
+
+        return drag_forces + wind_forces
+
+    def calculate_control(self, dt):
+        """Step every drone once; returns per-drone arrays and a target_reached mask"""
+        current_positions = self.positions.copy()
+        position_errors = self.targets - current_positions
+        distances = np.sqrt(np.sum(position_errors ** 2, axis=1))
+        moving = distances > self.position_tolerance
+
+        # Advance the wind field once per frame; any drone can trigger events
+        if self.wind_controller:
+            self.wind_controller.step(dt, current_positions)
+
+        wind_forces = np.zeros((self.num_drones, 3))
+        control_accelerations = np.zeros((self.num_drones, 3))
+        if moving.any():
+            index = np.flatnonzero(moving)
+            positions = current_positions[index]
+            velocities = self.velocities[index]
+
+            # Velocity controller plus wind, clamped to max_acceleration
+            wind = self.calculate_wind_forces(positions, velocities, index)
+            control, total = drone_accelerations(position_errors[index], velocities, wind, self.masses[index],
+                                                 self.max_velocity, self.max_acceleration)
+
+            # Euler update
+            velocities = velocities + total * dt
+            self.velocities[index] = velocities
+            self.positions[index] = positions + velocities * dt
+            wind_forces[index] = wind
+            control_accelerations[index] = control
+
+        # Drones at their target stop
+        self.velocities[~moving] = 0.0
+
+        altitudes = current_positions[:, 1]
+        return {
+            'positions': self.positions,
+            'velocities': self.velocities,
+            'target_reached': ~moving,
+            'distances': distances,
+            'wind_forces': wind_forces,
+            'control_accelerations': control_accelerations,
+            'altitudes': altitudes,
+            'air_densities': self.compute_air_density(altitudes)
+        }
+
+    def step_visuals(self, dt=None):
+        """Visual stage: write the wind visuals"""
+        if self.wind_controller:
+            self.wind_controller.update()
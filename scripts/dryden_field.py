@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Frozen Dryden Turbulence
+Spatially correlated Dryden-spectrum velocity fields synthesized once by FFT,
+stored as memory-mapped .npy files and sampled with Taylor's frozen turbulence
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from scripts.wind_field_cache import DEFAULT_CACHE_DIR, trilinear
+except ImportError:
+    from wind_field_cache import DEFAULT_CACHE_DIR, trilinear
+
+# Bump when the synthesis or file layout changes
+DRYDEN_FORMAT_VERSION = 1
+
+
+def dryden_energy_spectrum(k, length_scale):
+    """Isotropic 3D energy spectrum E(k) whose longitudinal correlation is exp(-r/L) (Dryden), for unit variance"""
+    kl = k * length_scale
+    return 8.0 * length_scale / np.pi * kl ** 4 / (1.0 + kl ** 2) ** 3
+
+
+class DrydenField:
+    """Periodic, divergence-free, unit-variance turbulence on a 3D grid
+
+    The field is stored in grid units with the turbulence length scale equal
+    to `cells_per_length` cells, so one synthesized field serves every zone:
+    sample() rescales it to the zone's length scale L and intensity sigma and
+    advects it with the mean wind (Taylor's frozen turbulence hypothesis),
+    u(x, t) = sigma * field((x - V t) / L * cells_per_length).
+    """
+
+    def __init__(self, data, cells_per_length, path=None):
+        # data: (nx, ny, nz, 3) float32, each component with unit variance
+        self.data = data
+        self.cells_per_length = float(cells_per_length)
+        self.shape = np.array(data.shape[:3])
+        self.path = path
+
+    @classmethod
+    def synthesize(cls, shape=64, cells_per_length=4.0, seed=0, cache_dir=DEFAULT_CACHE_DIR, force=False):
+        """Synthesize a field, or load an identical one from the cache directory
+
+        shape: grid points per axis (int or 3-sequence); the field repeats
+        every shape / cells_per_length length scales along each axis.
+        """
+        shape = np.broadcast_to(np.asarray(shape, dtype=int), (3,))
+        settings = {
+            "version": DRYDEN_FORMAT_VERSION,
+            "shape": shape.tolist(),
+            "cells_per_length": float(cells_per_length),
+            "seed": seed,
+        }
+        key = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+        path = os.path.join(cache_dir, f"dryden_{key}.npy")
+        if os.path.exists(path) and not force:
+            return cls.load(path)
+
+        rng = np.random.default_rng(seed)
+        # Wavenumbers in radians per grid cell; the length scale is cells_per_length cells
+        k_axes = [2.0 * np.pi * np.fft.fftfreq(n) for n in shape[:2]] + [2.0 * np.pi * np.fft.rfftfreq(shape[2])]
+        kx, ky, kz = np.meshgrid(*k_axes, indexing="ij")
+        k = np.sqrt(kx ** 2 + ky ** 2 + kz ** 2)
+        k[0, 0, 0] = 1.0
+
+        # Curl of a random vector potential with |A|^2 ~ E(k) / (4 pi k^4) gives the
+        # isotropic, divergence-free spectral tensor E(k) / (4 pi k^2) (delta_ij - k_i k_j / k^2)
+        amplitude = np.sqrt(dryden_energy_spectrum(k, cells_per_length) / (4.0 * np.pi * k ** 4))
+        amplitude[0, 0, 0] = 0.0  # no mean flow
+        potential = [np.fft.rfftn(rng.standard_normal(shape)) * amplitude for _ in range(3)]
+        velocity = [
+            1j * (ky * potential[2] - kz * potential[1]),
+            1j * (kz * potential[0] - kx * potential[2]),
+            1j * (kx * potential[1] - ky * potential[0]),
+        ]
+
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        data = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(*shape.tolist(), 3))
+        for axis, spectrum in enumerate(velocity):
+            component = np.fft.irfftn(spectrum, s=shape.tolist())
+            # Normalize to unit variance: the finite grid misses part of the spectrum
+            data[..., axis] = component / component.std()
+        data.flush()
+        del data
+
+        with open(f"{tmp_path}.json", "w") as f:
+            json.dump({"cells_per_length": float(cells_per_length), "settings": settings}, f)
+        # Rename into place so concurrent workers never see a partial file
+        os.replace(f"{tmp_path}.json", f"{path}.json")
+        os.replace(tmp_path, path)
+        print(f"🌀 Synthesized Dryden field {shape.tolist()} to {path}")
+        return cls.load(path)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a field written by synthesize()"""
+        with open(f"{path}.json") as f:
+            metadata = json.load(f)
+        return cls(np.load(path, mmap_mode="r"), metadata["cells_per_length"], path)
+
+    def sample(self, positions, time, sigma, length_scale, mean_wind):
+        """Turbulent velocity at (N, 3) positions and a time
+
+        mean_wind (3-vector, m/s) advects the frozen field; sigma (m/s) and
+        length_scale (m) scale it.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        cells = (positions - np.asarray(mean_wind, dtype=float) * time) * (self.cells_per_length / length_scale)
+        return sigma * self.interpolate(cells)
+
+    def interpolate(self, cells):
+        """Periodic trilinear interpolation at (N, 3) grid coordinates"""
+        lattice = np.floor(cells)
+        w = cells - lattice
+        n = self.shape
+        i0 = lattice.astype(np.intp) % n
+        i1 = (i0 + 1) % n
+        return trilinear(self.data, i0, i1, w)
+
+
+@lru_cache(maxsize=None)
+def frozen_dryden_field(seed=0):
+    """Shared DrydenField for a seed (synthesized on first use, then memory-mapped from the cache)"""
+    return DrydenField.synthesize(seed=seed)
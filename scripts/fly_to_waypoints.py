@@ -4,8 +4,8 @@ ZephyrSim - Fly to Waypoints Script
 Controls a drone to fly between predefined waypoints in Isaac Sim
 """
 
+import argparse
 import numpy as np
-import time
 import math
 import sys
 
@@ -16,7 +16,7 @@ try:
     import omni.isaac.core.utils.prims as prim_utils
     from omni.isaac.core.robots import Robot
     import omni.usd
-    from pxr import Gf
+    from pxr import Gf, Sdf
     ISAAC_SIM_AVAILABLE = True
     print("✅ Isaac Sim modules loaded successfully")
 except ImportError as e:
@@ -26,19 +26,83 @@ except ImportError as e:
 
 # Import wind controller
 try:
-    from scripts.wind_controller import WindController
-    from scripts.wind_tuning import tune_wind
+    try:
+        from scripts.wind_controller import WindController
+        from scripts.wind_tuning import tune_wind
+    except ImportError:
+        from wind_controller import WindController
+        from wind_tuning import tune_wind
     WIND_CONTROLLER_AVAILABLE = True
     print("✅ Wind controller loaded successfully")
 except ImportError as e:
     print(f"⚠️  Wind controller not available: {e}")
     WIND_CONTROLLER_AVAILABLE = False
 
+try:
+    from scripts.realtime import FixedRateLoop, MultiRateScheduler
+    from scripts.telemetry import TelemetryRecorder
+    from scripts.wind_kernels import drone_accelerations
+    from scripts.wind_planner import WindAwarePlanner
+    from scripts.wind_profiling import PROFILER
+    from scripts.wind_server import WindClient
+except ImportError:
+    from realtime import FixedRateLoop, MultiRateScheduler
+    from telemetry import TelemetryRecorder
+    from wind_kernels import drone_accelerations
+    from wind_planner import WindAwarePlanner
+    from wind_profiling import PROFILER
+    from wind_server import WindClient
+
+# Default mission waypoints (x, y, z) in meters
+DEFAULT_WAYPOINTS = [
+    [0, 5, 0],      # Start position
+    [10, 8, 5],     # Waypoint 1
+    [20, 10, 10],   # Waypoint 2 (in wind zone)
+    [15, 15, 15],   # Waypoint 3
+    [5, 12, 8],     # Waypoint 4
+    [0, 5, 0]       # Return to start
+]
+
+# Wind zones (name, position, size) matching main_stage.usd
+DEFAULT_WIND_ZONES = [
+    ("WindZone1", [20, 10, 0], 10.0),
+    ("WindZone2", [-15, 15, 30], 12.0),
+]
+
+# Integrators accepted by DroneController (the first is the default)
+INTEGRATORS = ("semi_implicit_euler", "explicit_euler", "rk4", "adaptive")
+
+# Bogacki-Shampine 3(2) tableau used by the adaptive integrator
+_BS_C = (0.0, 0.5, 0.75)
+_BS_B = (2.0 / 9.0, 1.0 / 3.0, 4.0 / 9.0)
+_BS_E = (2.0 / 9.0 - 7.0 / 24.0, 1.0 / 3.0 - 0.25, 4.0 / 9.0 - 1.0 / 3.0, -0.125)
+
 class DroneController:
-    """Simple drone controller for waypoint navigation with wind effects"""
+    """Simple drone controller for waypoint navigation with wind effects
+
+    Each frame advances the wind field once and then integrates the drone's
+    position and velocity over dt with the selected integrator, split into
+    `substeps` equal steps. Sub-steps and the RK stages re-evaluate the control
+    law and query the (frozen) wind field at their own state. "adaptive" uses
+    an embedded Bogacki-Shampine 3(2) pair with error control (rtol/atol on
+    position and velocity) and carries its step size across frames.
+
+    calculate_control() runs all of that at one rate. For multi-rate runs the
+    same work is split into stages that can be called separately:
+    step_wind() advances the field and samples it at the drone, step_control()
+    evaluates the control law, step_physics() integrates, and step_visuals()
+    writes the stage. Between their calls the wind sample and the control
+    command are held, so physics can run much faster than wind and control
+    (see build_scheduler).
+    """
     
-    def __init__(self, drone_prim_path="/World/Drone"):
+    def __init__(self, drone_prim_path="/World/Drone", seed=None, integrator="semi_implicit_euler", substeps=1,
+                 wind_server=None):
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator {integrator!r}, expected one of {INTEGRATORS}")
         self.drone_prim_path = drone_prim_path
+        self._drone_prim = None
+        self._written_position = None
         self.current_position = np.array([0.0, 5.0, 0.0])
         self.current_velocity = np.array([0.0, 0.0, 0.0])
         self.target_position = np.array([0.0, 5.0, 0.0])
@@ -47,6 +111,20 @@ class DroneController:
         self.position_tolerance = 0.5  # meters
         self.velocity_tolerance = 0.1  # m/s
         
+        # Integration
+        self.integrator = integrator
+        self.substeps = max(1, int(substeps))
+        self.rtol = 1e-3               # adaptive: relative error per step
+        self.atol = 1e-3               # adaptive: absolute error per step (m, m/s)
+        self.min_step = 1e-4           # adaptive: smallest step (s)
+        self.adaptive_step = None      # adaptive: last accepted step size (s)
+        self.wind_queries = 0          # wind field evaluations so far
+        
+        # Held between multi-rate stages
+        self.wind_velocity = np.zeros(3)           # last wind sample at the drone
+        self.control_acceleration = np.zeros(3)    # last control command
+        self.target_reached = False
+        
         # Drone physics properties
         self.mass = 1.5  # kg
         self.drag_coefficient = 0.3
@@ -55,15 +133,20 @@ class DroneController:
         
         # Wind controller
         self.wind_controller = None
-        if WIND_CONTROLLER_AVAILABLE:
-            self.wind_controller = WindController()
+        if wind_server:
+            # The shared wind server owns the zones and steps them once per frame for all clients
+            self.wind_controller = WindClient(wind_server)
+            print(f"🌪️ Using wind server at {wind_server}")
+        elif WIND_CONTROLLER_AVAILABLE:
+            self.wind_controller = WindController(seed=seed)
             # Add wind zones (matching main_stage.usd)
-            self.wind_controller.add_wind_zone("WindZone1", [20, 10, 0], 10.0)
-            self.wind_controller.add_wind_zone("WindZone2", [-15, 15, 30], 12.0)
+            for zone_name, position, size in DEFAULT_WIND_ZONES:
+                self.wind_controller.add_wind_zone(zone_name, position, size)
             print("🌪️ Wind zones initialized")
 
-    def compute_air_density(self, altitude_m):
-        """Returns air density (kg/m³) at a given altitude in meters"""
+    @staticmethod
+    def compute_air_density(altitude_m):
+        """Returns air density (kg/m³) at a given altitude in meters (scalar or array)"""
         # Barometric formula approximation (valid up to ~11km)
         sea_level_density = 1.225  # kg/m³ at 0 m
         temp_lapse_rate = 0.0065   # K/m
@@ -72,8 +155,7 @@ class DroneController:
         molar_mass = 0.0289644     # kg/mol
         gravity = 9.80665          # m/s²
 
-        if altitude_m < 0:
-            altitude_m = 0
+        altitude_m = np.maximum(altitude_m, 0)
 
         temp = sea_level_temp - temp_lapse_rate * altitude_m
         exponent = (gravity * molar_mass) / (8.31447 * temp_lapse_rate)
@@ -85,13 +167,49 @@ class DroneController:
     def set_target(self, target_position):
         """Set the target waypoint position"""
         self.target_position = np.array(target_position)
+        self.target_reached = False
         print(f"🎯 Target set to: {self.target_position}")
         
+    def snapshot(self):
+        """Checkpoint the drone state and the wind field
+
+        Gains and limits are left out, so branches restored from one snapshot
+        can try different ones. The result is picklable for worker processes.
+        A wind source without snapshot() (a WindClient: the wind server's field
+        is shared with other processes) cannot be checkpointed.
+        """
+        if self.wind_controller and not hasattr(self.wind_controller, "snapshot"):
+            raise ValueError(f"Cannot snapshot a drone flying on a {type(self.wind_controller).__name__}")
+        return {
+            'position': self.current_position.copy(),
+            'velocity': self.current_velocity.copy(),
+            'target': self.target_position.copy(),
+            'adaptive_step': self.adaptive_step,
+            'wind_queries': self.wind_queries,
+            'wind_velocity': self.wind_velocity.copy(),
+            'control_acceleration': self.control_acceleration.copy(),
+            'target_reached': self.target_reached,
+            'wind': self.wind_controller.snapshot() if self.wind_controller else None,
+        }
+        
+    def restore(self, snapshot):
+        """Return to a snapshot() instead of re-simulating up to it"""
+        self.current_position = snapshot['position'].copy()
+        self.current_velocity = snapshot['velocity'].copy()
+        self.target_position = snapshot['target'].copy()
+        self.adaptive_step = snapshot['adaptive_step']
+        self.wind_queries = snapshot['wind_queries']
+        self.wind_velocity = snapshot['wind_velocity'].copy()
+        self.control_acceleration = snapshot['control_acceleration'].copy()
+        self.target_reached = snapshot['target_reached']
+        if self.wind_controller and snapshot['wind'] is not None:
+            self.wind_controller.restore(snapshot['wind'])
+        
     def get_current_position(self):
         """Get current drone position from stage or simulation"""
         if ISAAC_SIM_AVAILABLE:
             try:
-                drone_prim = prim_utils.get_prim_at_path(self.drone_prim_path)
+                drone_prim = self.get_drone_prim()
                 if drone_prim:
                     # Get world transform
                     world_transform = omni.usd.get_world_transform_matrix(drone_prim)
@@ -110,7 +228,11 @@ class DroneController:
         
         # Get wind vector at drone position
         wind_velocity = self.wind_controller.get_wind_at_position(position)
+        self.wind_queries += 1
+        return self._wind_force(position, velocity, wind_velocity)
         
+    def _wind_force(self, position, velocity, wind_velocity):
+        """Drag and wind force on the drone for a given wind velocity"""
         # Calculate relative velocity (drone velocity - wind velocity)
         relative_velocity = velocity - wind_velocity
         
@@ -130,47 +252,117 @@ class DroneController:
         
         return drag_force + wind_force
         
+    def _accelerations(self, position, velocity):
+        """Control law at a state: returns (control acceleration, wind force, total acceleration)"""
+        position_error = self.target_position - position
+        wind_force = self.calculate_wind_force(position, velocity)
+        
+        # Desired velocity proportional to error (gain 2, limited to max_velocity), velocity
+        # controller (gain 5) plus wind acceleration, limited to max_acceleration
+        control, total = drone_accelerations(
+            position_error[None], velocity[None], wind_force[None],
+            np.array([self.mass]), self.max_velocity, self.max_acceleration
+        )
+        return control[0], wind_force, total[0]
+        
+    def _held_wind_force(self, position, velocity):
+        """Wind force from the held wind sample (see step_wind)"""
+        if not self.wind_controller:
+            return np.zeros(3)
+        return self._wind_force(position, velocity, self.wind_velocity)
+        
+    def _held_accelerations(self, position, velocity):
+        """Held control command plus the held wind's force, clamped like the control law"""
+        wind_force = self._held_wind_force(position, velocity)
+        total = self.control_acceleration + wind_force / self.mass
+        magnitude = np.linalg.norm(total)
+        if magnitude > self.max_acceleration:
+            total = total * (self.max_acceleration / magnitude)
+        return self.control_acceleration, wind_force, total
+        
+    def _derivative(self, state, accelerations=None):
+        """d/dt of the (6,) state [position, velocity]"""
+        accelerations = accelerations or self._accelerations
+        return np.concatenate([state[3:], accelerations(state[:3], state[3:])[2]])
+        
+    def integrate(self, dt, acceleration, accelerations=None):
+        """Advance current_position and current_velocity by dt
+
+        `acceleration` is the total acceleration already evaluated at the
+        current state, reused as the first stage. `accelerations(position,
+        velocity)` evaluates later stages (default: the control law with a
+        fresh wind query).
+        """
+        state = np.concatenate([self.current_position, self.current_velocity])
+        if self.integrator == "adaptive":
+            state = self._integrate_adaptive(state, dt, acceleration, accelerations)
+        else:
+            h = dt / self.substeps
+            for substep in range(self.substeps):
+                a = acceleration if substep == 0 else self._derivative(state, accelerations)[3:]
+                state = self._fixed_step(state, h, a, accelerations)
+        self.current_position[:] = state[:3]
+        self.current_velocity[:] = state[3:]
+        
+    def _fixed_step(self, state, h, acceleration, accelerations=None):
+        """One step of a fixed-step integrator"""
+        position, velocity = state[:3], state[3:]
+        if self.integrator == "explicit_euler":
+            return np.concatenate([position + velocity * h, velocity + acceleration * h])
+        if self.integrator == "semi_implicit_euler":
+            velocity = velocity + acceleration * h
+            return np.concatenate([position + velocity * h, velocity])
+        # Classic RK4
+        k1 = np.concatenate([velocity, acceleration])
+        k2 = self._derivative(state + 0.5 * h * k1, accelerations)
+        k3 = self._derivative(state + 0.5 * h * k2, accelerations)
+        k4 = self._derivative(state + h * k3, accelerations)
+        return state + (h / 6.0) * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+        
+    def _integrate_adaptive(self, state, dt, acceleration, accelerations=None):
+        """Cover dt with error-controlled Bogacki-Shampine steps"""
+        h = self.adaptive_step or dt
+        k1 = np.concatenate([state[3:], acceleration])
+        remaining = dt
+        while remaining > 1e-12:
+            step = min(h, remaining)
+            k2 = self._derivative(state + _BS_C[1] * step * k1, accelerations)
+            k3 = self._derivative(state + _BS_C[2] * step * k2, accelerations)
+            candidate = state + step * (_BS_B[0] * k1 + _BS_B[1] * k2 + _BS_B[2] * k3)
+            k4 = self._derivative(candidate, accelerations)
+            error = step * (_BS_E[0] * k1 + _BS_E[1] * k2 + _BS_E[2] * k3 + _BS_E[3] * k4)
+            scale = self.atol + self.rtol * np.maximum(np.abs(state), np.abs(candidate))
+            error_norm = float(np.max(np.abs(error) / scale))
+            accepted = error_norm <= 1.0 or step <= self.min_step
+            if accepted:
+                # The last stage is the next step's first (FSAL)
+                state = candidate
+                k1 = k4
+                remaining -= step
+            factor = 5.0 if error_norm == 0.0 else min(5.0, max(0.2, 0.9 * error_norm ** (-1.0 / 3.0)))
+            proposed = max(self.min_step, step * factor)
+            # A step shortened to land on the frame boundary says little about the next one
+            h = max(h, proposed) if accepted and step < h else proposed
+        self.adaptive_step = h
+        return state
+        
     def calculate_control(self, dt):
         """Calculate control inputs for waypoint navigation with wind effects"""
         current_pos = self.get_current_position()
         position_error = self.target_position - current_pos
         distance = np.linalg.norm(position_error)
         
+        # Advance the wind field once per frame; the drone can trigger events
+        if self.wind_controller:
+            self.wind_controller.step(dt, current_pos)
+        
         # Simple proportional control
         if distance > self.position_tolerance:
-            # Calculate desired velocity (proportional to error)
-            desired_velocity = position_error * 2.0  # Proportional gain
+            # Control and wind at the frame's start state
+            control_acceleration, wind_force, total_acceleration = self._accelerations(current_pos, self.current_velocity)
             
-            # Limit velocity
-            velocity_magnitude = np.linalg.norm(desired_velocity)
-            if velocity_magnitude > self.max_velocity:
-                desired_velocity = desired_velocity * (self.max_velocity / velocity_magnitude)
-                
-            # Calculate acceleration
-            velocity_error = desired_velocity - self.current_velocity
-            control_acceleration = velocity_error * 5.0  # Proportional gain for velocity
-            
-            # Calculate wind forces
-            wind_force = self.calculate_wind_force(current_pos, self.current_velocity)
-            wind_acceleration = wind_force / self.mass
-            
-            # Combine control and wind accelerations
-            total_acceleration = control_acceleration + wind_acceleration
-            
-            # Limit total acceleration
-            acc_magnitude = np.linalg.norm(total_acceleration)
-            if acc_magnitude > self.max_acceleration:
-                total_acceleration = total_acceleration * (self.max_acceleration / acc_magnitude)
-                
-            # Update velocity
-            self.current_velocity += total_acceleration * dt
-            
-            # Update position
-            self.current_position += self.current_velocity * dt
-            
-            # Update wind controller
-            if self.wind_controller:
-                self.wind_controller.update()
+            # Update velocity and position
+            self.integrate(dt, total_acceleration)
             
             altitude = current_pos[1]
             air_density = self.compute_air_density(altitude)
@@ -203,18 +395,110 @@ class DroneController:
                 'air_density': air_density
             }
     
+    def step_wind(self, dt):
+        """Wind stage: advance the wind field by dt and sample it at the drone
+
+        Stages read the integrated state; the stage pose is only written by
+        step_visuals, so reading it back here would undo physics since then.
+        """
+        if not self.wind_controller:
+            return
+        position = self.current_position.copy()
+        self.wind_controller.step(dt, position)
+        self.wind_velocity = self.wind_controller.get_wind_at_position(position)
+        self.wind_queries += 1
+        
+    def step_control(self, dt=None):
+        """Control stage: evaluate the control law with the held wind sample; returns status()"""
+        position = self.current_position.copy()
+        position_error = self.target_position - position
+        self.target_reached = np.linalg.norm(position_error) <= self.position_tolerance
+        if self.target_reached:
+            # Target reached, stop
+            self.current_velocity = np.zeros(3)
+            self.control_acceleration = np.zeros(3)
+        else:
+            control, _ = drone_accelerations(
+                position_error[None], self.current_velocity[None], self._held_wind_force(position, self.current_velocity)[None],
+                np.array([self.mass]), self.max_velocity, self.max_acceleration
+            )
+            self.control_acceleration = control[0]
+        return self.status()
+        
+    def step_physics(self, dt):
+        """Physics stage: integrate dt with the held control command and wind sample"""
+        if self.target_reached:
+            return
+        _, _, total_acceleration = self._held_accelerations(self.current_position, self.current_velocity)
+        self.integrate(dt, total_acceleration, self._held_accelerations)
+        
+    def step_visuals(self, dt=None):
+        """Visual stage: write the drone pose and wind visuals"""
+        self.update_drone_position(self.current_position)
+        
+    def status(self):
+        """The current state, keyed like calculate_control's result"""
+        position = self.current_position
+        altitude = position[1]
+        return {
+            'position': position,
+            'velocity': self.current_velocity,
+            'target_reached': self.target_reached,
+            'distance': np.linalg.norm(self.target_position - position),
+            'wind_force': np.zeros(3) if self.target_reached else self._held_wind_force(position, self.current_velocity),
+            'control_acceleration': self.control_acceleration,
+            'altitude': altitude,
+            'air_density': self.compute_air_density(altitude)
+        }
+        
+    def build_scheduler(self, physics_period, control_divisor=1, wind_divisor=1, visual_divisor=1,
+                        recorder=None, telemetry_divisor=1):
+        """MultiRateScheduler running this drone's stages
+
+        Physics integrates every `physics_period`; wind, control, telemetry
+        and visuals run every `*_divisor` physics steps. Wind and control run
+        before physics within a tick, so physics sees their fresh values.
+        """
+        scheduler = MultiRateScheduler(physics_period)
+        scheduler.add_stage("wind", self.step_wind, wind_divisor)
+        scheduler.add_stage("control", self.step_control, control_divisor)
+        scheduler.add_stage("physics", self.step_physics)
+        if recorder:
+            scheduler.add_stage("telemetry", lambda dt: recorder.record(scheduler.sim_time + physics_period, self.status()),
+                                telemetry_divisor)
+        scheduler.add_stage("visuals", self.step_visuals, visual_divisor)
+        return scheduler
+    
+    def get_drone_prim(self):
+        """Resolve the drone prim once and reuse the handle while it stays valid"""
+        if self._drone_prim is None or not self._drone_prim.IsValid():
+            prim = prim_utils.get_prim_at_path(self.drone_prim_path)
+            self._drone_prim = prim if prim and prim.IsValid() else None
+        return self._drone_prim
+        
     def update_drone_position(self, new_position):
-        """Update drone position in the stage or simulation"""
+        """Update drone position and wind visuals in the stage or simulation
+
+        All per-frame stage writes happen inside a single Sdf.ChangeBlock, and
+        the drone pose is only written when it changed.
+        """
         self.current_position = np.array(new_position)
         
         if ISAAC_SIM_AVAILABLE:
             try:
-                drone_prim = prim_utils.get_prim_at_path(self.drone_prim_path)
-                if drone_prim:
-                    # Set world transform
-                    transform = Gf.Matrix4d()
-                    transform.SetTranslate(Gf.Vec3d(new_position[0], new_position[1], new_position[2]))
-                    omni.usd.set_world_transform_matrix(drone_prim, transform)
+                if self.wind_controller:
+                    self.wind_controller.prepare_visuals()
+                with Sdf.ChangeBlock():
+                    if self.wind_controller:
+                        self.wind_controller.write_visuals()
+                    drone_prim = self.get_drone_prim()
+                    position = tuple(self.current_position)
+                    if drone_prim and position != self._written_position:
+                        # Set world transform
+                        transform = Gf.Matrix4d()
+                        transform.SetTranslate(Gf.Vec3d(*position))
+                        omni.usd.set_world_transform_matrix(drone_prim, transform)
+                        self._written_position = position
             except Exception as e:
                 print(f"⚠️  Error updating drone position in stage: {e}")
 
@@ -229,40 +513,74 @@ def print_status(waypoint_index, total_waypoints, position, distance, velocity,
     print(f"   Altitude: {altitude:.2f} m")
     print(f"   Air Density: {air_density:.4f} kg/m³")
 
-def main():
+def main(argv=None):
     """Main function to run waypoint navigation with wind effects"""
+    parser = argparse.ArgumentParser(description="Fly the drone through the default waypoints")
+    parser.add_argument("--telemetry", help="record every step to this directory (or .parquet file)")
+    parser.add_argument("--profile", help="time every wind component and write the report JSON here")
+    parser.add_argument("--integrator", choices=INTEGRATORS, default=INTEGRATORS[0], help="drone state integrator")
+    parser.add_argument("--substeps", type=int, default=1, help="integrator steps per frame")
+    parser.add_argument("--no-realtime", action="store_true", help="run as fast as possible instead of at 60 Hz")
+    parser.add_argument("--plan", action="store_true", help="route around wind hazards with the wind-aware planner")
+    parser.add_argument("--wind-server", help="query the wind server on this Unix socket instead of a local wind field")
+    parser.add_argument("--physics-hz", type=float, help="integrate at this rate, with the stages below at divisors of it")
+    for stage in ("control", "wind", "telemetry", "visual"):
+        parser.add_argument(f"--{stage}-divisor", type=int,
+                            help=f"with --physics-hz: run {stage} every N physics steps (default: ~60 Hz)")
+    args = parser.parse_args(argv)
+    if args.profile:
+        PROFILER.enable()
+    
     print("🌬️ ZephyrSim - Fly to Waypoints (with Wind Effects)")
     print("=" * 60)
     
     # Define waypoints (x, y, z) in meters
-    waypoints = [
-        [0, 5, 0],      # Start position
-        [10, 8, 5],     # Waypoint 1
-        [20, 10, 10],   # Waypoint 2 (in wind zone)
-        [15, 15, 15],   # Waypoint 3
-        [5, 12, 8],     # Waypoint 4
-        [0, 5, 0]       # Return to start
-    ]
+    waypoints = DEFAULT_WAYPOINTS
     
     # Initialize drone controller
-    controller = DroneController()
+    controller = DroneController(integrator=args.integrator, substeps=args.substeps, wind_server=args.wind_server)
     
-    # Set up wind conditions if available
-    if controller.wind_controller:
+    # Set up wind conditions if available (a wind server applies its own)
+    if controller.wind_controller and not args.wind_server:
         print("\n🌪️ Setting up wind conditions...")
         controller.wind_controller.create_preset_wind_conditions("moderate")
         print("✅ Moderate wind conditions applied")
     
     # Call wind tuning function
-    if controller.wind_controller:
+    if controller.wind_controller and not args.wind_server:
         tune_wind(controller.wind_controller)
         print("✅ Wind tuning applied")
     
+    # Insert intermediate waypoints around headwinds, turbulence, tornadoes and microbursts
+    if args.plan and controller.wind_controller and not args.wind_server:
+        waypoints = WindAwarePlanner(controller.wind_controller).plan(waypoints)
+        print(f"🗺️ Planned {len(waypoints)} waypoints")
+    
     # Simulation parameters
     dt = 0.016  # 60 FPS
     waypoint_index = 0
     waypoint_reached = True
     frame_count = 0
+    recorder = TelemetryRecorder(args.telemetry) if args.telemetry else None
+    scheduler = None
+    status_every = 60  # frames (1 second at 60 FPS)
+    pace_every = 1
+    if args.physics_hz:
+        # Multi-rate: one frame is one physics step; other stages default to the 60 FPS frame rate
+        tick = 1.0 / args.physics_hz
+        frame_divisor = max(1, round(dt / tick))
+        scheduler = controller.build_scheduler(
+            tick,
+            control_divisor=args.control_divisor or frame_divisor,
+            wind_divisor=args.wind_divisor or frame_divisor,
+            visual_divisor=args.visual_divisor or frame_divisor,
+            recorder=recorder,
+            telemetry_divisor=args.telemetry_divisor or frame_divisor,
+        )
+        status_every = max(1, round(status_every * dt / tick))
+        pace_every = args.visual_divisor or frame_divisor
+        dt = tick
+    pacer = None if args.no_realtime else FixedRateLoop(dt * pace_every)
     
     print(f"🚁 Starting navigation with {len(waypoints)} waypoints")
     print(f"🎯 Initial position: {waypoints[0]}")
@@ -272,6 +590,8 @@ def main():
     
     # Main simulation loop
     try:
+        if pacer:
+            pacer.start()
         while waypoint_index < len(waypoints):
             # Set target if we've reached the current waypoint
             if waypoint_reached:
@@ -280,26 +600,39 @@ def main():
                 print(f"\n🛫 Flying to waypoint {waypoint_index + 1}: {target}")
                 waypoint_reached = False
             
-            # Calculate control
-            control_result = controller.calculate_control(dt)
-            
-            # Update drone position in stage
-            controller.update_drone_position(control_result['position'])
+            if scheduler:
+                # Run the stages due this physics step
+                scheduler.tick()
+                target_reached = controller.target_reached
+            else:
+                # Calculate control
+                control_result = controller.calculate_control(dt)
+                
+                # Update drone position in stage
+                controller.update_drone_position(control_result['position'])
+                
+                # Record telemetry
+                if recorder:
+                    recorder.record((frame_count + 1) * dt, control_result)
+                target_reached = control_result['target_reached']
             
             # Check if waypoint reached
-            if control_result['target_reached']:
+            if target_reached:
                 waypoint_reached = True
                 waypoint_index += 1
-                print(f"\n✅ Reached waypoint {waypoint_index}! Distance: {control_result['distance']:.2f}m")
+                distance = np.linalg.norm(controller.target_position - controller.current_position)
+                print(f"\n✅ Reached waypoint {waypoint_index}! Distance: {distance:.2f}m")
                 
                 if waypoint_index < len(waypoints):
                     print(f"🎯 Next waypoint: {waypoints[waypoint_index]}")
                 else:
                     print("🎉 All waypoints completed!")
             
-            # Print status every 60 frames (1 second at 60 FPS)
+            # Print status about once per simulated second
             frame_count += 1
-            if frame_count % 60 == 0:
+            if frame_count % status_every == 0:
+                if scheduler:
+                    control_result = controller.status()
                 print_status(waypoint_index, len(waypoints), 
                     control_result['position'], 
                     control_result['distance'],
@@ -310,8 +643,9 @@ def main():
                     control_result['air_density'])
 
             
-            # Simulate time step
-            time.sleep(dt)
+            # Wait for the next frame deadline
+            if pacer and frame_count % pace_every == 0:
+                pacer.wait()
             
     except KeyboardInterrupt:
         print("\n🛑 Navigation interrupted by user")
@@ -319,6 +653,19 @@ def main():
         print(f"❌ Error during navigation: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if scheduler:
+            print(scheduler.report())
+        if pacer:
+            print(pacer.stats.report())
+            print(f"   drift vs real time: {pacer.drift * 1e3:.1f} ms")
+        if recorder:
+            recorder.close()
+            print(f"📼 Recorded {recorder.steps_recorded} steps to {args.telemetry}")
+        if args.profile:
+            PROFILER.dump(args.profile)
+            print(PROFILER.report())
+            print(f"⏱️ Profile written to {args.profile}")
     
     print("\n🏁 Navigation complete!")
     print("=" * 60)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Gradient Noise
+Seedable, vectorized 3D gradient (improved Perlin) noise in NumPy
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from scripts import wind_kernels
+except ImportError:
+    import wind_kernels
+
+# Gradient directions of improved Perlin noise (12 cube edges, padded to 16)
+_GRADIENTS = np.array([
+    [1, 1, 0], [-1, 1, 0], [1, -1, 0], [-1, -1, 0],
+    [1, 0, 1], [-1, 0, 1], [1, 0, -1], [-1, 0, -1],
+    [0, 1, 1], [0, -1, 1], [0, 1, -1], [0, -1, -1],
+    [1, 1, 0], [-1, 1, 0], [0, -1, 1], [0, -1, -1],
+], dtype=float)
+
+
+# Points per NumPy pass, so the (8, chunk) corner temporaries stay in cache
+_CHUNK = 4096
+
+# Lattice corner offsets, ordered so the corner axis reshapes to (x, y, z) = (2, 2, 2)
+_CORNERS = np.array([[cx, cy, cz] for cx in (0, 1) for cy in (0, 1) for cz in (0, 1)])
+
+
+def _fade(t):
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+
+class GradientNoise3D:
+    """3D gradient noise evaluated on whole arrays of coordinates
+
+    Returns values in roughly [-1, 1], zero at integer lattice points. The
+    permutation table is drawn from `seed`, so equal seeds give equal fields
+    on every machine.
+    """
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        permutation = np.random.default_rng(seed).permutation(256)
+        self.perm = np.concatenate([permutation, permutation]).astype(np.intp)
+        # Gradient components looked up by hash value (0-511)
+        gradients = _GRADIENTS[np.arange(512) & 15]
+        self.grad_x, self.grad_y, self.grad_z = gradients.T.copy()
+        # Gradient components by the last hash level's input, folding in its permutation lookup
+        self._perm_grad_x, self._perm_grad_y, self._perm_grad_z = gradients[self.perm].T.copy()
+        # Plain-list copies for single-point evaluation (at)
+        self._perm_list = self.perm.tolist()
+        self._grad_lists = (self.grad_x.tolist(), self.grad_y.tolist(), self.grad_z.tolist())
+
+    def at(self, x, y, z):
+        """Noise at a single point in plain floats, without the array overhead of __call__"""
+        p = self._perm_list
+        grad_x, grad_y, grad_z = self._grad_lists
+        lx, ly, lz = math.floor(x), math.floor(y), math.floor(z)
+        fx, fy, fz = x - lx, y - ly, z - lz
+        cx, cy, cz = lx & 255, ly & 255, lz & 255
+        dots = []
+        for ox in (0, 1):
+            for oy in (0, 1):
+                for oz in (0, 1):
+                    h = p[p[p[cx + ox] + cy + oy] + cz + oz]
+                    dots.append(grad_x[h] * (fx - ox) + grad_y[h] * (fy - oy) + grad_z[h] * (fz - oz))
+        u, v, w = _fade(fx), _fade(fy), _fade(fz)
+        x00 = dots[0] + u * (dots[4] - dots[0])
+        x01 = dots[1] + u * (dots[5] - dots[1])
+        x10 = dots[2] + u * (dots[6] - dots[2])
+        x11 = dots[3] + u * (dots[7] - dots[3])
+        y0 = x00 + v * (x10 - x00)
+        y1 = x01 + v * (x11 - x01)
+        return y0 + w * (y1 - y0)
+
+    def __call__(self, x, y, z):
+        """Evaluate noise at broadcastable coordinate arrays x, y, z"""
+        coords = np.stack(np.broadcast_arrays(
+            np.asarray(x, dtype=float), np.asarray(y, dtype=float), np.asarray(z, dtype=float)
+        ))
+        shape = coords.shape[1:]
+        if wind_kernels.BACKEND == "numba":
+            values = wind_kernels.gradient_noise_loop(
+                coords.reshape(3, -1), self.perm, self.grad_x, self.grad_y, self.grad_z
+            )
+            return values.reshape(shape)
+        coords = coords.reshape(3, -1)
+        values = np.empty(coords.shape[1])
+        for start in range(0, len(values), _CHUNK):
+            values[start:start + _CHUNK] = self._evaluate(coords[:, start:start + _CHUNK])
+        return values.reshape(shape)
+
+    def _evaluate(self, coords):
+        """NumPy noise at a (3, N) block of coordinates"""
+        lattice = np.floor(coords)
+        fx, fy, fz = coords - lattice
+        cx, cy, cz = lattice.astype(np.intp) & 255
+
+        # Hash the lattice corners level by level: 2 x-hashes, 4 xy-hashes, then
+        # the 8 corners in (x, y, z) = (2, 2, 2) order: (8, N)
+        p = self.perm
+        x0, x1 = p[cx] + cy, p[cx + 1] + cy
+        xy = np.stack([p[x0] + cz, p[x0 + 1] + cz, p[x1] + cz, p[x1 + 1] + cz])
+        corners = np.stack([xy, xy + 1], axis=1).reshape(2, 2, 2, -1)
+        dots = (self._perm_grad_x[corners] * np.stack([fx, fx - 1])[:, None, None]
+                + self._perm_grad_y[corners] * np.stack([fy, fy - 1])[None, :, None]
+                + self._perm_grad_z[corners] * np.stack([fz, fz - 1])[None, None, :])
+
+        # Trilinear blend of the corner contributions with the fade curve
+        u, v, w = _fade(fx), _fade(fy), _fade(fz)
+        dots = dots[0] + u * (dots[1] - dots[0])
+        dots = dots[0] + v * (dots[1] - dots[0])
+        return dots[0] + w * (dots[1] - dots[0])
+
+
+@lru_cache(maxsize=None)
+def gradient_noise(seed=0):
+    """Shared GradientNoise3D instance for a seed"""
+    return GradientNoise3D(seed)
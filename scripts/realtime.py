@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Real-Time Loop
+Fixed-rate scheduling against absolute deadlines with overrun and jitter
+accounting, standalone, asyncio-based or driven by Isaac Sim physics steps,
+and multi-rate scheduling of simulation stages
+"""
+
+import asyncio
+import math
+import time
+
+import numpy as np
+
+
+class LoopStats:
+    """Overrun counts plus lateness and work-time samples of a fixed-rate loop
+
+    Lateness is how far after its deadline a frame started (the loop's
+    jitter); work is the time the frame's step took. The last `history`
+    samples are kept for percentiles.
+    """
+
+    def __init__(self, period, history=4096):
+        self.period = period
+        self.frames = 0
+        self.overruns = 0       # frames whose work ran past the next deadline
+        self.dropped = 0        # deadlines skipped after falling too far behind
+        self.max_lateness = 0.0
+        self.lateness = np.zeros(history)
+        self.work = np.zeros(history)
+        self.history = history
+
+    def record(self, lateness, work, overrun):
+        index = self.frames % self.history
+        self.lateness[index] = lateness
+        self.work[index] = work
+        self.frames += 1
+        self.overruns += bool(overrun)
+        self.max_lateness = max(self.max_lateness, lateness)
+
+    def percentiles(self, q=(50, 90, 99)):
+        """Lateness and work-time percentiles (seconds) over the kept history"""
+        count = min(self.frames, self.history)
+        if not count:
+            return {'lateness': {p: 0.0 for p in q}, 'work': {p: 0.0 for p in q}}
+        return {
+            'lateness': dict(zip(q, np.percentile(self.lateness[:count], q).tolist())),
+            'work': dict(zip(q, np.percentile(self.work[:count], q).tolist())),
+        }
+
+    def as_dict(self):
+        return {
+            'period': self.period,
+            'frames': self.frames,
+            'overruns': self.overruns,
+            'dropped': self.dropped,
+            'max_lateness': self.max_lateness,
+            **self.percentiles(),
+        }
+
+    def report(self):
+        """One-paragraph summary for logs"""
+        p = self.percentiles()
+        share = self.overruns / self.frames if self.frames else 0.0
+        return (
+            f"⏱️ {self.frames} frames at {1.0 / self.period:.1f} Hz, {self.overruns} overruns ({share:.1%}), "
+            f"{self.dropped} dropped\n"
+            f"   jitter p50/p90/p99/max: {p['lateness'][50] * 1e3:.3f} / {p['lateness'][90] * 1e3:.3f} / "
+            f"{p['lateness'][99] * 1e3:.3f} / {self.max_lateness * 1e3:.3f} ms\n"
+            f"   work p50/p99: {p['work'][50] * 1e3:.3f} / {p['work'][99] * 1e3:.3f} ms"
+        )
+
+
+class FixedRateLoop:
+    """Paces a loop to absolute deadlines start + k * period
+
+    Call start() once, then wait() after each frame's work. Deadlines are
+    computed from the start time rather than from the previous wake-up, so
+    sleep overshoot never accumulates into drift. A late frame is followed
+    immediately by the next one so simulated time catches up with the wall
+    clock; once the loop is more than `max_lag_frames` behind, the missed
+    deadlines are dropped and counted instead. The last `spin_time` seconds
+    before a deadline are busy-waited to beat the OS sleep granularity.
+    """
+
+    def __init__(self, period=0.016, max_lag_frames=5, spin_time=0.001, clock=time.perf_counter, sleep=time.sleep):
+        self.period = period
+        self.max_lag_frames = max_lag_frames
+        self.spin_time = spin_time
+        self.clock = clock
+        self.sleep = sleep
+        self.stats = LoopStats(period)
+        self.frame = 0
+        self.start_time = None
+        self.deadline = None
+        self.frame_start = None
+
+    @property
+    def sim_time(self):
+        """Simulated time of the current frame"""
+        return self.frame * self.period
+
+    @property
+    def drift(self):
+        """Wall time minus simulated time (positive: behind real time)"""
+        return self.clock() - self.start_time - self.sim_time
+
+    def start(self):
+        """Anchor the deadline grid at the current time"""
+        self.start_time = self.clock()
+        self.frame_start = self.start_time
+        self.deadline = self.start_time + self.period
+        self.frame = 0
+
+    def _finish_frame(self, now):
+        """Account the frame that just ended; returns seconds until the next deadline"""
+        work = now - self.frame_start
+        overrun = now > self.deadline
+        behind = now - self.deadline
+        if behind > self.max_lag_frames * self.period:
+            skipped = math.floor(behind / self.period)
+            self.deadline += skipped * self.period
+            self.stats.dropped += skipped
+        self._work = work
+        self._overrun = overrun
+        return self.deadline - now
+
+    def _start_frame(self, wake):
+        self.stats.record(max(0.0, wake - self.deadline), self._work, self._overrun)
+        self.frame_start = wake
+        self.deadline += self.period
+        self.frame += 1
+
+    def wait(self):
+        """Block until the next deadline"""
+        remaining = self._finish_frame(self.clock())
+        if remaining > self.spin_time:
+            self.sleep(remaining - self.spin_time)
+        while self.clock() < self.deadline:
+            pass
+        self._start_frame(self.clock())
+
+    def run(self, step, frames=None):
+        """Call step(frame, sim_time) every period until it returns False or `frames` ran"""
+        self.start()
+        while frames is None or self.frame < frames:
+            if step(self.frame, self.sim_time) is False:
+                break
+            self.wait()
+        return self.stats
+
+
+class AsyncFixedRateLoop(FixedRateLoop):
+    """FixedRateLoop for asyncio: waiting yields to other tasks (telemetry, I/O)
+
+    The control step itself stays synchronous, so no other task can
+    interleave with it; they run in the gap before the next deadline and any
+    that hog the loop show up as overruns and lateness.
+    """
+
+    async def wait_async(self):
+        """Yield to other tasks until the next deadline"""
+        remaining = self._finish_frame(self.clock())
+        if remaining > self.spin_time:
+            await asyncio.sleep(remaining - self.spin_time)
+        else:
+            await asyncio.sleep(0)
+        while self.clock() < self.deadline:
+            pass
+        self._start_frame(self.clock())
+
+    async def run_async(self, step, frames=None):
+        """Async counterpart of run()"""
+        self.start()
+        while frames is None or self.frame < frames:
+            if step(self.frame, self.sim_time) is False:
+                break
+            await self.wait_async()
+        return self.stats
+
+
+class PhysicsStepLoop:
+    """Runs step(frame, sim_time) from Isaac Sim physics step callbacks
+
+    Physics sets the rate, so there is nothing to sleep for; the same stats
+    are kept with lateness measured as how much later than one physics step
+    after the previous callback this one arrived (meaningful when the app
+    runs in real time), and an overrun whenever the step's work took longer
+    than the physics step.
+    """
+
+    def __init__(self, world, step, name="zephyrsim_control", clock=time.perf_counter):
+        self.world = world
+        self.step = step
+        self.name = name
+        self.clock = clock
+        self.stats = None
+        self.frame = 0
+        self.sim_time = 0.0
+        self._last_call = None
+
+    def attach(self):
+        """Register with the world's physics callbacks"""
+        self.world.add_physics_callback(self.name, callback_fn=self._on_physics_step)
+
+    def detach(self):
+        self.world.remove_physics_callback(self.name)
+
+    def _on_physics_step(self, step_size):
+        now = self.clock()
+        if self.stats is None:
+            self.stats = LoopStats(step_size)
+        lateness = 0.0 if self._last_call is None else max(0.0, now - self._last_call - step_size)
+        self._last_call = now
+        self.step(self.frame, self.sim_time)
+        work = self.clock() - now
+        self.stats.record(lateness, work, work > step_size)
+        self.frame += 1
+        self.sim_time += step_size
+
+
+class Stage:
+    """One stage of a MultiRateScheduler: fn(period) every `divisor` base ticks"""
+
+    def __init__(self, name, fn, divisor, base_period):
+        self.name = name
+        self.fn = fn
+        self.divisor = divisor
+        self.period = divisor * base_period
+        self.calls = 0
+        self.work = 0.0         # total seconds spent in fn
+        self.max_work = 0.0
+
+
+class MultiRateScheduler:
+    """Runs simulation stages at integer divisors of a base (physics) rate
+
+    Stages run in the order they were added. On base tick k every stage with
+    k % divisor == 0 is called with its own period, divisor * `period`, so a
+    stage sees the time that passed since its previous call. Stages keep their
+    own call counts and work times, which shows where a frame's time goes.
+    """
+
+    def __init__(self, period, clock=time.perf_counter):
+        self.period = period
+        self.clock = clock
+        self.stages = []
+        self.ticks = 0
+
+    @property
+    def sim_time(self):
+        """Simulated time after the ticks run so far"""
+        return self.ticks * self.period
+
+    def add_stage(self, name, fn, divisor=1):
+        """Call fn(stage_period) every `divisor` base ticks; returns the Stage"""
+        if int(divisor) != divisor or divisor < 1:
+            raise ValueError(f"Stage divisor must be a positive integer, got {divisor}")
+        if any(stage.name == name for stage in self.stages):
+            raise ValueError(f"Stage {name!r} already scheduled")
+        stage = Stage(name, fn, int(divisor), self.period)
+        self.stages.append(stage)
+        return stage
+
+    def tick(self):
+        """Run one base tick: every stage that is due, in order"""
+        for stage in self.stages:
+            if self.ticks % stage.divisor:
+                continue
+            start = self.clock()
+            stage.fn(stage.period)
+            work = self.clock() - start
+            stage.calls += 1
+            stage.work += work
+            stage.max_work = max(stage.max_work, work)
+        self.ticks += 1
+
+    def report(self):
+        """Per-stage rates and work times for logs"""
+        lines = [f"⏱️ {self.ticks} ticks at {1.0 / self.period:.1f} Hz"]
+        for stage in self.stages:
+            mean = stage.work / stage.calls if stage.calls else 0.0
+            lines.append(f"   {stage.name}: {1.0 / stage.period:.1f} Hz, {stage.calls} calls, "
+                         f"mean/max {mean * 1e3:.3f} / {stage.max_work * 1e3:.3f} ms, total {stage.work:.3f} s")
+        return "\n".join(lines)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Telemetry Recorder
+Records every control step into preallocated NumPy ring buffers and flushes
+full chunks to columnar files from a background thread
+"""
+
+import glob
+import os
+import queue
+import threading
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Field name -> components per drone, matching DroneController.calculate_control
+TELEMETRY_FIELDS = {
+    'position': 3,
+    'velocity': 3,
+    'wind_force': 3,
+    'control_acceleration': 3,
+    'altitude': 1,
+    'air_density': 1,
+}
+
+# Keys used by DroneSwarmController.calculate_control for the same fields
+SWARM_KEYS = {
+    'position': 'positions',
+    'velocity': 'velocities',
+    'wind_force': 'wind_forces',
+    'control_acceleration': 'control_accelerations',
+    'altitude': 'altitudes',
+    'air_density': 'air_densities',
+}
+
+_AXES = ("x", "y", "z")
+
+
+class TelemetryRecorder:
+    """Ring-buffered telemetry for one drone or a swarm
+
+    Steps are copied into one of `num_chunks` preallocated chunks of
+    `chunk_size` steps. Full chunks are handed to a writer thread and returned
+    to the ring once written, so recording never allocates or does I/O. If the
+    writer falls behind by the whole ring, record() waits for it and counts a
+    stall.
+
+    Output goes to `path`: a Parquet file (one row group per chunk) when path
+    ends in .parquet and pyarrow is installed, otherwise a directory of
+    chunk_NNNNN.npz files readable with load_telemetry(). Either replaces an
+    earlier recording at the same path: chunk files already in the directory
+    are deleted, so load_telemetry() never mixes in chunks of another run.
+    """
+
+    def __init__(self, path, num_drones=1, chunk_size=600, num_chunks=4, fields=TELEMETRY_FIELDS):
+        self.path = path
+        self.num_drones = num_drones
+        self.chunk_size = chunk_size
+        self.fields = dict(fields)
+        self.use_parquet = path.endswith(".parquet")
+        if self.use_parquet and not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to write .parquet telemetry")
+
+        self.chunks = [
+            {
+                'time': np.zeros(chunk_size),
+                **{name: np.zeros((chunk_size, num_drones, width)) for name, width in self.fields.items()},
+            }
+            for _ in range(num_chunks)
+        ]
+        self.free_chunks = queue.Queue()
+        for index in range(1, num_chunks):
+            self.free_chunks.put(index)
+        self.pending = queue.Queue()
+        self.current = 0
+        self.row = 0
+        self.steps_recorded = 0
+        self.chunks_written = 0
+        self.stalls = 0
+        self.error = None
+
+        self._writer = None
+        if not self.use_parquet:
+            os.makedirs(path, exist_ok=True)
+            for stale in glob.glob(os.path.join(path, "chunk_*.npz")):
+                os.remove(stale)
+        self._thread = threading.Thread(target=self._write_loop, name="TelemetryWriter", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, sim_time, result):
+        """Copy one step into the ring
+
+        result is the dict returned by DroneController.calculate_control or
+        DroneSwarmController.calculate_control (see SWARM_KEYS).
+        """
+        chunk = self.chunks[self.current]
+        row = self.row
+        chunk['time'][row] = sim_time
+        for name in self.fields:
+            value = result[name] if name in result else result[SWARM_KEYS.get(name, name)]
+            # Writes in place; scalars and (N,) arrays broadcast over the last axis
+            buffer = chunk[name][row]
+            if np.ndim(value) == 1 and buffer.shape[1] == 1:
+                buffer[:, 0] = value
+            else:
+                buffer[...] = value
+        self.row += 1
+        self.steps_recorded += 1
+        if self.row == self.chunk_size:
+            self._submit()
+
+    def flush(self):
+        """Hand the partially filled chunk to the writer"""
+        if self.row:
+            self._submit()
+
+    def close(self):
+        """Flush remaining steps and wait for the writer to finish"""
+        if self._thread is None:
+            return
+        self.flush()
+        self.pending.put(None)
+        self._thread.join()
+        self._thread = None
+        if self.error is not None:
+            raise self.error
+
+    def _submit(self):
+        self.pending.put((self.current, self.row))
+        try:
+            self.current = self.free_chunks.get_nowait()
+        except queue.Empty:
+            self.stalls += 1
+            self.current = self.free_chunks.get()
+        self.row = 0
+
+    def _write_loop(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            index, rows = item
+            try:
+                if self.error is None:
+                    self._write_chunk(self.chunks[index], rows)
+                    self.chunks_written += 1
+            except Exception as e:  # keep draining so record() never deadlocks
+                self.error = e
+                print(f"⚠️ Telemetry writer error: {e}")
+            self.free_chunks.put(index)
+        if self._writer is not None:
+            self._writer.close()
+
+    def _columns(self, chunk, rows):
+        """Flatten a chunk to long format: one row per (step, drone)"""
+        columns = {
+            'time': np.repeat(chunk['time'][:rows], self.num_drones),
+            'drone': np.tile(np.arange(self.num_drones), rows),
+        }
+        for name, width in self.fields.items():
+            values = chunk[name][:rows].reshape(rows * self.num_drones, width)
+            if width == 1:
+                columns[name] = values[:, 0].copy()
+            else:
+                for axis in range(width):
+                    suffix = _AXES[axis] if width == 3 else str(axis)
+                    columns[f"{name}_{suffix}"] = values[:, axis].copy()
+        return columns
+
+    def _write_chunk(self, chunk, rows):
+        columns = self._columns(chunk, rows)
+        if self.use_parquet:
+            table = pa.table(columns)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            np.savez(os.path.join(self.path, f"chunk_{self.chunks_written:05d}.npz"), **columns)
+
+
+def load_telemetry(path):
+    """Load recorded telemetry as a dict of long-format column arrays"""
+    if path.endswith(".parquet"):
+        table = pq.read_table(path)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    parts = [np.load(file) for file in sorted(glob.glob(os.path.join(path, "chunk_*.npz")))]
+    if not parts:
+        return {}
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0].files}
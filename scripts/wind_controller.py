@@ -5,6 +5,7 @@ Controls wind zones with flight simulator-like capabilities
 """
 
 import numpy as np
+import copy
 import time
 import math
 import random
@@ -15,7 +16,7 @@ try:
     import omni.isaac.core.utils.stage as stage_utils
     import omni.isaac.core.utils.prims as prim_utils
     import omni.usd
-    from pxr import Gf, Usd, UsdGeom
+    from pxr import Gf, Sdf, Usd, UsdGeom
     ISAAC_SIM_AVAILABLE = True
     print("✅ Isaac Sim modules loaded successfully")
 except ImportError as e:
@@ -25,19 +26,41 @@ except ImportError as e:
 
 import numpy as np
 import math
+
 try:
-    from noise import pnoise3
+    from scripts.dryden_field import frozen_dryden_field
+    from scripts.gradient_noise import gradient_noise
+    from scripts.wind_events import WindEventScheduler
+    from scripts.wind_kernels import microburst_wind, microburst_wind_at, tornado_wind, tornado_wind_at
+    from scripts.wind_profiling import PROFILER
+    from scripts.wind_table import FIDELITY_TIERS, FULL, HAZARDS, WindZoneTable
+    from scripts.zone_index import ZoneHashGrid
 except ImportError:
-    pnoise3 = None
+    from dryden_field import frozen_dryden_field
+    from gradient_noise import gradient_noise
+    from wind_events import WindEventScheduler
+    from wind_kernels import microburst_wind, microburst_wind_at, tornado_wind, tornado_wind_at
+    from wind_profiling import PROFILER
+    from wind_table import FIDELITY_TIERS, FULL, HAZARDS, WindZoneTable
+    from zone_index import ZoneHashGrid
+
+# Bump when the layout of WindController/DroneController snapshots changes
+SNAPSHOT_VERSION = 2
+
+def _xyz(vector):
+    """A 3-vector attribute as a list of Python numbers"""
+    return vector.tolist() if type(vector) is np.ndarray else [float(v) for v in vector]
 
 # --- Dryden turbulence helper ---
-def dryden_turbulence(dt, state, sigma_u=1.0, L_u=200.0, V=10.0):
+def dryden_turbulence(dt, state, sigma_u=1.0, L_u=200.0, V=10.0, noise=None):
     # dt: timestep, state: dict with 'u', 'v', 'w', sigma_u: turbulence intensity, L_u: scale, V: mean wind
+    # noise: 3 standard normal draws (drawn from the global NumPy RNG if omitted)
     # Returns new state and turbulence vector
     # See: https://en.wikipedia.org/wiki/Dryden_wind_turbulence_model
     tau = L_u / V
     phi = math.exp(-dt / tau)
-    noise = np.random.normal(0, 1, 3)
+    if noise is None:
+        noise = np.random.normal(0, 1, 3)
     u = phi * state['u'] + sigma_u * math.sqrt(1 - phi**2) * noise[0]
     v = phi * state['v'] + sigma_u * math.sqrt(1 - phi**2) * noise[1]
     w = phi * state['w'] + sigma_u * math.sqrt(1 - phi**2) * noise[2]
@@ -46,7 +69,28 @@ def dryden_turbulence(dt, state, sigma_u=1.0, L_u=200.0, V=10.0):
 class WindZone:
     """Represents a wind zone with configurable parameters"""
     
-    def __init__(self, zone_name, position, size=10.0):
+    # Runtime state advanced by step(); every other public attribute is a parameter
+    _STATE_FIELDS = frozenset({
+        "time", "last_gust_time", "gust_active", "gust_start_time", "turbulence_time",
+        "dryden_state", "gustfront_time", "gustfront_active", "microburst_time", "microburst_active",
+        "dryden_vec", "gustfront_vec", "microburst_progress", "gust_vec", "turbulence_vec", "temporal_wind",
+        "rng", "normal_block", "normal_block_index", "events", "component_samples",
+    })
+    
+    # Update rates (Hz) of slow-varying step components, opt in with set_update_rate;
+    # None updates every step. In between samples the component is linearly interpolated.
+    COMPONENT_RATES = {
+        "dryden": None,
+        "turbulence": None,
+    }
+    # Rates that stay close to every-step sampling at the default parameters
+    SUGGESTED_RATES = {
+        "dryden": 5.0,        # time constant L/V is ~20 s at the defaults
+        "turbulence": 10.0,   # fastest sine has a ~0.9 s period
+    }
+    
+    def __init__(self, zone_name, position, size=10.0, seed=None):
+        self._observers = []
         self.zone_name = zone_name
         self.position = np.array(position)
         self.size = size
@@ -69,6 +113,22 @@ class WindZone:
         self.turbulence_scale = 1.0
         self.turbulence_time = 0.0
         
+        # Gradient noise parameters
+        self.noise_scale = 0.05       # spatial frequency (1/m)
+        self.noise_amplitude = 2.0    # m/s
+        self.noise_time_speed = 0.1   # noise time per simulated second
+        self.noise_seed = 0
+        
+        # Random streams: `seed` may be an int or a SeedSequence spawned by the controller
+        self.rng = np.random.default_rng(seed)
+        self.normal_block_size = 1024  # normals drawn per refill, as (block, 3)
+        self.normal_block = np.zeros((0, 3))
+        self.normal_block_index = 0
+        
+        # Stage visuals: cached prim handles and the last values written to them
+        self._prims = {}
+        self._visual_state = {}
+        
         # Tornado parameters
         self.tornado_center = np.array([0, 0, 0])
         self.tornado_radius = 5.0         # meters (radius of max wind)
@@ -81,6 +141,10 @@ class WindZone:
         self.dryden_sigma = 2.0  # turbulence intensity (m/s)
         self.dryden_L = 200.0    # turbulence scale (m)
         self.dryden_V = 10.0     # mean wind speed (m/s)
+        # Frozen Dryden: sample a precomputed spatially correlated field advected
+        # at dryden_V along the wind direction instead of running the per-zone filter
+        self.dryden_frozen = False
+        self.dryden_field_seed = 0
         # Gust front/microburst
         self.gustfront_enabled = False
         self.gustfront_center = np.array([0,0,0])
@@ -96,6 +160,69 @@ class WindZone:
         self.microburst_duration = 2.0
         self.microburst_time = 0.0
         self.microburst_active = False
+        # Any number of additional transient events (see add_event)
+        self.events = WindEventScheduler()
+        # Update rates per component (override with set_update_rate) and their
+        # samples: component -> [previous time, previous value, next time, next value, slope]
+        self.update_rates = dict(self.COMPONENT_RATES)
+        self.component_samples = {}
+        
+        # Per-frame temporal terms, cached by step()
+        self.dryden_vec = np.zeros(3)
+        self.gustfront_vec = np.zeros(3)
+        self.microburst_progress = None
+        self.gust_vec = np.zeros(3)
+        self.turbulence_vec = np.zeros(3)
+        self.temporal_wind = np.zeros(3)
+        
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # Parameter assignments are reported to observers (e.g. the zone index)
+        if name in self._STATE_FIELDS or name[0] == "_":
+            return
+        for callback in self._observers:
+            callback(self, name)
+                
+    def get_parameters(self):
+        """Return the zone's configuration (everything except runtime state)"""
+        return {name: value for name, value in vars(self).items()
+                if not name.startswith("_") and name not in self._STATE_FIELDS}
+        
+    def get_state(self):
+        """Return the zone's runtime state (clocks, Dryden state, event timers)"""
+        return {name: value for name, value in vars(self).items() if name in self._STATE_FIELDS}
+        
+    def snapshot(self):
+        """Deep copy of the zone's parameters and runtime state (RNG and events included)"""
+        return copy.deepcopy({'parameters': self.get_parameters(), 'state': self.get_state()})
+        
+    def restore(self, snapshot):
+        """Return the zone to a snapshot() taken earlier, here or in another process"""
+        snapshot = copy.deepcopy(snapshot)
+        # Parameters notify observers, so the controller re-indexes and recompiles the zone
+        for name, value in snapshot['parameters'].items():
+            setattr(self, name, value)
+        for name, value in snapshot['state'].items():
+            setattr(self, name, value)
+        self._visual_state.clear()
+        
+    def add_observer(self, callback):
+        """Register callback(zone, field_name) for parameter assignments"""
+        self._observers.append(callback)
+        
+    def remove_observer(self, callback):
+        """Unregister a callback added with add_observer"""
+        self._observers.remove(callback)
+        
+    def set_position(self, position):
+        """Move the zone center"""
+        self.position = np.array(position)
+        print(f"📍 {self.zone_name}: Position set to {self.position}")
+        
+    def set_size(self, size):
+        """Set zone radius in meters"""
+        self.size = max(0.0, size)
+        print(f"📏 {self.zone_name}: Size set to {self.size} m")
         
     def set_wind_speed(self, speed):
         """Set wind speed in m/s"""
@@ -124,82 +251,261 @@ class WindZone:
         self.wind_gust_duration = max(0.1, duration)
         print(f"💨 {self.zone_name}: Gusts set to {frequency}Hz, {amplitude}m/s, {duration}s")
         
-    def get_wind_vector_at_position(self, position, dt):
-        """Get wind vector at a specific position"""
-        # Check if position is within wind zone
-        distance = np.linalg.norm(position - self.position)
-        if distance > self.size:
-            return np.zeros(3)
-            
-        # Update time
+    def set_update_rate(self, component, rate):
+        """Set how often (Hz) a step component is sampled; None samples every step"""
+        if component not in self.COMPONENT_RATES:
+            raise ValueError(f"Unknown component {component!r}, expected one of {tuple(self.COMPONENT_RATES)}")
+        if rate is not None and rate <= 0:
+            raise ValueError(f"Update rate must be positive or None, got {rate}")
+        self.update_rates = {**self.update_rates, component: rate}
+        self.component_samples.pop(component, None)
+        print(f"⏲️ {self.zone_name}: {component} updated " + (f"at {rate}Hz" if rate else "every step"))
+        
+    def add_event(self, event):
+        """Add a GustFrontEvent or MicroburstEvent; returns its id
+
+        Gust fronts without a direction push along the current wind direction.
+        """
+        if getattr(event, "direction", 0) is None:
+            event.direction = self.wind_direction.astype(float)
+        return self.events.add(event)
+        
+    def remove_event(self, event_id):
+        """Cancel an event added with add_event"""
+        self.events.remove(event_id)
+        
+    def step(self, dt, positions=None):
+        """Advance the zone's clocks, stochastic state and events by one frame
+
+        Position-independent terms (Dryden, gust front, gusts and turbulence) are
+        cached for the frame so that queries do not mutate the zone. `positions`
+        are the agent positions that may trigger a gust front or microburst.
+        """
+        profiling = PROFILER.enabled
+        if profiling:
+            t0 = time.perf_counter()
         self.time += dt
         self.turbulence_time += dt
-        
-        # 1. Vertical wind profile (logarithmic)
-        z0 = 0.1  # surface roughness (m)
-        z_ref = 10.0
-        v_ref = self.wind_speed
-        z = max(0.1, position[1])
-        log_profile = v_ref * np.log(z/z0) / np.log(z_ref/z0)
-        base_wind = self.wind_direction * log_profile
-        # 2. Dryden turbulence
-        self.dryden_state, dryden_vec = dryden_turbulence(dt, self.dryden_state, self.dryden_sigma, self.dryden_L, self.dryden_V)
-        # 3. Gust front
-        gustfront_vec = np.zeros(3)
+        rates = self.update_rates
+
+        triggers = np.zeros((0, 3))
+        if positions is not None:
+            triggers = np.asarray(positions, dtype=float).reshape(-1, 3)
+            distance = np.sqrt(np.sum((triggers - self.position) ** 2, axis=1))
+            triggers = triggers[distance <= self.size]
+
+        # Dryden turbulence (position dependent, and sampled per query, when frozen)
+        if self.dryden_frozen:
+            self.dryden_vec = np.zeros(3)
+        elif rates["dryden"]:
+            self.dryden_vec = self._sampled("dryden", rates["dryden"], self._sample_dryden)
+        else:
+            self.dryden_state, self.dryden_vec = dryden_turbulence(dt, self.dryden_state, self.dryden_sigma, self.dryden_L, self.dryden_V, self._next_normals())
+        if profiling:
+            t0 = PROFILER.lap("dryden", self.zone_name, t0)
+        # Gust front (any agent inside the front triggers it)
+        self.gustfront_vec = np.zeros(3)
         if self.gustfront_enabled:
-            dist = np.linalg.norm(position - self.gustfront_center)
-            if dist < self.gustfront_radius and not self.gustfront_active:
-                self.gustfront_active = True
-                self.gustfront_time = 0.0
+            if not self.gustfront_active and len(triggers):
+                dist = np.sqrt(np.sum((triggers - self.gustfront_center) ** 2, axis=1))
+                if (dist < self.gustfront_radius).any():
+                    self.gustfront_active = True
+                    self.gustfront_time = 0.0
             if self.gustfront_active:
                 self.gustfront_time += dt
                 if self.gustfront_time < self.gustfront_duration:
-                    gustfront_vec = self.wind_direction * self.gustfront_strength * (1 - self.gustfront_time/self.gustfront_duration)
+                    self.gustfront_vec = self.wind_direction * self.gustfront_strength * (1 - self.gustfront_time/self.gustfront_duration)
                 else:
                     self.gustfront_active = False
-        # 4. Microburst
-        microburst_vec = np.zeros(3)
+        if profiling:
+            t0 = PROFILER.lap("gustfront", self.zone_name, t0)
+        # Microburst
+        self.microburst_progress = None
         if self.microburst_enabled:
-            dist = np.linalg.norm(position - self.microburst_center)
-            if dist < self.microburst_radius and not self.microburst_active:
-                self.microburst_active = True
-                self.microburst_time = 0.0
+            if not self.microburst_active and len(triggers):
+                dist = np.sqrt(np.sum((triggers - self.microburst_center) ** 2, axis=1))
+                if (dist < self.microburst_radius).any():
+                    self.microburst_active = True
+                    self.microburst_time = 0.0
             if self.microburst_active:
                 self.microburst_time += dt
                 if self.microburst_time < self.microburst_duration:
-                    # Strong downdraft, then radial outflow
-                    down = -self.microburst_strength * (1 - self.microburst_time/self.microburst_duration)
-                    radial = (position - self.microburst_center)
-                    radial[1] = 0
-                    if np.linalg.norm(radial) > 1e-3:
-                        radial = radial / np.linalg.norm(radial)
-                    else:
-                        radial = np.zeros(3)
-                    outflow = self.microburst_strength * 0.5 * (self.microburst_time/self.microburst_duration) * radial
-                    microburst_vec = np.array([outflow[0], down, outflow[2]])
+                    self.microburst_progress = self.microburst_time / self.microburst_duration
                 else:
                     self.microburst_active = False
-        # 5. Perlin noise fallback
-        perlin_vec = np.zeros(3)
-        if pnoise3 is not None:
-            nx, ny, nz = position * 0.05
-            t = self.time * 0.1
-            perlin_vec = np.array([
-                2.0 * pnoise3(nx, ny, t),
-                2.0 * pnoise3(ny, nz, t + 100),
-                2.0 * pnoise3(nz, nx, t + 200)
-            ])
-        # 6. Tornado, turbulence, gusts, etc. (existing)
-        tornado_wind = self._calculate_tornado(position)
-        gust_wind = self._calculate_gusts(dt)
-        turbulence_wind = self._calculate_turbulence(position, dt)
-        # Combine all
-        total_wind = base_wind + dryden_vec + gustfront_vec + microburst_vec + perlin_vec + tornado_wind + gust_wind + turbulence_wind
+        if profiling:
+            t0 = PROFILER.lap("microburst", self.zone_name, t0)
+        # Scheduled and triggered events
+        if len(self.events):
+            self.events.advance(self.time, dt, triggers)
+            if profiling:
+                t0 = PROFILER.lap("events", self.zone_name, t0)
+        # Gusts and sine turbulence
+        self.gust_vec = self._calculate_gusts(dt)
+        if profiling:
+            t0 = PROFILER.lap("gusts", self.zone_name, t0)
+        if rates["turbulence"]:
+            self.turbulence_vec = self._sampled("turbulence", rates["turbulence"], self._sample_turbulence)
+        else:
+            self.turbulence_vec = self._calculate_turbulence()
+        if profiling:
+            t0 = PROFILER.lap("turbulence", self.zone_name, t0)
+        self.temporal_wind = self.dryden_vec + self.gustfront_vec + self.gust_vec + self.turbulence_vec
+
+    def _sampled(self, component, rate, sample):
+        """Component value at self.time from samples every 1/rate s, linearly interpolated
+
+        sample(t, h) returns the value at zone time t, h seconds after the
+        latest sample (h == 0 for the first sample). Between samples this is
+        a single multiply-add.
+        """
+        samples = self.component_samples.get(component)
+        if samples is None or self.time >= samples[2]:
+            h = 1.0 / rate
+            if samples is None:
+                samples = [self.time, sample(self.time, 0.0), self.time + h, None, None]
+                samples[3] = sample(samples[2], h)
+                self.component_samples[component] = samples
+            while self.time >= samples[2]:
+                samples[0], samples[1] = samples[2], samples[3]
+                samples[2] += h
+                samples[3] = sample(samples[2], h)
+            samples[4] = (samples[3] - samples[1]) / (samples[2] - samples[0])
+        return samples[1] + samples[4] * (self.time - samples[0])
+        
+    def _sample_dryden(self, t, h):
+        """Advance the Dryden filter by h (its discretization is exact for any step)"""
+        self.dryden_state, vec = dryden_turbulence(h, self.dryden_state, self.dryden_sigma, self.dryden_L, self.dryden_V, self._next_normals())
+        return vec
+        
+    def _sample_turbulence(self, t, h):
+        """Sine turbulence at zone time t"""
+        return self._calculate_turbulence(self.turbulence_time + (t - self.time))
+        
+    def _next_normals(self):
+        """Next 3 standard normals from the zone's pre-drawn block"""
+        if self.normal_block_index >= len(self.normal_block):
+            # Refilling in blocks consumes the stream exactly like per-call draws,
+            # so results do not depend on the block size
+            self.normal_block = self.rng.standard_normal((self.normal_block_size, 3))
+            self.normal_block_index = 0
+        normals = self.normal_block[self.normal_block_index]
+        self.normal_block_index += 1
+        return normals
+        
+    def get_wind_vector_at_position(self, position):
+        """Get wind vector at a specific position"""
+        x, y, z = np.asarray(position, dtype=float).reshape(3).tolist()
+        wind = self._point_wind(x, y, z)
+        return np.zeros(3) if wind is None else np.array(wind)
+        
+    def _point_wind(self, x, y, z, tier=FULL):
+        """Wind at one point in plain floats, falloff included; None outside the zone
+
+        The single-point counterpart of get_wind_vectors (and of
+        WindZoneTable.evaluate at tier index `tier`), term by term, without
+        the per-call cost of (1, 3) arrays.
+        """
+        cx, cy, cz = _xyz(self.position)
+        distance = math.sqrt((x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2)
+        if distance > self.size:
+            return None
+        falloff = max(0.0, 1.0 - (distance / self.size) ** 2)
+        
+        # 1. Vertical wind profile (logarithmic)
+        log_profile = self.wind_speed * math.log(max(0.1, y) / 0.1) / math.log(10.0 / 0.1)
+        dx, dy, dz = _xyz(self.wind_direction)
+        wx, wy, wz = log_profile * dx, log_profile * dy, log_profile * dz
+        # 2. Dryden turbulence, gust front, gusts and turbulence (cached by step)
+        if tier >= FULL:
+            tx, ty, tz = _xyz(self.temporal_wind)
+            wx, wy, wz = wx + tx, wy + ty, wz + tz
+            if self.dryden_frozen:
+                tx, ty, tz = frozen_dryden_field(self.dryden_field_seed).sample(
+                    np.array([[x, y, z]]), self.time, self.dryden_sigma, self.dryden_L, self.dryden_V * self.wind_direction
+                )[0].tolist()
+                wx, wy, wz = wx + tx, wy + ty, wz + tz
+        if tier >= HAZARDS:
+            # 3. Microburst: downdraft, then radial outflow
+            if self.microburst_progress is not None:
+                tx, ty, tz = microburst_wind_at(x, z, _xyz(self.microburst_center), self.microburst_strength,
+                                                self.microburst_progress)
+                wx, wy, wz = wx + tx, wy + ty, wz + tz
+            if self.events.active_count:
+                tx, ty, tz = self.events.evaluate(np.array([[x, y, z]]), self.time)[0].tolist()
+                wx, wy, wz = wx + tx, wy + ty, wz + tz
+        # 4. Gradient (Perlin) noise: (x, y, t), (y, z, t+100), (z, x, t+200)
+        if tier >= FULL and self.noise_amplitude > 0:
+            noise = gradient_noise(self.noise_seed)
+            sx, sy, sz = x * self.noise_scale, y * self.noise_scale, z * self.noise_scale
+            t = self.time * self.noise_time_speed
+            wx += self.noise_amplitude * noise.at(sx, sy, t)
+            wy += self.noise_amplitude * noise.at(sy, sz, t + 100)
+            wz += self.noise_amplitude * noise.at(sz, sx, t + 200)
+        # 5. Tornado
+        if tier >= HAZARDS and self.tornado_enabled:
+            tx, ty, tz = tornado_wind_at(x, z, _xyz(self.tornado_center), self.tornado_radius,
+                                         self.tornado_strength, self.tornado_updraft)
+            wx, wy, wz = wx + tx, wy + ty, wz + tz
+        return wx * falloff, wy * falloff, wz * falloff
+
+    def get_wind_vectors(self, positions):
+        """Get wind vectors for an (N, 3) array of positions in one pass"""
+        profiling = PROFILER.enabled
+        if profiling:
+            t0 = time.perf_counter()
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        winds = np.zeros_like(positions)
+
+        # Check which positions are within the wind zone
+        distance = np.sqrt(np.sum((positions - self.position) ** 2, axis=1))
+        inside = distance <= self.size
+        if not inside.any():
+            return winds
+        points = positions[inside]
+        distance = distance[inside]
+
+        # 1. Vertical wind profile (logarithmic)
+        z0 = 0.1  # surface roughness (m)
+        z_ref = 10.0
+        v_ref = self.wind_speed
+        z = np.maximum(0.1, points[:, 1])
+        log_profile = v_ref * np.log(z/z0) / np.log(z_ref/z0)
+        total_wind = log_profile[:, None] * self.wind_direction
+        if profiling:
+            t0 = PROFILER.lap("log_profile", self.zone_name, t0)
+        # 2. Dryden turbulence, gust front, gusts and turbulence (cached by step)
+        total_wind += self.temporal_wind
+        if self.dryden_frozen:
+            total_wind += frozen_dryden_field(self.dryden_field_seed).sample(
+                points, self.time, self.dryden_sigma, self.dryden_L, self.dryden_V * self.wind_direction
+            )
+            if profiling:
+                t0 = PROFILER.lap("dryden", self.zone_name, t0)
+        # 3. Microburst: downdraft, then radial outflow
+        if self.microburst_progress is not None:
+            total_wind += microburst_wind(points, self.microburst_center, self.microburst_strength,
+                                          self.microburst_progress)
+            if profiling:
+                t0 = PROFILER.lap("microburst", self.zone_name, t0)
+        if self.events.active_count:
+            total_wind += self.events.evaluate(points, self.time)
+            if profiling:
+                t0 = PROFILER.lap("events", self.zone_name, t0)
+        # 4. Gradient (Perlin) noise
+        if self.noise_amplitude > 0:
+            total_wind += self._calculate_noise(points)
+            if profiling:
+                t0 = PROFILER.lap("noise", self.zone_name, t0)
+        # 5. Tornado
+        if self.tornado_enabled:
+            total_wind += self._calculate_tornado(points)
+            if profiling:
+                t0 = PROFILER.lap("tornado", self.zone_name, t0)
         # Distance falloff
-        distance = np.linalg.norm(position - self.position)
-        falloff = 1.0 - (distance / self.size) ** 2
-        falloff = max(0.0, falloff)
-        return total_wind * falloff
+        falloff = np.maximum(0.0, 1.0 - (distance / self.size) ** 2)
+        winds[inside] = total_wind * falloff[:, None]
+        return winds
         
     def _calculate_gusts(self, dt):
         """Calculate wind gust component"""
@@ -228,139 +534,175 @@ class WindZone:
                 
         return self.wind_direction * self.wind_gust_amplitude * gust_strength
         
-    def _calculate_turbulence(self, position, dt):
+    def _calculate_turbulence(self, turbulence_time=None):
         """Calculate turbulence component using Perlin-like noise"""
         if self.turbulence_intensity <= 0:
             return np.zeros(3)
+        if turbulence_time is None:
+            turbulence_time = self.turbulence_time
             
         # Simple turbulence using sine waves at different frequencies
-        x_turb = (math.sin(self.turbulence_time * 2.1) * 0.5 + 
-                  math.sin(self.turbulence_time * 3.7) * 0.3 + 
-                  math.sin(self.turbulence_time * 5.3) * 0.2)
+        x_turb = (math.sin(turbulence_time * 2.1) * 0.5 + 
+                  math.sin(turbulence_time * 3.7) * 0.3 + 
+                  math.sin(turbulence_time * 5.3) * 0.2)
                   
-        y_turb = (math.sin(self.turbulence_time * 1.9) * 0.5 + 
-                  math.sin(self.turbulence_time * 4.1) * 0.3 + 
-                  math.sin(self.turbulence_time * 6.7) * 0.2)
+        y_turb = (math.sin(turbulence_time * 1.9) * 0.5 + 
+                  math.sin(turbulence_time * 4.1) * 0.3 + 
+                  math.sin(turbulence_time * 6.7) * 0.2)
                   
-        z_turb = (math.sin(self.turbulence_time * 2.7) * 0.5 + 
-                  math.sin(self.turbulence_time * 3.3) * 0.3 + 
-                  math.sin(self.turbulence_time * 4.9) * 0.2)
+        z_turb = (math.sin(turbulence_time * 2.7) * 0.5 + 
+                  math.sin(turbulence_time * 3.3) * 0.3 + 
+                  math.sin(turbulence_time * 4.9) * 0.2)
                   
         turbulence = np.array([x_turb, y_turb, z_turb]) * self.turbulence_intensity * self.wind_speed
         
         return turbulence
         
-    def _calculate_tornado(self, position):
+    def _calculate_noise(self, positions):
+        """Calculate gradient noise wind for an (N, 3) array of positions"""
+        noise = gradient_noise(self.noise_seed)
+        scaled = positions * self.noise_scale
+        t = self.time * self.noise_time_speed
+        # One call for all three channels: (x, y, t), (y, z, t+100), (z, x, t+200)
+        wind = noise(
+            scaled,
+            np.roll(scaled, -1, axis=1),
+            np.array([t, t + 100, t + 200])
+        )
+        return self.noise_amplitude * wind
+        
+    def _calculate_tornado(self, positions):
+        """Calculate tornado wind for an (N, 3) array of positions"""
         if not self.tornado_enabled:
             return np.zeros(3)
-        # 2D position (ignore y for horizontal wind)
-        pos_2d = np.array([position[0], position[2]])
-        center_2d = np.array([self.tornado_center[0], self.tornado_center[2]])
-        rel = pos_2d - center_2d
-        dist = np.linalg.norm(rel)
-        if dist < 1e-3:
-            dist = 1e-3  # avoid division by zero
-
-        # Tangential direction (perpendicular to radius)
-        tangent = np.array([-rel[1], rel[0]]) / dist
-
-        # Wind speed profile: max at tornado_radius, drops off inside and outside
-        if dist < self.tornado_radius:
-            speed = self.tornado_strength * (dist / self.tornado_radius)
-        else:
-            speed = self.tornado_strength * np.exp(-(dist - self.tornado_radius) / self.tornado_radius)
-
-        # Horizontal wind (x, z)
-        wind_x = speed * tangent[0]
-        wind_z = speed * tangent[1]
-
-        # Updraft: strongest in center, fades out
-        updraft = self.tornado_updraft * np.exp(-dist / (self.tornado_radius * 0.7))
-
-        return np.array([wind_x, updraft, wind_z])
+        return tornado_wind(positions, self.tornado_center, self.tornado_radius,
+                            self.tornado_strength, self.tornado_updraft)
+        
+    def _get_prim(self, key, path):
+        """Resolve a prim once and reuse the handle until it becomes invalid"""
+        prim = self._prims.get(key)
+        if prim is not None and prim.IsValid():
+            return prim
+        prim = prim_utils.get_prim_at_path(path)
+        if prim and prim.IsValid():
+            self._prims[key] = prim
+            return prim
+        self._prims.pop(key, None)
+        return None
+        
+    def invalidate_visuals(self):
+        """Drop cached prim handles and force every indicator to be rewritten"""
+        self._prims.clear()
+        self._visual_state.clear()
         
     def update_visual_indicators(self):
         """Update visual indicators in the stage"""
+        self.prepare_visual_prims()
+        self.write_visual_indicators()
+        
+    def prepare_visual_prims(self):
+        """Create or remove the tornado visual (structural edits, outside any change block)"""
         if not ISAAC_SIM_AVAILABLE:
             return
             
+        profiling = PROFILER.enabled
+        if profiling:
+            t0 = time.perf_counter()
+        try:
+            tornado_prim_path = f"/World/{self.zone_name}/TornadoVisual"
+            tornado_prim = self._get_prim("tornado", tornado_prim_path)
+            if self.tornado_enabled and not tornado_prim:
+                # Create a cylinder to represent the tornado core
+                prim_utils.create_prim(
+                    tornado_prim_path,
+                    "Cylinder",
+                    position=self.tornado_center.tolist(),
+                    attributes={
+                        "radius": self.tornado_radius,
+                        "height": 30.0,  # Height of tornado column
+                        "primvars:displayColor": [(0.7, 0.7, 1.0)]
+                    }
+                )
+                self._visual_state["tornado"] = (tuple(self.tornado_center), self.tornado_radius)
+            elif not self.tornado_enabled and tornado_prim:
+                # Remove the tornado visual if disabled
+                stage_utils.remove_prim(tornado_prim_path)
+                self._prims.pop("tornado", None)
+                self._visual_state.pop("tornado", None)
+        except Exception as e:
+            print(f"⚠️ Error updating visual indicators: {e}")
+        if profiling:
+            PROFILER.lap("usd_prepare", self.zone_name, t0)
+            
+    def write_visual_indicators(self):
+        """Write indicator transforms whose driving parameters changed since the last write"""
+        if not ISAAC_SIM_AVAILABLE:
+            return
+            
+        profiling = PROFILER.enabled
+        if profiling:
+            t0 = time.perf_counter()
         try:
             # Update wind direction arrow
-            wind_prim_path = f"/World/{self.zone_name}/WindDirection"
-            wind_prim = prim_utils.get_prim_at_path(wind_prim_path)
-            if wind_prim:
-                # Calculate rotation to point in wind direction
-                forward = np.array([1.0, 0.0, 0.0])
-                rotation = self._vector_to_rotation(forward, self.wind_direction)
-                
-                # Apply rotation
-                from pxr import Gf
-                transform = Gf.Matrix4d()
-                transform.SetRotate(Gf.Rotation(Gf.Vec3d(0, 0, 1), rotation[2]))
-                transform.SetRotateOnly(Gf.Rotation(Gf.Vec3d(0, 1, 0), rotation[1]) * transform.GetRotation())
-                transform.SetRotateOnly(Gf.Rotation(Gf.Vec3d(1, 0, 0), rotation[0]) * transform.GetRotation())
-                
-                omni.usd.set_world_transform_matrix(wind_prim, transform)
+            direction = tuple(self.wind_direction)
+            if self._visual_state.get("direction") != direction:
+                wind_prim = self._get_prim("direction", f"/World/{self.zone_name}/WindDirection")
+                if wind_prim:
+                    # Calculate rotation to point in wind direction
+                    forward = np.array([1.0, 0.0, 0.0])
+                    rotation = self._vector_to_rotation(forward, self.wind_direction)
+                    
+                    # Apply rotation
+                    transform = Gf.Matrix4d()
+                    transform.SetRotate(Gf.Rotation(Gf.Vec3d(0, 0, 1), rotation[2]))
+                    transform.SetRotateOnly(Gf.Rotation(Gf.Vec3d(0, 1, 0), rotation[1]) * transform.GetRotation())
+                    transform.SetRotateOnly(Gf.Rotation(Gf.Vec3d(1, 0, 0), rotation[0]) * transform.GetRotation())
+                    
+                    omni.usd.set_world_transform_matrix(wind_prim, transform)
+                self._visual_state["direction"] = direction
                 
             # Update speed indicator
-            speed_prim_path = f"/World/{self.zone_name}/WindSpeedIndicator/SpeedIndicator"
-            speed_prim = prim_utils.get_prim_at_path(speed_prim_path)
-            if speed_prim:
-                # Move indicator based on wind speed (0-20 m/s range)
-                speed_ratio = min(1.0, self.wind_speed / 20.0)
-                indicator_y = speed_ratio * 2.0 - 1.0  # -1 to 1 range
-                
-                from pxr import Gf
-                transform = Gf.Matrix4d()
-                transform.SetTranslate(Gf.Vec3d(0, indicator_y, 0))
-                omni.usd.set_world_transform_matrix(speed_prim, transform)
+            if self._visual_state.get("speed") != self.wind_speed:
+                speed_prim = self._get_prim("speed", f"/World/{self.zone_name}/WindSpeedIndicator/SpeedIndicator")
+                if speed_prim:
+                    # Move indicator based on wind speed (0-20 m/s range)
+                    speed_ratio = min(1.0, self.wind_speed / 20.0)
+                    indicator_y = speed_ratio * 2.0 - 1.0  # -1 to 1 range
+                    
+                    transform = Gf.Matrix4d()
+                    transform.SetTranslate(Gf.Vec3d(0, indicator_y, 0))
+                    omni.usd.set_world_transform_matrix(speed_prim, transform)
+                self._visual_state["speed"] = self.wind_speed
                 
             # Update turbulence indicator
-            turb_prim_path = f"/World/{self.zone_name}/TurbulenceIndicator/TurbulenceSphere"
-            turb_prim = prim_utils.get_prim_at_path(turb_prim_path)
-            if turb_prim:
-                # Scale based on turbulence intensity
-                scale = 0.5 + self.turbulence_intensity * 0.5
-                
-                from pxr import Gf
-                transform = Gf.Matrix4d()
-                transform.SetScale(Gf.Vec3d(scale, scale, scale))
-                omni.usd.set_world_transform_matrix(turb_prim, transform)
+            if self._visual_state.get("turbulence") != self.turbulence_intensity:
+                turb_prim = self._get_prim("turbulence", f"/World/{self.zone_name}/TurbulenceIndicator/TurbulenceSphere")
+                if turb_prim:
+                    # Scale based on turbulence intensity
+                    scale = 0.5 + self.turbulence_intensity * 0.5
+                    
+                    transform = Gf.Matrix4d()
+                    transform.SetScale(Gf.Vec3d(scale, scale, scale))
+                    omni.usd.set_world_transform_matrix(turb_prim, transform)
+                self._visual_state["turbulence"] = self.turbulence_intensity
                 
             # --- Tornado visualization ---
-            if self.tornado_enabled:
-                tornado_prim_path = f"/World/{self.zone_name}/TornadoVisual"
-                # Check if the tornado visual already exists
-                tornado_prim = prim_utils.get_prim_at_path(tornado_prim_path)
-                if not tornado_prim:
-                    # Create a cylinder to represent the tornado core
-                    prim_utils.create_prim(
-                        tornado_prim_path,
-                        "Cylinder",
-                        position=self.tornado_center.tolist(),
-                        attributes={
-                            "radius": self.tornado_radius,
-                            "height": 30.0,  # Height of tornado column
-                            "primvars:displayColor": [(0.7, 0.7, 1.0)]
-                        }
-                    )
-                else:
+            tornado = (tuple(self.tornado_center), self.tornado_radius)
+            if self.tornado_enabled and self._visual_state.get("tornado") != tornado:
+                tornado_prim = self._get_prim("tornado", f"/World/{self.zone_name}/TornadoVisual")
+                if tornado_prim:
                     # Update position and radius if tornado moves
                     tornado_prim.GetAttribute("radius").Set(self.tornado_radius)
                     tornado_prim.GetAttribute("height").Set(30.0)
-                    from pxr import Gf
                     transform = Gf.Matrix4d()
                     transform.SetTranslate(Gf.Vec3d(*self.tornado_center))
                     omni.usd.set_world_transform_matrix(tornado_prim, transform)
-            else:
-                # Optionally, remove the tornado visual if disabled
-                tornado_prim_path = f"/World/{self.zone_name}/TornadoVisual"
-                tornado_prim = prim_utils.get_prim_at_path(tornado_prim_path)
-                if tornado_prim:
-                    stage_utils.remove_prim(tornado_prim_path)
+                    self._visual_state["tornado"] = tornado
 
         except Exception as e:
             print(f"⚠️ Error updating visual indicators: {e}")
+        if profiling:
+            PROFILER.lap("usd_write", self.zone_name, t0)
             
     def _vector_to_rotation(self, v1, v2):
         """Convert direction vector to rotation angles"""
@@ -387,32 +729,172 @@ class WindZone:
 class WindController:
     """Main wind controller managing multiple wind zones"""
     
-    def __init__(self):
+    # Zone fields that change the zone's footprint in the spatial index
+    _INDEXED_FIELDS = frozenset({"position", "size"})
+    
+    def __init__(self, cell_size=20.0, seed=None):
         self.wind_zones = {}
+        # Scenario seed (int or SeedSequence); every zone gets its own spawned stream in the order added
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
         self.time = 0.0
         self.dt = 0.016  # 60 FPS
+        self.zone_index = ZoneHashGrid(cell_size)
+        self.zone_table = WindZoneTable()
+        # Default query fidelity: "mean", "hazards" or "full" (see wind_table.FIDELITY_TIERS)
+        self.fidelity = "full"
         
     def add_wind_zone(self, zone_name, position, size=10.0):
         """Add a new wind zone"""
-        self.wind_zones[zone_name] = WindZone(zone_name, position, size)
+        previous = self.wind_zones.get(zone_name)
+        if previous is not None:
+            previous.remove_observer(self._on_zone_changed)
+        zone = WindZone(zone_name, position, size, self.seed_sequence.spawn(1)[0])
+        self.wind_zones[zone_name] = zone
+        self.zone_index.insert(zone_name, zone.position, zone.size)
+        self.zone_table.mark_dirty(zone_name)
+        zone.add_observer(self._on_zone_changed)
         print(f"🌪️ Added wind zone: {zone_name} at {position}")
         
-    def get_wind_at_position(self, position):
-        """Get total wind vector at a position from all zones"""
-        total_wind = np.zeros(3)
+    def _on_zone_changed(self, zone, field_name):
+        """Re-index a zone after it moved or was resized and recompile its table row"""
+        if field_name in self._INDEXED_FIELDS:
+            self.zone_index.insert(zone.zone_name, zone.position, zone.size)
+        self.zone_table.mark_dirty(zone.zone_name)
         
-        for zone in self.wind_zones.values():
-            wind = zone.get_wind_vector_at_position(position, self.dt)
-            total_wind += wind
+    def snapshot(self):
+        """Checkpoint every zone and the clock; picklable, so it can be sent to worker processes"""
+        return {
+            'version': SNAPSHOT_VERSION,
+            'time': self.time,
+            'dt': self.dt,
+            'seed_sequence': copy.deepcopy(self.seed_sequence),
+            'zones': {zone_name: zone.snapshot() for zone_name, zone in self.wind_zones.items()},
+        }
+        
+    def restore(self, snapshot):
+        """Return to a snapshot(): zones are restored in place, created or removed to match"""
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported wind snapshot version: {snapshot.get('version')}")
+        for zone_name in [name for name in self.wind_zones if name not in snapshot['zones']]:
+            zone = self.wind_zones.pop(zone_name)
+            zone.remove_observer(self._on_zone_changed)
+            self.zone_index.remove(zone_name)
+        for zone_name, zone_snapshot in snapshot['zones'].items():
+            if zone_name not in self.wind_zones:
+                parameters = zone_snapshot['parameters']
+                self.add_wind_zone(zone_name, parameters['position'], parameters['size'])
+            self.wind_zones[zone_name].restore(zone_snapshot)
+        self.time = snapshot['time']
+        self.dt = snapshot['dt']
+        self.seed_sequence = copy.deepcopy(snapshot['seed_sequence'])
+        self.invalidate_table()
+        
+    def invalidate_table(self):
+        """Recompile every zone's table row (e.g. after stepping zones directly)"""
+        for zone_name in self.wind_zones:
+            self.zone_table.mark_dirty(zone_name)
+        
+    def get_wind_at_position(self, position, fidelity=None):
+        """Get total wind vector at a position from all zones
+
+        A single point skips the batch machinery: the zones of the point's
+        index cell are evaluated in plain floats (WindZone._point_wind), with
+        the same result as get_wind_vectors.
+        """
+        tier = self._fidelity_tiers(self.fidelity if fidelity is None else fidelity)
+        if np.ndim(tier):
+            return self.get_wind_vectors(position, fidelity)[0]
+        profiling = PROFILER.enabled
+        if profiling:
+            t0 = time.perf_counter()
+        x, y, z = np.asarray(position, dtype=float).reshape(3).tolist()
+        wx = wy = wz = 0.0
+        names = self.zone_index.names
+        for slot in self.zone_index.point_slots(x, y, z):
+            wind = self.wind_zones[names[slot]]._point_wind(x, y, z, tier)
+            if wind is not None:
+                wx, wy, wz = wx + wind[0], wy + wind[1], wz + wind[2]
+        if profiling:
+            PROFILER.lap("controller_query", None, t0)
+        return np.array([wx, wy, wz])
+        
+    def get_wind_vectors(self, positions, fidelity=None):
+        """Get total wind vectors for an (N, 3) array of positions from all zones
+
+        fidelity: a tier name for all points, or a sequence of tier names
+        or indices per point; defaults to self.fidelity.
+        """
+        profiling = PROFILER.enabled
+        if profiling:
+            t0 = time.perf_counter()
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        
+        # Only (point, zone) pairs inside a zone's sphere are evaluated, all in one pass
+        self.zone_table.sync(self.wind_zones, self.zone_index.slots)
+        pair_points, pair_slots = self.zone_index.query_pairs(positions)
+        tiers = self._fidelity_tiers(self.fidelity if fidelity is None else fidelity)
+        if np.ndim(tiers):
+            tiers = tiers[pair_points]
+        total_wind = self.zone_table.evaluate(positions, pair_points, pair_slots, tiers)
             
+        if profiling:
+            PROFILER.lap("controller_query", None, t0)
         return total_wind
         
-    def update(self):
-        """Update all wind zones"""
-        self.time += self.dt
+    @staticmethod
+    def _fidelity_tiers(fidelity):
+        """Tier index or per-point tier indices for WindZoneTable.evaluate"""
+        if isinstance(fidelity, str):
+            if fidelity not in FIDELITY_TIERS:
+                raise ValueError(f"Unknown fidelity {fidelity!r}, expected one of {FIDELITY_TIERS}")
+            return FIDELITY_TIERS.index(fidelity)
+        if np.ndim(fidelity) == 0:
+            return int(fidelity)
+        return np.array([FIDELITY_TIERS.index(tier) if isinstance(tier, str) else int(tier) for tier in fidelity])
+        
+    def fidelity_view(self, fidelity):
+        """This controller as seen by a consumer that always queries at `fidelity`"""
+        return WindFidelityView(self, fidelity)
         
+    def step(self, dt=None, positions=None):
+        """Advance all wind zones by one frame (queries between steps are pure)"""
+        if dt is None:
+            dt = self.dt
+        profiling = PROFILER.enabled
+        if profiling:
+            t0 = time.perf_counter()
+        self.time += dt
+        
+        hits = {}
+        if positions is not None:
+            positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+            hits = self.zone_index.query(positions)
+        self.zone_table.sync(self.wind_zones, self.zone_index.slots)
+        slots = self.zone_index.slots
+        for zone_name, zone in self.wind_zones.items():
+            indices = hits.get(zone_name)
+            zone.step(dt, None if indices is None else positions[indices])
+            self.zone_table.write_temporal(slots[zone_name], zone)
+        if profiling:
+            PROFILER.lap("controller_step", None, t0)
+            
+    def update(self):
+        """Update visual indicators of all wind zones"""
+        if not ISAAC_SIM_AVAILABLE:
+            return
+        self.prepare_visuals()
+        with Sdf.ChangeBlock():
+            self.write_visuals()
+            
+    def prepare_visuals(self):
+        """Create or remove zone visual prims (must run outside a change block)"""
+        for zone in self.wind_zones.values():
+            zone.prepare_visual_prims()
+            
+    def write_visuals(self):
+        """Write dirty zone indicators; callers batch this in an Sdf.ChangeBlock"""
         for zone in self.wind_zones.values():
-            zone.update_visual_indicators()
+            zone.write_visual_indicators()
             
     def create_preset_wind_conditions(self, preset_name):
         """Create preset wind conditions"""
@@ -442,6 +924,26 @@ class WindController:
                 
         print(f"🌪️ Applied {preset_name} wind conditions")
 
+class WindFidelityView:
+    """A WindController whose queries default to a fixed fidelity, e.g. for planners or distant agents
+
+    Everything else (step, zones, visuals) is the shared controller's.
+    """
+    
+    def __init__(self, controller, fidelity):
+        controller._fidelity_tiers(fidelity)
+        self.controller = controller
+        self.fidelity = fidelity
+        
+    def __getattr__(self, name):
+        return getattr(self.controller, name)
+        
+    def get_wind_at_position(self, position, fidelity=None):
+        return self.controller.get_wind_at_position(position, self.fidelity if fidelity is None else fidelity)
+        
+    def get_wind_vectors(self, positions, fidelity=None):
+        return self.controller.get_wind_vectors(positions, self.fidelity if fidelity is None else fidelity)
+
 def main():
     """Main function to demonstrate wind controller"""
     print("🌪️ ZephyrSim - Wind Controller")
@@ -492,7 +994,8 @@ def main():
             else:
                 print("Invalid choice. Please select 1-6.")
                 
-            # Update wind zones
+            # Advance and update wind zones
+            controller.step()
             controller.update()
             
             # Show wind at drone position
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Wind Events
+Many transient gust fronts and microbursts per zone, scheduled by activation
+time and evaluated only where they are active
+"""
+
+import heapq
+
+import numpy as np
+
+try:
+    from scripts.wind_kernels import microburst_wind
+    from scripts.zone_index import ZoneHashGrid
+except ImportError:
+    from wind_kernels import microburst_wind
+    from zone_index import ZoneHashGrid
+
+
+class WindEvent:
+    """A transient wind event acting inside a sphere (center, radius)
+
+    With a `start_time` the event switches on at that zone time; without one
+    it is armed and starts when an agent comes within `radius` of the center,
+    like the zone's built-in gust front and microburst. It ends `duration`
+    seconds after it starts.
+    """
+
+    kind = None
+
+    def __init__(self, center, radius, strength, duration, start_time=None):
+        self.center = np.asarray(center, dtype=float)
+        self.radius = float(radius)
+        self.strength = float(strength)
+        self.duration = float(duration)
+        self.start_time = start_time
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in sorted(vars(self).items()))
+        return f"{type(self).__name__}({fields})"
+
+
+class GustFrontEvent(WindEvent):
+    """Uniform push along `direction`, fading linearly over the event"""
+
+    kind = 0
+
+    def __init__(self, center, radius=10.0, strength=15.0, duration=3.0, start_time=None, direction=None):
+        super().__init__(center, radius, strength, duration, start_time)
+        # None: the zone's wind direction when the event is added
+        self.direction = None if direction is None else np.asarray(direction, dtype=float)
+
+    @staticmethod
+    def wind(points, direction, strength, progress):
+        """Gust front shape for (N, 3) points and per-point parameters"""
+        return direction * strength[:, None] * (1 - progress)[:, None]
+
+
+class MicroburstEvent(WindEvent):
+    """Downdraft weakening into radial outflow over the event"""
+
+    kind = 1
+
+    def __init__(self, center, radius=8.0, strength=20.0, duration=2.0, start_time=None):
+        super().__init__(center, radius, strength, duration, start_time)
+
+    @staticmethod
+    def wind(points, center, strength, progress):
+        """Microburst shape for (N, 3) points and per-point parameters"""
+        return microburst_wind(points, center, strength, progress)
+
+
+EVENT_TYPES = (GustFrontEvent, MicroburstEvent)
+
+
+class WindEventScheduler:
+    """Holds a zone's events and evaluates the active ones
+
+    Zone time only moves forward, so "which events are active now" needs no
+    general interval tree: scheduled events wait in a heap ordered by start
+    time, active ones in a heap ordered by end time, and each step pops what
+    starts or ends. Armed (agent-triggered) events and active events live in
+    two spatial hash grids, so triggering and queries only look at events
+    near the points. Finished events are dropped.
+    """
+
+    def __init__(self, cell_size=20.0):
+        self.cell_size = cell_size
+        self.events = {}               # event id -> event (pending, armed or active)
+        self.pending = []              # heap of (start_time, event id)
+        self.ending = []               # heap of (end_time, event id)
+        self.armed = ZoneHashGrid(cell_size)
+        self.active = ZoneHashGrid(cell_size)
+        self.retired = 0
+        self._next_id = 0
+        # Active event parameters, indexed by slot in the `active` grid
+        self._kinds = np.zeros(16, dtype=np.int8)
+        self._starts = np.zeros(16)
+        self._durations = np.ones(16)
+        self._strengths = np.zeros(16)
+        self._centers = np.zeros((16, 3))
+        self._directions = np.zeros((16, 3))
+
+    def __len__(self):
+        return len(self.events)
+
+    def __repr__(self):
+        # Deterministic, so schedules hash consistently into wind-field cache keys
+        return f"WindEventScheduler(events={sorted(self.events.items())!r}, retired={self.retired})"
+
+    @property
+    def active_count(self):
+        return len(self.active)
+
+    def add(self, event):
+        """Schedule or arm an event; returns its id"""
+        if event.kind == GustFrontEvent.kind and event.direction is None:
+            raise ValueError("Gust front events need a direction (WindZone.add_event fills in the zone's)")
+        event_id = self._next_id
+        self._next_id += 1
+        self.events[event_id] = event
+        if event.start_time is None:
+            self.armed.insert(event_id, event.center, event.radius)
+        else:
+            heapq.heappush(self.pending, (event.start_time, event_id))
+        return event_id
+
+    def remove(self, event_id):
+        """Cancel an event in any stage"""
+        self.events.pop(event_id, None)
+        for grid in (self.armed, self.active):
+            if event_id in grid.slots:
+                grid.remove(event_id)
+        # Heap entries of removed events are skipped when popped
+
+    def advance(self, time, dt, triggers=None):
+        """Start, trigger and retire events for the zone time `time`"""
+        # Retire events that have ended
+        while self.ending and self.ending[0][0] <= time:
+            _, event_id = heapq.heappop(self.ending)
+            if event_id in self.active.slots:
+                self.active.remove(event_id)
+                del self.events[event_id]
+                self.retired += 1
+        # Start scheduled events
+        while self.pending and self.pending[0][0] <= time:
+            start, event_id = heapq.heappop(self.pending)
+            if event_id in self.events:
+                self._activate(event_id, start, time)
+        # Trigger armed events near agents; they have run for this step already
+        if triggers is not None and len(triggers) and len(self.armed):
+            _, slots = self.armed.query_pairs(triggers)
+            for slot in np.unique(slots).tolist():
+                event_id = self.armed.names[slot]
+                self.armed.remove(event_id)
+                self._activate(event_id, time - dt, time)
+
+    def _activate(self, event_id, start, time):
+        event = self.events[event_id]
+        end = start + event.duration
+        if end <= time:
+            del self.events[event_id]
+            self.retired += 1
+            return
+        self.active.insert(event_id, event.center, event.radius)
+        slot = self.active.slots[event_id]
+        if slot >= len(self._kinds):
+            self._grow(2 * len(self._kinds))
+        self._kinds[slot] = event.kind
+        self._starts[slot] = start
+        self._durations[slot] = event.duration
+        self._strengths[slot] = event.strength
+        self._centers[slot] = event.center
+        if event.kind == GustFrontEvent.kind:
+            self._directions[slot] = event.direction
+        heapq.heappush(self.ending, (end, event_id))
+
+    def _grow(self, capacity):
+        for name in ("_kinds", "_starts", "_durations", "_strengths", "_centers", "_directions"):
+            column = getattr(self, name)
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def evaluate(self, points, time):
+        """Summed wind of the active events covering each of the (N, 3) points"""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        wind = np.zeros_like(points)
+        if not len(self.active):
+            return wind
+        pair_points, pair_slots = self.active.query_pairs(points)
+        if not len(pair_slots):
+            return wind
+        progress = (time - self._starts[pair_slots]) / self._durations[pair_slots]
+        kinds = self._kinds[pair_slots]
+        pair_wind = np.empty((len(pair_slots), 3))
+        for event_type in EVENT_TYPES:
+            selected = np.flatnonzero(kinds == event_type.kind)
+            if not len(selected):
+                continue
+            slots = pair_slots[selected]
+            if event_type is GustFrontEvent:
+                pair_wind[selected] = GustFrontEvent.wind(
+                    points[pair_points[selected]], self._directions[slots], self._strengths[slots], progress[selected]
+                )
+            else:
+                pair_wind[selected] = MicroburstEvent.wind(
+                    points[pair_points[selected]], self._centers[slots], self._strengths[slots], progress[selected]
+                )
+        for axis in range(3):
+            wind[:, axis] = np.bincount(pair_points, weights=pair_wind[:, axis], minlength=len(points))
+        return wind
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Baked Wind Field Cache
+Samples a WindController onto a regular 3D grid (optionally with time slices),
+stores it as a memory-mapped .npy file and serves trilinear lookups
+"""
+
+import copy
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Bump when the baked file layout or sampling changes
+CACHE_FORMAT_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "ZEPHYRSIM_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "zephyrsim", "wind_fields")
+)
+
+
+def _to_json(value):
+    """Convert numpy values so zone parameters serialize canonically"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(key): _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    return value
+
+
+def trilinear(field, lower, upper, weights):
+    """Trilinear interpolation of a (X, Y, Z, 3) grid
+
+    lower and upper are (N, 3) integer corner indices on either side of each
+    point (upper is lower + 1, or wrapped for a periodic grid) and weights
+    the (N, 3) fractional position between them. Returns float64 (N, 3).
+    """
+    x0, y0, z0 = lower[:, 0], lower[:, 1], lower[:, 2]
+    x1, y1, z1 = upper[:, 0], upper[:, 1], upper[:, 2]
+    wx, wy, wz = weights[:, 0:1], weights[:, 1:2], weights[:, 2:3]
+    c00 = field[x0, y0, z0] * (1 - wx) + field[x1, y0, z0] * wx
+    c10 = field[x0, y1, z0] * (1 - wx) + field[x1, y1, z0] * wx
+    c01 = field[x0, y0, z1] * (1 - wx) + field[x1, y0, z1] * wx
+    c11 = field[x0, y1, z1] * (1 - wx) + field[x1, y1, z1] * wx
+    c0 = c00 * (1 - wy) + c10 * wy
+    c1 = c01 * (1 - wy) + c11 * wy
+    return np.asarray(c0 * (1 - wz) + c1 * wz, dtype=float)
+
+
+# Random stream state is left out of the key so one baked realization is reused
+_UNKEYED_STATE = frozenset({"rng", "normal_block", "normal_block_index"})
+
+
+def wind_field_key(controller, **settings):
+    """Hash the zone parameters, zone state and bake settings into a cache key"""
+    payload = {
+        "version": CACHE_FORMAT_VERSION,
+        "time": controller.time,
+        "zones": {
+            name: {
+                "parameters": zone.get_parameters(),
+                "state": {key: value for key, value in zone.get_state().items() if key not in _UNKEYED_STATE},
+            }
+            for name, zone in sorted(controller.wind_zones.items())
+        },
+        "settings": settings,
+    }
+    encoded = json.dumps(_to_json(payload), sort_keys=True, default=repr)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+class BakedWindField:
+    """Wind field served from a baked grid by trilinear and temporal interpolation
+
+    Exposes the same query/step/update interface as WindController so it can
+    replace it, e.g. as DroneController.wind_controller. Positions outside the
+    baked bounds are clamped to the boundary, and times past the last slice
+    hold the last slice.
+    """
+
+    def __init__(self, data, origin, spacing, slice_dt=None, path=None):
+        # data: (T, nx, ny, nz, 3) wind samples; T == 1 for a static field
+        self.data = data
+        self.origin = np.asarray(origin, dtype=float)
+        self.spacing = np.asarray(spacing, dtype=float)
+        self.shape = np.array(data.shape[1:4])
+        self.slice_dt = slice_dt
+        self.path = path
+        self.time = 0.0
+        self.dt = 0.016  # 60 FPS
+
+    @classmethod
+    def bake(cls, controller, bounds_min, bounds_max, resolution, time_slices=1, slice_dt=1.0,
+             cache_dir=DEFAULT_CACHE_DIR, force=False):
+        """Bake a controller, or load an identical bake from the cache directory
+
+        resolution: grid points per axis (int or 3-sequence).
+        time_slices: number of slices, `slice_dt` seconds apart. The controller
+        is copied before stepping, so the live controller is not advanced.
+        """
+        bounds_min = np.asarray(bounds_min, dtype=float)
+        bounds_max = np.asarray(bounds_max, dtype=float)
+        resolution = np.broadcast_to(np.asarray(resolution, dtype=int), (3,))
+        if np.any(resolution < 2):
+            raise ValueError("resolution must be at least 2 points per axis")
+        time_slices = max(1, int(time_slices))
+        spacing = (bounds_max - bounds_min) / (resolution - 1)
+
+        key = wind_field_key(
+            controller,
+            bounds_min=bounds_min.tolist(),
+            bounds_max=bounds_max.tolist(),
+            resolution=resolution.tolist(),
+            time_slices=time_slices,
+            slice_dt=slice_dt,
+            dt=controller.dt,
+        )
+        path = os.path.join(cache_dir, f"wind_{key}.npy")
+        if os.path.exists(path) and not force:
+            return cls.load(path)
+
+        axes = [np.linspace(bounds_min[i], bounds_max[i], resolution[i]) for i in range(3)]
+        grid = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        data = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.float32, shape=(time_slices, *resolution.tolist(), 3)
+        )
+        sampler = copy.deepcopy(controller)
+        steps_per_slice = max(1, int(round(slice_dt / sampler.dt)))
+        for t in range(time_slices):
+            if t > 0:
+                for _ in range(steps_per_slice):
+                    sampler.step()
+            data[t] = sampler.get_wind_vectors(grid).reshape(*resolution.tolist(), 3)
+        data.flush()
+        del data
+
+        metadata = {
+            "origin": bounds_min.tolist(),
+            "spacing": spacing.tolist(),
+            "slice_dt": steps_per_slice * sampler.dt if time_slices > 1 else None,
+        }
+        with open(f"{tmp_path}.json", "w") as f:
+            json.dump(metadata, f)
+        # Rename into place so concurrent workers never see a partial file
+        os.replace(f"{tmp_path}.json", f"{path}.json")
+        os.replace(tmp_path, path)
+        print(f"🧊 Baked wind field {resolution.tolist()} x {time_slices} slices to {path}")
+        return cls.load(path)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a baked field written by bake()"""
+        with open(f"{path}.json") as f:
+            metadata = json.load(f)
+        data = np.load(path, mmap_mode="r")
+        return cls(data, metadata["origin"], metadata["spacing"], metadata["slice_dt"], path)
+
+    def step(self, dt=None, positions=None):
+        """Advance the field clock (baked events are not position-triggered)"""
+        self.time += self.dt if dt is None else dt
+
+    def update(self):
+        """Baked fields have no visual indicators"""
+
+    def prepare_visuals(self):
+        pass
+
+    def write_visuals(self):
+        pass
+
+    def snapshot(self):
+        """The field clock; the baked data itself never changes"""
+        return {'time': self.time, 'dt': self.dt}
+
+    def restore(self, snapshot):
+        self.time = snapshot['time']
+        self.dt = snapshot['dt']
+
+    def get_wind_at_position(self, position):
+        """Get interpolated wind vector at a position"""
+        positions = np.asarray(position, dtype=float).reshape(1, 3)
+        return self.get_wind_vectors(positions)[0]
+
+    def get_wind_vectors(self, positions):
+        """Get interpolated wind vectors for an (N, 3) array of positions"""
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+
+        # Temporal neighbours
+        slices = self.data.shape[0]
+        if slices == 1 or not self.slice_dt:
+            t0, t1, tw = 0, 0, 0.0
+        else:
+            t = min(max(self.time / self.slice_dt, 0.0), slices - 1)
+            t0 = min(int(t), slices - 2)
+            t1 = t0 + 1
+            tw = t - t0
+
+        # Spatial neighbours, clamped to the grid
+        f = (positions - self.origin) / self.spacing
+        f = np.clip(f, 0.0, self.shape - 1)
+        i0 = np.minimum(f.astype(int), self.shape - 2)
+        i1 = i0 + 1
+        w = f - i0
+
+        wind = trilinear(self.data[t0], i0, i1, w)
+        if tw > 0.0:
+            wind = (1.0 - tw) * wind + tw * trilinear(self.data[t1], i0, i1, w)
+        return wind
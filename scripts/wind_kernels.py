@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Wind Kernels
+Hot loops for wind evaluation and drone control, JIT-compiled with Numba when
+it is installed and falling back to NumPy otherwise
+"""
+
+import heapq
+import importlib.util
+import math
+import os
+import sys
+
+import numpy as np
+
+if __name__ == "wind_kernels":
+    # Script mode (python scripts/X.py) imports this file as a top-level module.
+    # Numba's on-disk cache records the defining module's name, so hand out
+    # scripts.wind_kernels instead: kernels cached under one invocation then
+    # load under the other, and both share one BACKEND
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import scripts.wind_kernels
+    sys.modules[__name__] = scripts.wind_kernels
+
+# Numba is optional and only imported the first time a kernel runs
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+# "numba" or "numpy"; set ZEPHYRSIM_KERNELS=numpy to force the fallback
+BACKEND = "numba" if NUMBA_AVAILABLE and os.environ.get("ZEPHYRSIM_KERNELS") != "numpy" else "numpy"
+
+# Largest relative difference between the backends' results. Only the tornado
+# differs: NumPy's vectorized exp and the libm exp the loops call may round
+# differently by a few ulps. The other kernels are bit-identical.
+BACKEND_RTOL = 1e-14
+
+
+def set_backend(name):
+    """Switch every kernel between "numba" and "numpy" at runtime"""
+    global BACKEND
+    if name not in ("numba", "numpy"):
+        raise ValueError(f"Unknown kernel backend: {name}")
+    if name == "numba" and not NUMBA_AVAILABLE:
+        raise ImportError("numba is not installed")
+    BACKEND = name
+
+
+class _LazyJit:
+    """Compile a loop kernel with numba.njit on first use
+
+    Compiled kernels are cached on disk, so each process (e.g. every batch
+    worker) loads them instead of compiling again.
+    """
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.compiled = None
+
+    def __call__(self, *args):
+        if self.compiled is None:
+            import numba
+            self.compiled = numba.njit(nogil=True, cache=True)(self.fn)
+        return self.compiled(*args)
+
+
+# --- Tornado ---------------------------------------------------------------------
+
+def _tornado_numpy(points, center, radius, strength, updraft):
+    # 2D position (ignore y for horizontal wind)
+    rel_x = points[:, 0] - center[..., 0]
+    rel_z = points[:, 2] - center[..., 2]
+    dist = np.sqrt(rel_x ** 2 + rel_z ** 2)
+    dist = np.maximum(dist, 1e-3)  # avoid division by zero
+
+    # Wind speed profile: max at tornado_radius, drops off inside and outside
+    speed = np.where(
+        dist < radius,
+        strength * (dist / radius),
+        strength * np.exp(-(dist - radius) / radius)
+    )
+
+    # Horizontal wind (x, z) along the tangent (perpendicular to radius)
+    wind = np.empty((len(points), 3))
+    wind[:, 0] = speed * -rel_z / dist
+    wind[:, 2] = speed * rel_x / dist
+
+    # Updraft: strongest in center, fades out
+    wind[:, 1] = updraft * np.exp(-dist / (radius * 0.7))
+    return wind
+
+
+@_LazyJit
+def _tornado_loop(points, center, radius, strength, updraft, out):
+    for i in range(points.shape[0]):
+        rel_x = points[i, 0] - center[i, 0]
+        rel_z = points[i, 2] - center[i, 2]
+        dist = max(math.sqrt(rel_x * rel_x + rel_z * rel_z), 1e-3)
+        r = radius[i]
+        if dist < r:
+            speed = strength[i] * (dist / r)
+        else:
+            speed = strength[i] * math.exp(-(dist - r) / r)
+        out[i, 0] = speed * -rel_z / dist
+        out[i, 1] = updraft[i] * math.exp(-dist / (r * 0.7))
+        out[i, 2] = speed * rel_x / dist
+
+
+def tornado_wind(points, center, radius, strength, updraft):
+    """Tornado wind at (N, 3) points; parameters are per point or shared scalars"""
+    if BACKEND == "numpy":
+        return _tornado_numpy(points, center, radius, strength, updraft)
+    n = len(points)
+    out = np.empty((n, 3))
+    _tornado_loop(
+        points,
+        np.broadcast_to(np.asarray(center, dtype=float), (n, 3)),
+        np.broadcast_to(np.asarray(radius, dtype=float), (n,)),
+        np.broadcast_to(np.asarray(strength, dtype=float), (n,)),
+        np.broadcast_to(np.asarray(updraft, dtype=float), (n,)),
+        out,
+    )
+    return out
+
+
+def tornado_wind_at(x, z, center, radius, strength, updraft):
+    """tornado_wind at a single point in plain floats; returns (wx, wy, wz)"""
+    rel_x = x - center[0]
+    rel_z = z - center[2]
+    dist = max(math.sqrt(rel_x * rel_x + rel_z * rel_z), 1e-3)
+    if dist < radius:
+        speed = strength * (dist / radius)
+    else:
+        speed = strength * math.exp(-(dist - radius) / radius)
+    return speed * -rel_z / dist, updraft * math.exp(-dist / (radius * 0.7)), speed * rel_x / dist
+
+
+# --- Microburst --------------------------------------------------------------------
+
+def _microburst_numpy(points, center, strength, progress):
+    wind = np.zeros((len(points), 3))
+    # Downdraft, weakening as the burst runs
+    wind[:, 1] = -strength * (1 - progress)
+    # Radial outflow, strengthening as the burst runs
+    radial = points - center
+    radial[:, 1] = 0
+    radial_norm = np.sqrt(np.sum(radial ** 2, axis=1))
+    outward = radial_norm > 1e-3
+    radial[outward] /= radial_norm[outward, None]
+    radial[~outward] = 0.0
+    wind += np.reshape(strength * 0.5 * progress, (-1, 1)) * radial
+    return wind
+
+
+@_LazyJit
+def _microburst_loop(points, center, strength, progress, out):
+    for i in range(points.shape[0]):
+        rx = points[i, 0] - center[i, 0]
+        rz = points[i, 2] - center[i, 2]
+        norm = math.sqrt(rx * rx + rz * rz)
+        if norm > 1e-3:
+            rx /= norm
+            rz /= norm
+        else:
+            rx = 0.0
+            rz = 0.0
+        outflow = strength[i] * 0.5 * progress[i]
+        out[i, 0] = outflow * rx
+        out[i, 1] = -strength[i] * (1 - progress[i])
+        out[i, 2] = outflow * rz
+
+
+def microburst_wind(points, center, strength, progress):
+    """Microburst downdraft plus radial outflow at (N, 3) points"""
+    if BACKEND == "numpy":
+        return _microburst_numpy(points, center, strength, progress)
+    n = len(points)
+    out = np.empty((n, 3))
+    _microburst_loop(
+        points,
+        np.broadcast_to(np.asarray(center, dtype=float), (n, 3)),
+        np.broadcast_to(np.asarray(strength, dtype=float), (n,)),
+        np.broadcast_to(np.asarray(progress, dtype=float), (n,)),
+        out,
+    )
+    return out
+
+
+def microburst_wind_at(x, z, center, strength, progress):
+    """microburst_wind at a single point in plain floats; returns (wx, wy, wz)"""
+    rx = x - center[0]
+    rz = z - center[2]
+    norm = math.sqrt(rx * rx + rz * rz)
+    if norm > 1e-3:
+        rx /= norm
+        rz /= norm
+    else:
+        rx = rz = 0.0
+    outflow = strength * 0.5 * progress
+    return outflow * rx, -strength * (1 - progress), outflow * rz
+
+
+# --- Gradient noise ------------------------------------------------------------------
+
+@_LazyJit
+def _gradient_noise_loop(coords, perm, grad_x, grad_y, grad_z, out):
+    dots = np.empty(8)
+    for i in range(coords.shape[1]):
+        x = coords[0, i]
+        y = coords[1, i]
+        z = coords[2, i]
+        lx = math.floor(x)
+        ly = math.floor(y)
+        lz = math.floor(z)
+        fx = x - lx
+        fy = y - ly
+        fz = z - lz
+        cx = int(lx) & 255
+        cy = int(ly) & 255
+        cz = int(lz) & 255
+        # Corners in (x, y, z) = (2, 2, 2) order, as in GradientNoise3D
+        for k in range(8):
+            ox = k >> 2
+            oy = (k >> 1) & 1
+            oz = k & 1
+            h = perm[perm[perm[cx + ox] + cy + oy] + cz + oz]
+            dots[k] = grad_x[h] * (fx - ox) + grad_y[h] * (fy - oy) + grad_z[h] * (fz - oz)
+        u = fx * fx * fx * (fx * (fx * 6 - 15) + 10)
+        v = fy * fy * fy * (fy * (fy * 6 - 15) + 10)
+        w = fz * fz * fz * (fz * (fz * 6 - 15) + 10)
+        x00 = dots[0] + u * (dots[4] - dots[0])
+        x01 = dots[1] + u * (dots[5] - dots[1])
+        x10 = dots[2] + u * (dots[6] - dots[2])
+        x11 = dots[3] + u * (dots[7] - dots[3])
+        y0 = x00 + v * (x10 - x00)
+        y1 = x01 + v * (x11 - x01)
+        out[i] = y0 + w * (y1 - y0)
+
+
+def gradient_noise_loop(coords, perm, grad_x, grad_y, grad_z):
+    """Compiled GradientNoise3D evaluation for (3, M) coordinates"""
+    out = np.empty(coords.shape[1])
+    _gradient_noise_loop(np.ascontiguousarray(coords), perm, grad_x, grad_y, grad_z, out)
+    return out
+
+
+# --- Drone control -------------------------------------------------------------------
+
+def _drone_accelerations_numpy(errors, velocities, wind_forces, masses, max_velocity, max_acceleration):
+    # Desired velocity proportional to error, limited to max_velocity
+    desired = errors * 2.0
+    speed = np.sqrt(np.sum(desired ** 2, axis=1))
+    too_fast = speed > max_velocity
+    desired[too_fast] *= (max_velocity / speed[too_fast])[:, None]
+
+    # Velocity controller plus wind
+    control = (desired - velocities) * 5.0
+    total = control + wind_forces / masses[:, None]
+
+    # Limit total acceleration
+    acc = np.sqrt(np.sum(total ** 2, axis=1))
+    too_strong = acc > max_acceleration
+    total[too_strong] *= (max_acceleration / acc[too_strong])[:, None]
+    return control, total
+
+
+@_LazyJit
+def _drone_accelerations_loop(errors, velocities, wind_forces, masses, max_velocity, max_acceleration,
+                              control, total):
+    desired = np.empty(3)
+    for i in range(errors.shape[0]):
+        for k in range(3):
+            desired[k] = errors[i, k] * 2.0
+        speed = math.sqrt(desired[0] * desired[0] + desired[1] * desired[1] + desired[2] * desired[2])
+        if speed > max_velocity:
+            scale = max_velocity / speed
+            for k in range(3):
+                desired[k] *= scale
+        for k in range(3):
+            control[i, k] = (desired[k] - velocities[i, k]) * 5.0
+            total[i, k] = control[i, k] + wind_forces[i, k] / masses[i]
+        acc = math.sqrt(total[i, 0] * total[i, 0] + total[i, 1] * total[i, 1] + total[i, 2] * total[i, 2])
+        if acc > max_acceleration:
+            scale = max_acceleration / acc
+            for k in range(3):
+                total[i, k] *= scale
+
+
+def drone_accelerations(errors, velocities, wind_forces, masses, max_velocity, max_acceleration):
+    """Waypoint control law for (N, 3) drones
+
+    Returns (control, total): the velocity controller's acceleration and the
+    total acceleration (control plus wind) after the max_acceleration clamp.
+    """
+    if BACKEND == "numpy":
+        return _drone_accelerations_numpy(errors, velocities, wind_forces, masses, max_velocity, max_acceleration)
+    control = np.empty_like(errors)
+    total = np.empty_like(errors)
+    _drone_accelerations_loop(errors, velocities, wind_forces, masses,
+                              float(max_velocity), float(max_acceleration), control, total)
+    return control, total
+
+
+# --- Grid path search ----------------------------------------------------------------
+
+SQRT2 = math.sqrt(2.0)
+SQRT3 = math.sqrt(3.0)
+
+
+def _astar_loop(cost, wind, shape, start, goal, headwind_weight, cruise_speed, heuristic_weight, parent):
+    nx, ny, nz = shape[0], shape[1], shape[2]
+    g = np.full(nx * ny * nz, np.inf)
+    closed = np.zeros(nx * ny * nz, dtype=np.bool_)
+    gx, gy, gz = goal // (ny * nz), (goal // nz) % ny, goal % nz
+    g[start] = 0.0
+    heap = [(0.0, start)]
+    while heap:
+        _, node = heapq.heappop(heap)
+        if closed[node]:
+            continue
+        if node == goal:
+            return True
+        closed[node] = True
+        x, y, z = node // (ny * nz), (node // nz) % ny, node % nz
+        for dx in range(-1, 2):
+            for dy in range(-1, 2):
+                for dz in range(-1, 2):
+                    if dx == 0 and dy == 0 and dz == 0:
+                        continue
+                    px, py, pz = x + dx, y + dy, z + dz
+                    if px < 0 or py < 0 or pz < 0 or px >= nx or py >= ny or pz >= nz:
+                        continue
+                    neighbor = (px * ny + py) * nz + pz
+                    if closed[neighbor] or cost[neighbor] == np.inf:
+                        continue
+                    length = math.sqrt(dx * dx + dy * dy + dz * dz)
+                    # Wind component against the direction of travel
+                    headwind = -(wind[neighbor, 0] * dx + wind[neighbor, 1] * dy + wind[neighbor, 2] * dz) / length
+                    tentative = g[node] + length * (cost[neighbor] + headwind_weight * max(headwind, 0.0) / cruise_speed)
+                    if tentative < g[neighbor]:
+                        g[neighbor] = tentative
+                        parent[neighbor] = node
+                        # Every cell costs at least 1 per cell length, so the shortest
+                        # 26-connected grid distance (3D octile) is admissible
+                        a, b, c = abs(px - gx), abs(py - gy), abs(pz - gz)
+                        if a < b:
+                            a, b = b, a
+                        if b < c:
+                            b, c = c, b
+                        if a < b:
+                            a, b = b, a
+                        h = (SQRT3 - SQRT2) * c + (SQRT2 - 1.0) * b + a
+                        heapq.heappush(heap, (tentative + heuristic_weight * h, neighbor))
+    return False
+
+
+_astar_jit = _LazyJit(_astar_loop)
+
+
+# The last grid padded for _astar_wavefront: (cost, wind, padded cost, padded wind)
+_padded_grid = None
+
+
+def _pad_grid(cost, wind):
+    """Padded flat copies of a planning grid, reused while the same arrays are passed in
+
+    Grids are treated as read-only: the planner builds new arrays when zones
+    change. The wind components are stored as three contiguous rows.
+    """
+    global _padded_grid
+    if _padded_grid is None or _padded_grid[0] is not cost or _padded_grid[1] is not wind:
+        padded_cost = np.pad(cost, 1, constant_values=np.inf).reshape(-1)
+        padded_wind = np.pad(np.moveaxis(wind, -1, 0), ((0, 0), (1, 1), (1, 1), (1, 1))).reshape(3, -1)
+        _padded_grid = (cost, wind, padded_cost, padded_wind)
+    return _padded_grid[2], _padded_grid[3]
+
+
+def _astar_wavefront(cost, wind, start, goal, headwind_weight, cruise_speed, parent, band=1.0):
+    # A* with whole f-bands expanded at once in NumPy, for when Numba is not
+    # available: one cell at a time in Python is ~50x slower than the JIT loop.
+    # Open cells are bucketed by f in `band` wide bands; the lowest band is
+    # relaxed over all 26 neighbours in one pass and cells whose g improves
+    # are reopened, so once the goal's g is below every open band the path is
+    # optimal. The grid is padded with a blocked border so neighbours need no
+    # bounds checks.
+    nx, ny, nz = cost.shape
+    sy, sz = ny + 2, nz + 2
+    padded_cost, (wind_x, wind_y, wind_z) = _pad_grid(cost, wind)
+    scale = headwind_weight / cruise_speed
+    steps = np.array([(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1) if dx or dy or dz])
+    offsets = (steps[:, 0] * sy + steps[:, 1]) * sz + steps[:, 2]
+    lengths = np.sqrt(np.sum(steps * steps, axis=1))
+    ux, uy, uz = (steps[:, axis] / lengths for axis in range(3))
+    to_padded = lambda index: ((index // (ny * nz) + 1) * sy + (index // nz) % ny + 1) * sz + index % nz + 1
+    start, goal = to_padded(start), to_padded(goal)
+    gx, gy, gz = goal // (sy * sz), (goal // sz) % sy, goal % sz
+
+    def heuristic(cells):
+        a, b, c = np.abs(cells // (sy * sz) - gx), np.abs((cells // sz) % sy - gy), np.abs(cells % sz - gz)
+        high, low = np.maximum(np.maximum(a, b), c), np.minimum(np.minimum(a, b), c)
+        return (SQRT3 - SQRT2) * low + (SQRT2 - 1.0) * (a + b + c - high - low) + high
+
+    g = np.full(len(padded_cost), np.inf)
+    g[start] = 0.0
+    parents = np.full(len(padded_cost), -1, dtype=np.int64)
+    # band index -> [(cells, g when pushed)], and a heap of the band indices
+    bands = {0: [(np.array([start]), np.zeros(1))]}
+    open_bands = [0]
+    while open_bands:
+        band_index = heapq.heappop(open_bands)
+        if g[goal] <= band_index * band:
+            break
+        entries = bands.pop(band_index)
+        cells = np.concatenate([entry[0] for entry in entries])
+        pushed = np.concatenate([entry[1] for entry in entries])
+        # Entries superseded by a later improvement are stale
+        cells = np.unique(cells[pushed == g[cells]])
+        if not len(cells):
+            continue
+        neighbors = cells[:, None] + offsets
+        # Wind component against the direction of travel
+        headwind = -(wind_x[neighbors] * ux + wind_y[neighbors] * uy + wind_z[neighbors] * uz)
+        tentative = (g[cells][:, None] + lengths * (padded_cost[neighbors] + scale * np.maximum(headwind, 0.0))).ravel()
+        neighbors = neighbors.ravel()
+        better = np.flatnonzero(tentative < g[neighbors])
+        neighbors, tentative = neighbors[better], tentative[better]
+        np.minimum.at(g, neighbors, tentative)
+        won = tentative == g[neighbors]
+        neighbors, tentative = neighbors[won], tentative[won]
+        if not len(neighbors):
+            continue
+        parents[neighbors] = cells[better[won] // len(offsets)]
+        indices = ((tentative + heuristic(neighbors)) / band).astype(np.int64)
+        order = np.argsort(indices, kind="stable")
+        indices, neighbors, tentative = indices[order], neighbors[order], tentative[order]
+        splits = np.flatnonzero(np.diff(indices)) + 1
+        for index, group, group_g in zip(indices[np.r_[0, splits]].tolist(), np.split(neighbors, splits),
+                                         np.split(tentative, splits)):
+            if index in bands:
+                bands[index].append((group, group_g))
+            else:
+                bands[index] = [(group, group_g)]
+                heapq.heappush(open_bands, index)
+    if g[goal] == np.inf:
+        return False
+    # Back to unpadded flat indices for astar_grid's path walk
+    reached = np.flatnonzero(parents >= 0)
+    unpad = lambda index: ((index // (sy * sz) - 1) * ny + (index // sz) % sy - 1) * nz + index % sz - 1
+    parent[unpad(reached)] = unpad(parents[reached])
+    return True
+
+
+def astar_grid(cost, wind, start, goal, headwind_weight, cruise_speed, heuristic_weight=1.0):
+    """26-connected A* over a 3D cost grid; returns the flat cell indices start..goal or None
+
+    cost: (nx, ny, nz) traversal cost per cell length (>= 1, inf where blocked);
+    wind: (nx, ny, nz, 3) mean wind, whose headwind part adds
+    headwind_weight * headwind / cruise_speed per cell length. A
+    heuristic_weight above 1 (weighted A*) expands far fewer cells for a path
+    at most that factor costlier than the optimum. Without Numba the search
+    expands f-bands in NumPy instead and always returns an optimal path, so
+    heuristic_weight only applies to the Numba search.
+    """
+    parent = np.full(cost.size, -1, dtype=np.int64)
+    if BACKEND == "numba":
+        found = _astar_jit(cost.reshape(-1), wind.reshape(-1, 3), np.array(cost.shape, dtype=np.int64),
+                           np.int64(start), np.int64(goal), float(headwind_weight), float(cruise_speed),
+                           float(heuristic_weight), parent)
+    else:
+        found = _astar_wavefront(cost, wind, int(start), int(goal), float(headwind_weight), float(cruise_speed), parent)
+    if not found:
+        return None
+    path = [int(goal)]
+    while path[-1] != start:
+        path.append(int(parent[path[-1]]))
+    return path[::-1]
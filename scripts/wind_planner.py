@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Wind-Aware Planner
+Plans around headwinds, turbulence, tornadoes and microbursts on a cached 3D
+cost grid and emits intermediate waypoints for DroneController
+"""
+
+import time
+
+import numpy as np
+
+try:
+    from scripts.wind_kernels import astar_grid
+except ImportError:
+    from wind_kernels import astar_grid
+
+
+class WindAwarePlanner:
+    """A* over a cost grid built from the wind zones' parameters
+
+    The grid holds each cell's mean wind (log profile along the wind
+    direction, with the zone falloff) and a traversal cost per cell length:
+    1 plus `risk_weight` times the zero-mean wind there (turbulence, Dryden
+    sigma, noise and gust amplitudes, in units of `cruise_speed`). Cells
+    within `exclusion_margin` of an enabled tornado core or microburst, and
+    cells below `min_altitude`, are blocked. Edges also pay `headwind_weight` times the headwind, again in
+    units of `cruise_speed`. `heuristic_weight` > 1 runs weighted A*: much
+    faster, for paths at most that factor costlier than optimal.
+
+    The grid depends on zone parameters only. It is built on the first plan
+    and rebuilt only after a zone reports a parameter change, or zones are
+    added or removed. Paths are smoothed to straight segments wherever the
+    segment is no costlier than the grid path it replaces.
+    """
+
+    def __init__(self, controller, bounds_min=(-100.0, 0.0, -100.0), bounds_max=(100.0, 50.0, 100.0),
+                 resolution=1.0, headwind_weight=1.0, risk_weight=0.5, cruise_speed=5.0, exclusion_margin=2.0,
+                 min_altitude=2.0, heuristic_weight=1.25):
+        self.controller = controller
+        self.origin = np.asarray(bounds_min, dtype=float)
+        self.resolution = float(resolution)
+        self.shape = tuple(int(n) for n in np.floor((np.asarray(bounds_max) - self.origin) / self.resolution) + 1)
+        self.headwind_weight = headwind_weight
+        self.risk_weight = risk_weight
+        self.cruise_speed = cruise_speed
+        self.exclusion_margin = exclusion_margin
+        self.min_altitude = min_altitude
+        self.heuristic_weight = heuristic_weight
+        self.cost = None
+        self.wind = None
+        self.builds = 0
+        self._zones = {}
+
+    def _on_zone_changed(self, zone, field_name):
+        self.cost = None
+
+    def invalidate(self):
+        """Force the cost grid to be rebuilt on the next plan"""
+        self.cost = None
+
+    def _watch_zones(self):
+        """Observe the controller's current zones; drop the grid if the zone set changed"""
+        zones = self.controller.wind_zones
+        if all(self._zones.get(name) is zone for name, zone in zones.items()) and len(zones) == len(self._zones):
+            return
+        for zone in self._zones.values():
+            zone.remove_observer(self._on_zone_changed)
+        self._zones = dict(zones)
+        for zone in self._zones.values():
+            zone.add_observer(self._on_zone_changed)
+        self.cost = None
+
+    def cost_map(self):
+        """(cost, wind) grids, rebuilt only when zone parameters changed"""
+        self._watch_zones()
+        if self.cost is None:
+            self._build()
+        return self.cost, self.wind
+
+    def _build(self):
+        start = time.perf_counter()
+        shape = np.array(self.shape)
+        wind = np.zeros(self.shape + (3,))
+        risk = np.zeros(self.shape)
+        blocked = np.zeros(self.shape, dtype=bool)
+        for zone in self._zones.values():
+            # Only the zone's bounding box of cells can be affected
+            lo = np.clip(np.ceil((zone.position - zone.size - self.origin) / self.resolution), 0, shape).astype(int)
+            hi = np.clip(np.floor((zone.position + zone.size - self.origin) / self.resolution) + 1, 0, shape).astype(int)
+            if np.any(hi <= lo):
+                continue
+            axes = [self.origin[axis] + np.arange(lo[axis], hi[axis]) * self.resolution for axis in range(3)]
+            points = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1)
+            box = tuple(slice(lo[axis], hi[axis]) for axis in range(3))
+
+            distance = np.linalg.norm(points - zone.position, axis=-1)
+            falloff = np.maximum(0.0, 1.0 - (distance / zone.size) ** 2)
+            # Mean wind: the logarithmic profile, as in WindZone.get_wind_vectors
+            z = np.maximum(0.1, points[..., 1])
+            log_profile = zone.wind_speed * np.log(z / 0.1) / np.log(10.0 / 0.1)
+            wind[box] += (log_profile * falloff)[..., None] * zone.wind_direction
+            # Zero-mean terms count as risk
+            unsteady = (zone.turbulence_intensity * zone.wind_speed + zone.dryden_sigma
+                        + zone.noise_amplitude + zone.wind_gust_amplitude)
+            risk[box] += unsteady * falloff / self.cruise_speed
+
+            inside = falloff > 0
+            if zone.tornado_enabled:
+                core = np.hypot(points[..., 0] - zone.tornado_center[0], points[..., 2] - zone.tornado_center[2])
+                blocked[box] |= inside & (core < zone.tornado_radius + self.exclusion_margin)
+            if zone.microburst_enabled:
+                burst = np.linalg.norm(points - zone.microburst_center, axis=-1)
+                blocked[box] |= inside & (burst < zone.microburst_radius + self.exclusion_margin)
+
+        altitude = self.origin[1] + np.arange(self.shape[1]) * self.resolution
+        blocked[:, altitude < self.min_altitude, :] = True
+        cost = 1.0 + self.risk_weight * risk
+        cost[blocked] = np.inf
+        self.cost, self.wind = cost, wind
+        self.builds += 1
+        print(f"🗺️ Built {self.shape} wind cost map in {time.perf_counter() - start:.2f}s")
+
+    def _cell(self, point):
+        cell = np.round((np.asarray(point, dtype=float) - self.origin) / self.resolution).astype(int)
+        if np.any(cell < 0) or np.any(cell >= self.shape):
+            raise ValueError(f"Waypoint {point} is outside the planning bounds")
+        return cell
+
+    def _segment_cost(self, a, b):
+        """Cost of flying straight between cells a and b, sampled at half-cell steps"""
+        delta = b - a
+        length = float(np.linalg.norm(delta))
+        if length == 0.0:
+            return 0.0
+        samples = np.linspace(0.0, 1.0, int(np.ceil(2 * length)) + 1)[1:]
+        cells = np.round(a + samples[:, None] * delta).astype(int)
+        cost = self.cost[cells[:, 0], cells[:, 1], cells[:, 2]]
+        if np.isinf(cost).any():
+            return np.inf
+        headwind = -(self.wind[cells[:, 0], cells[:, 1], cells[:, 2]] @ (delta / length))
+        per_length = cost + self.headwind_weight * np.maximum(headwind, 0.0) / self.cruise_speed
+        return length * float(per_length.mean())
+
+    def _smooth(self, cells):
+        """Greedy line-of-sight shortcutting over the grid path"""
+        edge_costs = [self._segment_cost(a, b) for a, b in zip(cells[:-1], cells[1:])]
+        cumulative = np.concatenate([[0.0], np.cumsum(edge_costs)])
+        kept = [0]
+        anchor = 0
+        while anchor < len(cells) - 1:
+            reach = anchor + 1
+            for candidate in range(len(cells) - 1, anchor + 1, -1):
+                budget = cumulative[candidate] - cumulative[anchor]
+                if self._segment_cost(cells[anchor], cells[candidate]) <= budget * (1 + 1e-9):
+                    reach = candidate
+                    break
+            kept.append(reach)
+            anchor = reach
+        return [cells[i] for i in kept]
+
+    def plan_segment(self, start, goal):
+        """Waypoints from start to goal (both included) avoiding costly and blocked cells"""
+        cost, wind = self.cost_map()
+        a, b = self._cell(start), self._cell(goal)
+        if np.isinf(cost[tuple(b)]):
+            raise ValueError(f"Waypoint {goal} lies in an excluded tornado or microburst region")
+        flat = astar_grid(cost, wind, np.ravel_multi_index(a, self.shape), np.ravel_multi_index(b, self.shape),
+                          self.headwind_weight, self.cruise_speed, self.heuristic_weight)
+        if flat is None:
+            raise ValueError(f"No path from {start} to {goal} within the planning bounds")
+        cells = np.stack(np.unravel_index(np.asarray(flat), self.shape), axis=1)
+        smoothed = self._smooth(cells)
+        points = [self.origin + cell * self.resolution for cell in smoothed[1:-1]]
+        return [np.asarray(start, dtype=float)] + points + [np.asarray(goal, dtype=float)]
+
+    def plan(self, waypoints):
+        """Plan through every user waypoint in order; returns the full waypoint list"""
+        path = [np.asarray(waypoints[0], dtype=float)]
+        for start, goal in zip(waypoints[:-1], waypoints[1:]):
+            path.extend(self.plan_segment(start, goal)[1:])
+        return path
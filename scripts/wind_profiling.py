@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Wind Profiling
+Opt-in per-component timing for the wind pipeline and its USD writes
+"""
+
+import json
+import math
+import os
+import time
+
+# Histogram bins are powers of two starting at 100 ns (the last bin is open-ended)
+HISTOGRAM_BASE = 1e-7
+HISTOGRAM_BINS = 28
+
+
+class ComponentStats:
+    """Call count, cumulative time and a log2 duration histogram for one key"""
+
+    __slots__ = ("calls", "total", "max", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * HISTOGRAM_BINS
+
+    def add(self, seconds):
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        index = int(math.log2(seconds / HISTOGRAM_BASE)) if seconds > HISTOGRAM_BASE else 0
+        self.histogram[min(index, HISTOGRAM_BINS - 1)] += 1
+
+    def merge(self, other):
+        self.calls += other.calls
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def percentile(self, q):
+        """Approximate percentile (upper edge of the histogram bin holding it)"""
+        if not self.calls:
+            return 0.0
+        rank = q / 100.0 * self.calls
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank and count:
+                return min(HISTOGRAM_BASE * 2 ** (index + 1), self.max)
+        return self.max
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'total_s': self.total,
+            'mean_s': self.total / self.calls if self.calls else 0.0,
+            'max_s': self.max,
+            'p50_s': self.percentile(50),
+            'p99_s': self.percentile(99),
+            'histogram': list(self.histogram),
+        }
+
+
+class WindProfiler:
+    """Collects timings keyed by (component, zone name)
+
+    Instrumented code checks `enabled` once per call and only then reads the
+    clock, so a disabled profiler costs one attribute lookup per call site:
+
+        profiling = PROFILER.enabled
+        if profiling:
+            t0 = time.perf_counter()
+        ...
+        if profiling:
+            t0 = PROFILER.lap("tornado", zone_name, t0)
+
+    Step components are timed per zone. Queries evaluate every zone's
+    (point, zone) pairs in one vectorized pass (WindZoneTable.evaluate), so
+    their components, like the controller step and query totals, are
+    recorded with zone None: one sample covers all zones in the batch and
+    there is no per-zone split of query time.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stats = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.stats = {}
+
+    def record(self, component, zone, seconds):
+        """Add one timing sample"""
+        key = (component, zone)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = ComponentStats()
+        stats.add(seconds)
+
+    def lap(self, component, zone, start):
+        """Record the time since `start` and return the current clock for the next lap"""
+        now = time.perf_counter()
+        self.record(component, zone, now - start)
+        return now
+
+    def get_stats(self, component=None, zone=None, by_component=False):
+        """Query collected stats as {key: dict}, optionally filtered or summed over zones"""
+        selected = {
+            key: stats for key, stats in self.stats.items()
+            if (component is None or key[0] == component) and (zone is None or key[1] == zone)
+        }
+        if by_component:
+            merged = {}
+            for (name, _), stats in selected.items():
+                merged.setdefault(name, ComponentStats()).merge(stats)
+            return {name: stats.as_dict() for name, stats in merged.items()}
+        return {key: stats.as_dict() for key, stats in selected.items()}
+
+    def report(self, by_component=True):
+        """Format a table sorted by cumulative time"""
+        stats = self.get_stats(by_component=by_component)
+        rows = sorted(stats.items(), key=lambda item: item[1]['total_s'], reverse=True)
+        lines = [f"{'component':<36} {'calls':>9} {'total ms':>10} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}"]
+        for key, row in rows:
+            name = key if by_component else f"{key[0]} [{'all zones' if key[1] is None else key[1]}]"
+            lines.append(
+                f"{name:<36} {row['calls']:>9} {row['total_s'] * 1e3:>10.2f} {row['mean_s'] * 1e6:>9.2f} "
+                f"{row['p50_s'] * 1e6:>9.2f} {row['p99_s'] * 1e6:>9.2f}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """Write per-zone and per-component stats as JSON"""
+        report = {
+            'components': self.get_stats(by_component=True),
+            'zones': [
+                {'component': component, 'zone': zone, **row}
+                for (component, zone), row in self.get_stats().items()
+            ],
+        }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+# Shared profiler; set ZEPHYRSIM_PROFILE=1 to enable it at startup
+PROFILER = WindProfiler(enabled=bool(os.environ.get("ZEPHYRSIM_PROFILE")))
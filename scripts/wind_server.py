@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Wind Server
+One process owns the wind field and serves batched wind queries to many
+simulation processes over a Unix socket, stepping the field once per frame
+"""
+
+import argparse
+import math
+import os
+import selectors
+import socket
+import struct
+import time
+
+import numpy as np
+
+DEFAULT_SOCKET_PATH = "/tmp/zephyrsim_wind.sock"
+
+OP_QUERY = 1   # payload: N positions; reply: N wind vectors
+OP_STEP = 2    # payload: trigger positions; reply once every client reached the frame
+
+# Request: op, point count, dt. Reply: point count, server wind time. Points follow as float64 (N, 3).
+_REQUEST = struct.Struct("<BId")
+_REPLY = struct.Struct("<Id")
+# A reply with this count rejects the request: a message length and UTF-8 message follow,
+# and the server closes the connection
+REPLY_ERROR = 0xFFFFFFFF
+_MESSAGE = struct.Struct("<I")
+
+# Largest point count accepted in one request
+MAX_POINTS = 1 << 20
+
+
+def _recv_exact(sock, size):
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    while view:
+        received = sock.recv_into(view)
+        if not received:
+            raise ConnectionError("wind server closed the connection")
+        view = view[received:]
+    return bytes(buffer)
+
+
+class _Connection:
+    """Server-side state of one client"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = bytearray()
+        self.queries = []          # position arrays waiting for this round's evaluation
+        self.step = None           # (dt, trigger positions) while waiting at the frame barrier
+
+    def parse(self):
+        """Split complete requests off the receive buffer; ValueError for a malformed one"""
+        while len(self.buffer) >= _REQUEST.size:
+            op, count, dt = _REQUEST.unpack_from(self.buffer)
+            if op not in (OP_QUERY, OP_STEP):
+                raise ValueError(f"Unknown wind server op: {op}")
+            if count > MAX_POINTS:
+                raise ValueError(f"Request of {count} points exceeds the limit of {MAX_POINTS}")
+            if op == OP_STEP and not (math.isfinite(dt) and dt > 0):
+                raise ValueError(f"Step dt must be positive and finite, got {dt}")
+            end = _REQUEST.size + count * 24
+            if len(self.buffer) < end:
+                return
+            points = np.frombuffer(bytes(self.buffer[_REQUEST.size:end]), dtype=np.float64).reshape(-1, 3)
+            del self.buffer[:end]
+            if op == OP_QUERY:
+                self.queries.append(points)
+            else:
+                self.step = (dt, points)
+
+    def reply(self, wind_time, vectors=None):
+        count = 0 if vectors is None else len(vectors)
+        payload = b"" if vectors is None else np.ascontiguousarray(vectors, dtype=np.float64).tobytes()
+        self.sock.sendall(_REPLY.pack(count, wind_time) + payload)
+
+    def reject(self, wind_time, message):
+        encoded = message.encode("utf-8")
+        self.sock.sendall(_REPLY.pack(REPLY_ERROR, wind_time) + _MESSAGE.pack(len(encoded)) + encoded)
+
+
+class WindServer:
+    """Serves a WindController to many clients
+
+    Each select() round reads every client's pending requests and answers all
+    of their queries with a single vectorized get_wind_vectors call. Steps
+    are a barrier: a client's step request is answered once every connected
+    client has asked to step, and the field advances once for all of them,
+    with every client's positions as event triggers. Queries between steps
+    all see the same frozen frame, so coalescing them is exact.
+
+    The first step fixes the frame dt; a step with any other dt is rejected.
+    Clients that have not asked to step `step_timeout` seconds after the
+    first step request of a frame are dropped so the others can go on (None
+    waits forever), so every client must step each frame. A malformed
+    request is rejected with an error reply and closes only that
+    connection, as does a socket error on one client.
+    """
+
+    def __init__(self, controller, path=DEFAULT_SOCKET_PATH, step_timeout=5.0):
+        self.controller = controller
+        self.path = path
+        self.step_timeout = step_timeout
+        self.frame_dt = None
+        self.barrier_start = None  # monotonic time of the current frame's first step request
+        self.selector = selectors.DefaultSelector()
+        self.connections = {}
+        self.frames = 0
+        self.queries = 0
+        self.batches = 0
+        self.listener = None
+
+    def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.path)
+        self.listener.listen()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+
+    def close(self):
+        for connection in list(self.connections.values()):
+            self._drop(connection)
+        if self.listener:
+            self.selector.unregister(self.listener)
+            self.listener.close()
+            self.listener = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def serve_forever(self):
+        if self.listener is None:
+            self.start()
+        try:
+            while True:
+                self.serve_once(self._barrier_wait())
+        finally:
+            self.close()
+
+    def serve_once(self, timeout=None):
+        """Read ready clients, answer their queries in one batch and run the step barrier"""
+        for key, _ in self.selector.select(timeout):
+            if key.fileobj is self.listener:
+                sock, _ = self.listener.accept()
+                self.connections[sock.fileno()] = connection = _Connection(sock)
+                self.selector.register(sock, selectors.EVENT_READ, connection)
+                continue
+            connection = key.data
+            try:
+                data = connection.sock.recv(1 << 20)
+            except OSError:
+                data = b""
+            if not data:
+                self._drop(connection)
+                continue
+            connection.buffer += data
+            try:
+                connection.parse()
+            except ValueError as e:
+                self._reject(connection, str(e))
+                continue
+            self._check_step(connection)
+        self._answer_queries()
+        self._step_if_ready()
+
+    def _barrier_wait(self):
+        """Seconds select() may block before the step barrier times out (None: no deadline)"""
+        if self.step_timeout is None or self.barrier_start is None:
+            return None
+        return max(0.0, self.barrier_start + self.step_timeout - time.monotonic())
+
+    def _check_step(self, connection):
+        """Reject a step with the wrong dt and start the barrier clock on a frame's first step"""
+        if connection.step is None:
+            return
+        dt = connection.step[0]
+        if self.frame_dt is None:
+            self.frame_dt = dt
+        elif not math.isclose(dt, self.frame_dt, rel_tol=1e-9):
+            self._reject(connection, f"Step dt {dt} does not match the server's frame dt {self.frame_dt}")
+            return
+        if self.barrier_start is None:
+            self.barrier_start = time.monotonic()
+
+    def _reject(self, connection, message):
+        """Send an error reply and close just this connection"""
+        print(f"⚠️ Dropping wind client: {message}")
+        try:
+            connection.reject(self.controller.time, message)
+        except OSError:
+            pass
+        self._drop(connection)
+
+    def _drop(self, connection):
+        if self.connections.pop(connection.sock.fileno(), None) is None:
+            return
+        self.selector.unregister(connection.sock)
+        connection.sock.close()
+
+    def _answer_queries(self):
+        waiting = [c for c in self.connections.values() if c.queries]
+        if not waiting:
+            return
+        batches = [points for c in waiting for points in c.queries]
+        wind = self.controller.get_wind_vectors(np.concatenate(batches))
+        self.queries += len(batches)
+        self.batches += 1
+        offset = 0
+        for connection in waiting:
+            replies = []
+            for points in connection.queries:
+                replies.append(wind[offset:offset + len(points)])
+                offset += len(points)
+            connection.queries = []
+            try:
+                for vectors in replies:
+                    connection.reply(self.controller.time, vectors)
+            except OSError:
+                self._drop(connection)
+
+    def _step_if_ready(self):
+        connections = list(self.connections.values())
+        stragglers = [c for c in connections if c.step is None]
+        if stragglers and self._barrier_wait() == 0.0:
+            for connection in stragglers:
+                self._reject(connection, f"No step within {self.step_timeout}s of the other clients")
+            connections = [c for c in connections if c.step is not None]
+            stragglers = []
+        if not connections or stragglers:
+            if not connections:
+                self.barrier_start = None
+            return
+        self.barrier_start = None
+        dt = self.frame_dt
+        triggers = np.concatenate([c.step[1] for c in connections])
+        self.controller.step(dt, triggers if len(triggers) else None)
+        self.frames += 1
+        for connection in connections:
+            connection.step = None
+            try:
+                connection.reply(self.controller.time)
+            except OSError:
+                self._drop(connection)
+
+
+class WindClient:
+    """Drop-in for the WindController calls a DroneController makes, answered by a WindServer
+
+    Zones live in the server, so visual updates are no-ops here.
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET_PATH, connect_timeout=5.0):
+        self.path = path
+        self.time = 0.0
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        deadline = time.monotonic() + connect_timeout
+        while True:
+            try:
+                self.sock.connect(path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    def _request(self, op, points, dt=0.0):
+        points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 3)
+        self.sock.sendall(_REQUEST.pack(op, len(points), dt) + points.tobytes())
+        count, self.time = _REPLY.unpack(_recv_exact(self.sock, _REPLY.size))
+        if count == REPLY_ERROR:
+            length, = _MESSAGE.unpack(_recv_exact(self.sock, _MESSAGE.size))
+            message = _recv_exact(self.sock, length).decode("utf-8")
+            raise ConnectionError(f"wind server rejected the request: {message}")
+        if not count:
+            return None
+        return np.frombuffer(_recv_exact(self.sock, count * 24), dtype=np.float64).reshape(count, 3)
+
+    def get_wind_at_position(self, position):
+        return self.get_wind_vectors(position)[0]
+
+    def get_wind_vectors(self, positions):
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        if not len(positions):
+            return np.zeros((0, 3))
+        return self._request(OP_QUERY, positions)
+
+    def step(self, dt=0.016, positions=None):
+        """Wait until every client reached this frame; the server then steps the field once"""
+        self._request(OP_STEP, np.zeros((0, 3)) if positions is None else positions, dt)
+
+    def update(self):
+        pass
+
+    def prepare_visuals(self):
+        pass
+
+    def write_visuals(self):
+        pass
+
+    def close(self):
+        self.sock.close()
+
+
+def build_controller(seed=None, preset="moderate"):
+    """The wind field fly_to_waypoints builds locally: its default zones, a preset and tuning"""
+    try:
+        from scripts.fly_to_waypoints import DEFAULT_WIND_ZONES
+        from scripts.wind_controller import WindController
+        from scripts.wind_tuning import tune_wind
+    except ImportError:
+        from fly_to_waypoints import DEFAULT_WIND_ZONES
+        from wind_controller import WindController
+        from wind_tuning import tune_wind
+
+    controller = WindController(seed=seed)
+    for zone_name, position, size in DEFAULT_WIND_ZONES:
+        controller.add_wind_zone(zone_name, position, size)
+    if preset != "none":
+        controller.create_preset_wind_conditions(preset)
+        tune_wind(controller)
+    return controller
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve one wind field to many simulation processes")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Unix socket path")
+    parser.add_argument("--seed", type=int, default=None, help="wind scenario seed")
+    parser.add_argument("--preset", default="moderate", help="wind preset (or none)")
+    parser.add_argument("--step-timeout", type=float, default=5.0,
+                        help="drop clients that have not stepped this many seconds after the first one (0: wait forever)")
+    args = parser.parse_args(argv)
+
+    server = WindServer(build_controller(args.seed, args.preset), args.socket, args.step_timeout or None)
+    server.start()
+    print(f"🌬️ Wind server listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n🛑 Wind server stopped after {server.frames} frames, "
+              f"{server.queries} queries in {server.batches} batches")
+
+
+if __name__ == "__main__":
+    main()
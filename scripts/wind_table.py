@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Wind Zone Table
+Structure-of-arrays copy of every zone's parameters for single-pass wind queries
+"""
+
+import time
+
+import numpy as np
+
+try:
+    from scripts.dryden_field import frozen_dryden_field
+    from scripts.gradient_noise import gradient_noise
+    from scripts.wind_kernels import microburst_wind, tornado_wind
+    from scripts.wind_profiling import PROFILER
+except ImportError:
+    from dryden_field import frozen_dryden_field
+    from gradient_noise import gradient_noise
+    from wind_kernels import microburst_wind, tornado_wind
+    from wind_profiling import PROFILER
+
+# Zone attribute -> (components, dtype) read by the query path
+PARAMETER_COLUMNS = {
+    'position': (3, float),
+    'size': (1, float),
+    'wind_speed': (1, float),
+    'wind_direction': (3, float),
+    'noise_scale': (1, float),
+    'noise_amplitude': (1, float),
+    'noise_time_speed': (1, float),
+    'noise_seed': (1, np.int64),
+    'dryden_frozen': (1, bool),
+    'dryden_field_seed': (1, np.int64),
+    'dryden_sigma': (1, float),
+    'dryden_L': (1, float),
+    'dryden_V': (1, float),
+    'tornado_enabled': (1, bool),
+    'tornado_center': (3, float),
+    'tornado_radius': (1, float),
+    'tornado_strength': (1, float),
+    'tornado_updraft': (1, float),
+    'microburst_center': (3, float),
+    'microburst_strength': (1, float),
+}
+
+# Per-frame terms copied from each zone after it steps
+TEMPORAL_COLUMNS = {
+    'time': (1, float),
+    'temporal_wind': (3, float),
+    'microburst_progress': (1, float),  # NaN when no microburst is running
+    'active_events': (1, np.int64),
+}
+
+# Fidelity tiers, cheapest first: "mean" is the log profile only, "hazards" adds
+# tornado, microburst and zone events, "full" adds the temporal terms
+# (Dryden, gust front, gusts, turbulence), frozen Dryden and noise
+FIDELITY_TIERS = ("mean", "hazards", "full")
+MEAN, HAZARDS, FULL = range(3)
+
+# Log wind profile constants, as in WindZone.get_wind_vectors
+_Z0 = 0.1
+_LOG_REF = np.log(10.0 / _Z0)
+_NOISE_OFFSETS = np.array([0.0, 100.0, 200.0])
+
+
+def _select(mask):
+    """Pair selector for a component: a plain slice when every pair needs it"""
+    if mask.all():
+        return slice(None)
+    return np.flatnonzero(mask)
+
+
+class WindZoneTable:
+    """Zone parameters as contiguous columns, one row per zone index slot
+
+    Rows are rewritten only for zones marked dirty (added, or a parameter
+    assigned since the last query), and the temporal columns are written
+    once per zone step. evaluate() then computes every (point, zone) pair
+    returned by the index in one broadcast pass, skipping the pairs whose
+    zone has a component disabled.
+    """
+
+    def __init__(self, capacity=16):
+        self.columns = {}
+        for name, (width, dtype) in {**PARAMETER_COLUMNS, **TEMPORAL_COLUMNS}.items():
+            shape = (capacity, width) if width > 1 else (capacity,)
+            self.columns[name] = np.zeros(shape, dtype=dtype)
+        self.columns['microburst_progress'][:] = np.nan
+        self.event_schedulers = {}  # slot -> the zone's WindEventScheduler
+        self.dirty = set()
+
+    def __len__(self):
+        return len(self.columns['size'])
+
+    def mark_dirty(self, zone_name):
+        """Schedule a zone's row to be rewritten before the next query"""
+        self.dirty.add(zone_name)
+
+    def sync(self, zones, slots):
+        """Rewrite the rows of dirty zones; `slots` maps zone name to row"""
+        if not self.dirty:
+            return
+        capacity = len(self)
+        needed = max(slots.values(), default=-1) + 1
+        if needed > capacity:
+            self._grow(max(needed, 2 * capacity))
+        for zone_name in self.dirty:
+            zone = zones.get(zone_name)
+            slot = slots.get(zone_name)
+            if zone is None or slot is None:
+                continue
+            for name in PARAMETER_COLUMNS:
+                self.columns[name][slot] = getattr(zone, name)
+            self.event_schedulers[slot] = zone.events
+            self.write_temporal(slot, zone)
+        self.dirty.clear()
+
+    def write_temporal(self, slot, zone):
+        """Copy a zone's per-frame terms into its row"""
+        columns = self.columns
+        columns['time'][slot] = zone.time
+        columns['temporal_wind'][slot] = zone.temporal_wind
+        progress = zone.microburst_progress
+        columns['microburst_progress'][slot] = np.nan if progress is None else progress
+        columns['active_events'][slot] = zone.events.active_count
+
+    def _grow(self, capacity):
+        for name, column in self.columns.items():
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            if name == 'microburst_progress':
+                grown[:] = np.nan
+            grown[:len(column)] = column
+            self.columns[name] = grown
+
+    def evaluate(self, positions, pair_points, pair_slots, fidelity=FULL):
+        """Sum every zone's wind over (point, slot) pairs into an (N, 3) array
+
+        Pairs must already satisfy the sphere test (ZoneHashGrid.query_pairs).
+        At FULL fidelity this matches WindZone.get_wind_vectors term by term.
+        fidelity: a tier index for every pair, or an array of tier indices
+        per pair.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        if not len(pair_slots):
+            return np.zeros_like(positions)
+        c = self.columns
+        points = positions[pair_points]
+        distance = np.sqrt(np.sum((points - c['position'][pair_slots]) ** 2, axis=1))
+        falloff = np.maximum(0.0, 1.0 - (distance / c['size'][pair_slots]) ** 2)
+        wind = self._pair_wind(points, pair_slots, fidelity)
+        # Distance falloff, then sum the pairs per point
+        wind *= falloff[:, None]
+        count = len(positions)
+        return np.stack([np.bincount(pair_points, weights=wind[:, axis], minlength=count) for axis in range(3)], axis=1)
+
+    def _pair_wind(self, points, slots, tier):
+        """Wind of each (point, slot) pair before falloff, with the components of `tier`
+
+        tier is one tier index or one per pair. The log profile is computed
+        for every pair; each costlier term only for the pairs whose tier
+        includes it, folded into the mask that already skips disabled zones.
+        """
+        profiling = PROFILER.enabled
+        if profiling:
+            t0 = time.perf_counter()
+        c = self.columns
+        full = np.asarray(tier) >= FULL
+        hazards = np.asarray(tier) >= HAZARDS
+
+        # 1. Vertical wind profile (logarithmic)
+        z = np.maximum(0.1, points[:, 1])
+        log_profile = c['wind_speed'][slots] * np.log(z/_Z0) / _LOG_REF
+        wind = log_profile[:, None] * c['wind_direction'][slots]
+        if profiling:
+            t0 = PROFILER.lap("log_profile", None, t0)
+        # 2. Dryden turbulence, gust front, gusts and turbulence (cached by step)
+        if full.any():
+            selected = _select(full)
+            wind[selected] += c['temporal_wind'][slots[selected]]
+        frozen = c['dryden_frozen'][slots] & full
+        if frozen.any():
+            seeds = c['dryden_field_seed'][slots]
+            if (seeds == seeds[0]).all():
+                groups = [_select(frozen)]
+            else:
+                groups = [np.flatnonzero(frozen & (seeds == seed)) for seed in np.unique(seeds[frozen])]
+            for group in groups:
+                group_slots = slots[group]
+                field = frozen_dryden_field(int(c['dryden_field_seed'][group_slots[0]]))
+                mean_wind = c['dryden_V'][group_slots][:, None] * c['wind_direction'][group_slots]
+                wind[group] += field.sample(points[group], c['time'][group_slots][:, None],
+                                            c['dryden_sigma'][group_slots][:, None],
+                                            c['dryden_L'][group_slots][:, None], mean_wind)
+            if profiling:
+                t0 = PROFILER.lap("dryden", None, t0)
+        # 3. Microburst: downdraft, then radial outflow
+        progress = c['microburst_progress'][slots]
+        running = ~np.isnan(progress) & hazards
+        if running.any():
+            active = _select(running)
+            burst_slots = slots[active]
+            wind[active] += microburst_wind(points[active], c['microburst_center'][burst_slots],
+                                            c['microburst_strength'][burst_slots], progress[active])
+            if profiling:
+                t0 = PROFILER.lap("microburst", None, t0)
+        # Zone events, per zone that has any running
+        busy = (c['active_events'][slots] > 0) & hazards
+        if busy.any():
+            for slot in np.unique(slots[busy]).tolist():
+                group = np.flatnonzero(busy & (slots == slot))
+                wind[group] += self.event_schedulers[slot].evaluate(points[group], c['time'][slot])
+            if profiling:
+                t0 = PROFILER.lap("events", None, t0)
+        # 4. Gradient (Perlin) noise, one call per noise seed in use
+        noisy = (c['noise_amplitude'][slots] > 0) & full
+        if noisy.any():
+            seeds = c['noise_seed'][slots]
+            if (seeds == seeds[0]).all():
+                groups = [_select(noisy)]
+            else:
+                groups = [np.flatnonzero(noisy & (seeds == seed)) for seed in np.unique(seeds[noisy])]
+            for group in groups:
+                group_slots = slots[group]
+                scaled = points[group] * c['noise_scale'][group_slots][:, None]
+                t = c['time'][group_slots] * c['noise_time_speed'][group_slots]
+                noise = gradient_noise(int(c['noise_seed'][group_slots[0]]))
+                values = noise(scaled, np.roll(scaled, -1, axis=1), t[:, None] + _NOISE_OFFSETS)
+                wind[group] += c['noise_amplitude'][group_slots][:, None] * values
+            if profiling:
+                t0 = PROFILER.lap("noise", None, t0)
+        # 5. Tornado
+        enabled = c['tornado_enabled'][slots] & hazards
+        if enabled.any():
+            spinning = _select(enabled)
+            tornado_slots = slots[spinning]
+            wind[spinning] += tornado_wind(points[spinning], c['tornado_center'][tornado_slots],
+                                           c['tornado_radius'][tornado_slots], c['tornado_strength'][tornado_slots],
+                                           c['tornado_updraft'][tornado_slots])
+            if profiling:
+                t0 = PROFILER.lap("tornado", None, t0)
+        return wind
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Wind Tapes
+Record the wind field along a reference flight once, then replay it to any
+number of controller variants by interpolation instead of live evaluation
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from scripts.wind_field_cache import trilinear
+except ImportError:
+    from wind_field_cache import trilinear
+
+# Bump when the tape layout changes
+TAPE_FORMAT_VERSION = 1
+
+
+class WindTapeRecorder:
+    """Wraps a WindController and records a tape while a reference flight runs
+
+    Drop it in as a DroneController's wind_controller. After every step it
+    samples the wind on a cube of `(2 * half_cells + 2) ** 3` lattice points
+    (`spacing` apart, aligned to a global lattice) around the first stepped
+    position, and stores each zone's temporal terms. Queries pass through to
+    the live controller, so the reference flight itself is unchanged. Every
+    step must use the same dt, which the player then requires too.
+    """
+
+    def __init__(self, controller, spacing=1.0, half_cells=4):
+        self.controller = controller
+        self.spacing = float(spacing)
+        self.half_cells = int(half_cells)
+        self.size = 2 * self.half_cells + 2
+        axis = np.arange(self.size) * self.spacing
+        self._offsets = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1).reshape(-1, 3)
+        self.zone_names = list(controller.wind_zones)
+        self.dt = None
+        self.times = []
+        self.origins = []
+        self.winds = []
+        self.temporal = []
+
+    @property
+    def time(self):
+        return self.controller.time
+
+    def step(self, dt=None, positions=None):
+        if positions is None:
+            raise ValueError("Recording a wind tape needs the stepped positions to follow")
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        if not len(positions):
+            raise ValueError("Recording a wind tape needs at least one stepped position")
+        dt = self.controller.dt if dt is None else dt
+        if self.times and not math.isclose(dt, self.dt, rel_tol=1e-9):
+            raise ValueError(f"Wind tape frames are {self.dt}s apart, cannot record a step of {dt}")
+        self.controller.step(dt, positions)
+        self.dt = dt
+        center = positions[0]
+        origin = (np.floor(center / self.spacing) - self.half_cells) * self.spacing
+        wind = self.controller.get_wind_vectors(origin + self._offsets)
+        self.times.append(self.controller.time)
+        self.origins.append(origin)
+        self.winds.append(wind.reshape(self.size, self.size, self.size, 3).astype(np.float32))
+        self.temporal.append([self.controller.wind_zones[name].temporal_wind for name in self.zone_names])
+
+    def get_wind_at_position(self, position):
+        return self.controller.get_wind_at_position(position)
+
+    def get_wind_vectors(self, positions):
+        return self.controller.get_wind_vectors(positions)
+
+    def update(self):
+        self.controller.update()
+
+    def snapshot(self):
+        """The live controller's snapshot plus the tape length so far"""
+        return {'controller': self.controller.snapshot(), 'frames': len(self.times), 'dt': self.dt}
+
+    def restore(self, snapshot):
+        """Restore the live controller and drop frames recorded after the snapshot"""
+        self.controller.restore(snapshot['controller'])
+        frames = snapshot['frames']
+        for recorded in (self.times, self.origins, self.winds, self.temporal):
+            del recorded[frames:]
+        self.dt = snapshot['dt']
+
+    def prepare_visuals(self):
+        self.controller.prepare_visuals()
+
+    def write_visuals(self):
+        self.controller.write_visuals()
+
+    def save(self, path):
+        """Write the tape as a compressed .npz"""
+        np.savez_compressed(
+            path,
+            version=TAPE_FORMAT_VERSION,
+            dt=self.dt,
+            spacing=self.spacing,
+            times=np.asarray(self.times),
+            origins=np.asarray(self.origins),
+            winds=np.asarray(self.winds),
+            temporal=np.asarray(self.temporal, dtype=float).reshape(len(self.times), len(self.zone_names), 3),
+            zone_names=np.asarray(self.zone_names),
+        )
+        print(f"📼 Recorded {len(self.times)} frames of wind to {path}")
+
+
+class WindTapePlayer:
+    """Serves wind from a recorded tape in place of a WindController
+
+    Each step() moves to the next recorded frame; queries interpolate that
+    frame's cube trilinearly. Points outside the cube are clamped to its
+    faces and counted in `misses`, so widen half_cells when variants stray
+    far from the reference flight. Past the end of the tape the last frame
+    is held. Frames are one recorded dt apart, so step() rejects any other dt.
+    """
+
+    def __init__(self, path):
+        with np.load(path) as tape:
+            if int(tape["version"]) != TAPE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported wind tape version: {int(tape['version'])}")
+            self.dt = float(tape["dt"])
+            self.spacing = float(tape["spacing"])
+            self.times = tape["times"]
+            self.origins = tape["origins"]
+            self.winds = tape["winds"]
+            self.temporal = tape["temporal"]
+            self.zone_names = tape["zone_names"].tolist()
+        self.size = self.winds.shape[1]
+        self.frame = -1
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def time(self):
+        return float(self.times[self.frame]) if self.frame >= 0 else 0.0
+
+    def rewind(self):
+        """Start again from the first frame, e.g. for the next controller variant"""
+        self.frame = -1
+        self.misses = 0
+
+    def snapshot(self):
+        return {'frame': self.frame, 'misses': self.misses}
+
+    def restore(self, snapshot):
+        self.frame = snapshot['frame']
+        self.misses = snapshot['misses']
+
+    def step(self, dt=None, positions=None):
+        if dt is not None and not math.isclose(dt, self.dt, rel_tol=1e-9):
+            raise ValueError(f"Wind tape was recorded with dt={self.dt}, cannot step it by {dt}")
+        self.frame = min(self.frame + 1, len(self.times) - 1)
+
+    def temporal_terms(self, zone_name):
+        """The zone's recorded position-independent wind at the current frame"""
+        return self.temporal[max(self.frame, 0), self.zone_names.index(zone_name)]
+
+    def get_wind_at_position(self, position):
+        return self.get_wind_vectors(position)[0]
+
+    def get_wind_vectors(self, positions):
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        frame = max(self.frame, 0)
+        cells = (positions - self.origins[frame]) / self.spacing
+        upper = self.size - 1
+        outside = np.any((cells < 0) | (cells > upper), axis=1)
+        self.misses += int(np.count_nonzero(outside))
+        cells = np.clip(cells, 0, upper)
+        lattice = np.minimum(np.floor(cells), upper - 1).astype(np.intp)
+        return trilinear(self.winds[frame], lattice, lattice + 1, cells - lattice)
+
+    def update(self):
+        pass
+
+    def prepare_visuals(self):
+        pass
+
+    def write_visuals(self):
+        pass
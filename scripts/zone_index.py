@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+ZephyrSim - Zone Spatial Index
+Uniform hash grid over wind zone spheres for fast point queries
+"""
+
+import math
+
+import numpy as np
+
+# Cell coordinates are packed into one int64 key, 21 bits per axis
+_KEY_BITS = 21
+_KEY_OFFSET = 1 << (_KEY_BITS - 1)
+
+
+def _pack_keys(cells):
+    """Pack (N, 3) integer cell coordinates into (N,) int64 keys"""
+    cells = cells.astype(np.int64) + _KEY_OFFSET
+    return (cells[:, 0] << (2 * _KEY_BITS)) | (cells[:, 1] << _KEY_BITS) | cells[:, 2]
+
+
+class ZoneHashGrid:
+    """Uniform hash grid over spherical zones (center, radius)
+
+    Each zone is registered in every grid cell its bounding box overlaps, so a
+    point query only tests the zones stored in the point's own cell. Zones that
+    would cover more than `max_cells_per_zone` cells are kept in a small list
+    that is tested against every query instead.
+    """
+
+    def __init__(self, cell_size=20.0, max_cells_per_zone=512):
+        self.cell_size = float(cell_size)
+        self.max_cells_per_zone = max_cells_per_zone
+        self.cells = {}            # packed cell key -> list of zone slots
+        self.large_slots = set()   # slots tested against every query
+        self.slots = {}            # zone name -> slot
+        self.names = []            # slot -> zone name (None when free)
+        self.zone_cells = []       # slot -> list of cell keys
+        self.free_slots = []
+        self.centers = np.zeros((16, 3))
+        self.radii = np.zeros(16)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def insert(self, name, center, radius):
+        """Insert or move a zone"""
+        if name in self.slots:
+            self.remove(name)
+
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.names[slot] = name
+            self.zone_cells[slot] = []
+        else:
+            slot = len(self.names)
+            self.names.append(name)
+            self.zone_cells.append([])
+            if slot >= len(self.radii):
+                self.centers = np.concatenate([self.centers, np.zeros_like(self.centers)])
+                self.radii = np.concatenate([self.radii, np.zeros_like(self.radii)])
+        self.slots[name] = slot
+        self.centers[slot] = center
+        self.radii[slot] = radius
+
+        low = np.floor((self.centers[slot] - radius) / self.cell_size).astype(int)
+        high = np.floor((self.centers[slot] + radius) / self.cell_size).astype(int)
+        if np.prod(high - low + 1) > self.max_cells_per_zone:
+            self.large_slots.add(slot)
+            return
+
+        grid = np.mgrid[low[0]:high[0] + 1, low[1]:high[1] + 1, low[2]:high[2] + 1]
+        keys = _pack_keys(grid.reshape(3, -1).T).tolist()
+        for key in keys:
+            self.cells.setdefault(key, []).append(slot)
+        self.zone_cells[slot] = keys
+
+    def remove(self, name):
+        """Remove a zone from the grid"""
+        slot = self.slots.pop(name)
+        for key in self.zone_cells[slot]:
+            cell = self.cells[key]
+            cell.remove(slot)
+            if not cell:
+                del self.cells[key]
+        self.large_slots.discard(slot)
+        self.names[slot] = None
+        self.zone_cells[slot] = []
+        self.free_slots.append(slot)
+
+    def query(self, positions):
+        """Find the zones containing each position
+
+        Returns a dict mapping zone name to the indices of the (N, 3) positions
+        that lie inside that zone's sphere.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        if len(positions) == 1:
+            # A single point (e.g. one drone's trigger position) without array overhead
+            x, y, z = positions[0].tolist()
+            hits = {}
+            for slot in self.point_slots(x, y, z):
+                cx, cy, cz = self.centers[slot].tolist()
+                if math.sqrt((x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2) <= self.radii[slot]:
+                    hits[self.names[slot]] = np.zeros(1, dtype=np.intp)
+            return hits
+        pair_points, pair_slots = self.query_pairs(positions)
+        if not len(pair_slots):
+            return {}
+
+        order = np.argsort(pair_slots, kind="stable")
+        pair_points = pair_points[order]
+        pair_slots = pair_slots[order]
+        starts = np.flatnonzero(np.diff(pair_slots, prepend=-1))
+        ends = np.append(starts[1:], len(pair_slots))
+        return {
+            self.names[slot]: pair_points[start:end]
+            for slot, start, end in zip(pair_slots[starts].tolist(), starts.tolist(), ends.tolist())
+        }
+
+    def point_slots(self, x, y, z):
+        """Candidate slots for a single point (its cell's zones and the large zones), before the sphere test"""
+        size = self.cell_size
+        key = (((math.floor(x / size) + _KEY_OFFSET) << (2 * _KEY_BITS))
+               | ((math.floor(y / size) + _KEY_OFFSET) << _KEY_BITS)
+               | (math.floor(z / size) + _KEY_OFFSET))
+        slots = self.cells.get(key, ())
+        if self.large_slots:
+            return list(slots) + list(self.large_slots)
+        return slots
+
+    def query_pairs(self, positions):
+        """Find every (point index, zone slot) pair with the point inside the zone's sphere
+
+        Returns two equal-length intp arrays; slots map to zone names via `names`.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        keys = _pack_keys(np.floor(positions / self.cell_size))
+
+        point_parts, slot_parts = [], []
+        if len(positions) == 1:
+            slots = self.cells.get(int(keys[0]))
+            if slots:
+                point_parts.append(np.zeros(len(slots), dtype=np.intp))
+                slot_parts.append(np.array(slots, dtype=np.intp))
+        elif len(positions) > 1:
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.diff(sorted_keys, prepend=sorted_keys[0] - 1))
+            ends = np.append(starts[1:], len(sorted_keys))
+            for key, start, end in zip(sorted_keys[starts].tolist(), starts.tolist(), ends.tolist()):
+                slots = self.cells.get(key)
+                if not slots:
+                    continue
+                points = order[start:end]
+                point_parts.append(np.repeat(points, len(slots)))
+                slot_parts.append(np.tile(np.array(slots, dtype=np.intp), len(points)))
+        for slot in self.large_slots:
+            point_parts.append(np.arange(len(positions)))
+            slot_parts.append(np.full(len(positions), slot, dtype=np.intp))
+        if not point_parts:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+        pair_points = np.concatenate(point_parts)
+        pair_slots = np.concatenate(slot_parts)
+
+        # Exact sphere test on the candidate pairs
+        distance = np.sqrt(np.sum((positions[pair_points] - self.centers[pair_slots]) ** 2, axis=1))
+        hit = distance <= self.radii[pair_slots]
+        return pair_points[hit], pair_slots[hit]